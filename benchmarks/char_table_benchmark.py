@@ -0,0 +1,76 @@
+# benchmarks/char_table_benchmark.py
+"""Compare the char stage's per-key `str.replace` loop with compiled translation tables.
+
+Each step is run over every Tatoeba sentence one at a time, the way the pipeline calls it, and over one long
+document; then the whole pipeline is timed over the sentences. Outputs are checked to be identical.
+
+Usage: python benchmarks/char_table_benchmark.py [--repeat 3]
+"""
+
+import argparse
+import csv
+import time
+from functools import partial
+from pathlib import Path
+
+from mandarin_tamer import ConversionEngine
+
+
+SENTENCE_CSVS = {
+    "zh_tw": Path(__file__).parent.parent / "tests" / "sentence_csvs" / "simp_tatoeba_sentences.csv",
+    "zh_cn": Path(__file__).parent.parent / "tests" / "sentence_csvs" / "trad_tatoeba_sentences.csv",
+}
+
+
+def sequential_replace(sentence: str, char_dict: dict) -> str:
+    for char in [char for char in char_dict if char in sentence]:
+        sentence = sentence.replace(char, char_dict[char])
+    return sentence
+
+
+def best_time(func, inputs: list[str], repeat: int) -> tuple[float, list[str]]:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        outputs = [func(text) for text in inputs]
+        best = min(best, time.perf_counter() - start)
+    return best, outputs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for target_script, csv_path in SENTENCE_CSVS.items():
+        with csv_path.open(encoding="utf-8") as file:
+            sentences = [row[0] for row in list(csv.reader(file))[1:]]
+        document = "".join(sentences)
+        print(f"{target_script}: {len(sentences)} sentences, {len(document)} character document")
+        for step in ConversionEngine(target_script=target_script).steps:
+            for label, inputs in (("sentences", sentences), ("document", [document])):
+                replace_loop = partial(sequential_replace, char_dict=step.char_dict)
+                before, expected = best_time(replace_loop, inputs, args.repeat)
+                after, outputs = best_time(step.char_table.translate, inputs, args.repeat)
+                assert outputs == expected, f"{step.config.name} output differs"
+                chars = sum(map(len, inputs))
+                print(
+                    f"  {step.config.name:<12} {len(step.char_dict):5} keys  {label:<9} "
+                    f"replace loop {chars / before / 1e6:7.2f} Mchar/s  CharTable {chars / after / 1e6:7.2f} Mchar/s  "
+                    f"({before / after:5.1f}x)"
+                )
+
+        engine = ConversionEngine(target_script=target_script)
+        after, expected = best_time(engine.convert, sentences, args.repeat)
+        for step in engine.steps:
+            step.char_table.scan_threshold = 0  # always take the old replace loop
+        before, outputs = best_time(engine.convert, sentences, args.repeat)
+        assert outputs == expected, "pipeline output differs"
+        print(
+            f"  full pipeline  replace loop {len(sentences) / before:8.0f} sentences/s  "
+            f"CharTable {len(sentences) / after:8.0f} sentences/s  ({before / after:5.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+# benchmarks/cold_start_benchmark.py
+"""Measure how long a fresh process takes to build a zh_tw engine from JSON versus compiled artifacts.
+
+Usage: python benchmarks/cold_start_benchmark.py --runs 5
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+from mandarin_tamer.helpers.dictionary_compiler import compile_dictionaries
+
+
+SNIPPET = """
+import time
+start = time.perf_counter()
+from mandarin_tamer.helpers.conversion_engine import ConversionEngine
+from mandarin_tamer.helpers.conversion_operations import DictionaryLoader
+imported = time.perf_counter()
+ConversionEngine("{target}", loader=DictionaryLoader(use_artifacts={use_artifacts}))
+print(imported - start, time.perf_counter() - imported)
+"""
+
+
+def cold_start(target: str, use_artifacts: bool) -> tuple[float, float]:
+    """Return (import seconds, engine build seconds) measured in a fresh interpreter."""
+    code = SNIPPET.format(target=target, use_artifacts=use_artifacts)
+    output = subprocess.run(  # noqa: S603 - runs this interpreter on the snippet above
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    import_time, build_time = output.split()
+    return float(import_time), float(build_time)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--target-script", default="zh_tw")
+    args = parser.parse_args()
+
+    compile_dictionaries()
+    for label, use_artifacts in (("json", False), ("artifacts", True)):
+        timings = [cold_start(args.target_script, use_artifacts) for _ in range(args.runs)]
+        import_ms = statistics.median(timing[0] for timing in timings) * 1000
+        build_ms = statistics.median(timing[1] for timing in timings) * 1000
+        print(f"{label:<10} import {import_ms:8.1f} ms  engine build {build_ms:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
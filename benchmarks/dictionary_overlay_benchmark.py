@@ -0,0 +1,91 @@
+# benchmarks/dictionary_overlay_benchmark.py
+"""Measure what a per-customer glossary costs with overlays compared with copying and recompiling the base tables.
+
+For glossaries of increasing size, times building a customized zh_tw engine once the shared base steps are
+compiled, both by layering the glossary over the base (the engine's behavior) and by merging it into copies of the
+tables and rebuilding every trie (the previous behavior). Then compares conversion throughput of the two engines on
+Tatoeba sentences and checks their outputs match.
+
+Usage: python benchmarks/dictionary_overlay_benchmark.py --entries 10 50 500 --sentences 2000
+"""
+
+import argparse
+import csv
+import random
+import time
+from pathlib import Path
+
+from mandarin_tamer import ConversionEngine
+from mandarin_tamer.helpers.char_table import CharTable
+from mandarin_tamer.helpers.conversion_engine import CompiledStep
+from mandarin_tamer.helpers.conversion_operations import DictionaryLoader
+from mandarin_tamer.helpers.replacement_by_dictionary import ReplacementUtils
+
+
+SENTENCE_CSV = Path(__file__).parent.parent / "tests" / "sentence_csvs" / "simp_tatoeba_sentences.csv"
+
+
+def rebuild_step(step: CompiledStep, loader: DictionaryLoader, include: dict, exclude: list) -> CompiledStep:
+    """The previous compile path: merged copies of every table and a trie rebuilt from the merged phrases."""
+    dicts = loader.load_conversion_config(
+        step.config, {step.config.include_key: include}, {step.config.include_key: exclude}
+    )
+    char_dict = dict(dicts["char"])
+    return CompiledStep(
+        config=step.config,
+        char_dict=char_dict,
+        phrase_dict=dicts["phrase"],
+        one2many_dict=dict(dicts["one2many"]) if dicts["one2many"] is not None else None,
+        phrase_trie=ReplacementUtils.build_trie_from_dict(dicts["phrase"]),
+        char_table=CharTable(char_dict),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, nargs="+", default=[10, 50, 500])
+    parser.add_argument("--sentences", type=int, default=2000)
+    args = parser.parse_args()
+
+    with SENTENCE_CSV.open(encoding="utf-8") as file:
+        sentences = [row[0] for row in list(csv.reader(file))[1 : args.sentences + 1]]
+    base = ConversionEngine(target_script="zh_tw")
+    loader = DictionaryLoader()
+    s2t = next(step for step in base.steps if step.config.name == "s2t")
+    phrases = list(s2t.phrase_dict)
+    rng = random.Random(0)  # noqa: S311 - seeded synthetic data
+
+    for entries in args.entries:
+        # Half overrides of existing phrases, half new words, plus a few exclusions
+        include = {phrase: phrase[::-1] for phrase in rng.sample(phrases, entries // 2)}
+        include |= {"".join(rng.sample(phrases, 2)): "自訂" for _ in range(entries - entries // 2)}
+        exclude = rng.sample(phrases, max(entries // 10, 1))
+        options = {"include_dicts": {"traditionalize": include}, "exclude_lists": {"traditionalize": exclude}}
+
+        start = time.perf_counter()
+        overlaid = ConversionEngine(target_script="zh_tw", **options)
+        overlay_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        rebuilt = ConversionEngine(target_script="zh_tw")
+        rebuilt.steps = [
+            rebuild_step(step, loader, include, exclude) if step.config.include_key == "traditionalize" else step
+            for step in rebuilt.steps
+        ]
+        rebuild_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        expected = [rebuilt.convert(sentence) for sentence in sentences]
+        rebuilt_rate = len(sentences) / (time.perf_counter() - start)
+        start = time.perf_counter()
+        results = [overlaid.convert(sentence) for sentence in sentences]
+        overlay_rate = len(sentences) / (time.perf_counter() - start)
+        assert results == expected, "overlay output differs"
+        print(
+            f"{entries:5} entries  build: copy+rebuild {rebuild_seconds * 1000:8.1f} ms  overlay "
+            f"{overlay_seconds * 1000:7.1f} ms ({rebuild_seconds / overlay_seconds:5.0f}x)  convert: rebuilt "
+            f"{rebuilt_rate:6.0f}/s  overlay {overlay_rate:6.0f}/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
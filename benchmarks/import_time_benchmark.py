@@ -0,0 +1,57 @@
+# benchmarks/import_time_benchmark.py
+"""Measure package import time with `python -X importtime` so regressions are easy to spot.
+
+Usage: python benchmarks/import_time_benchmark.py --runs 5 [--json]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+
+MODULES = ("mandarin_tamer", "mandarin_tamer.mandarin_tamer_2")
+
+
+def import_profile(module: str) -> dict[str, int]:
+    """Return cumulative import microseconds per module for one fresh `import module`."""
+    stderr = subprocess.run(  # noqa: S603 - runs this interpreter on an import statement
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"], capture_output=True, text=True, check=True
+    ).stderr
+    profile = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        profile[name.strip()] = int(cumulative)
+    return profile
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=5, help="Slowest dependencies to list per module")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    args = parser.parse_args()
+
+    results = {}
+    for module in MODULES:
+        profiles = [import_profile(module) for _ in range(args.runs)]
+        total_ms = statistics.median(profile[module] for profile in profiles) / 1000
+        slowest = sorted(
+            ((name, us) for name, us in profiles[-1].items() if name != module), key=lambda item: -item[1]
+        )[: args.top]
+        results[module] = {"median_ms": round(total_ms, 1), "slowest": {name: us / 1000 for name, us in slowest}}
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for module, result in results.items():
+        print(f"{module:<34} median {result['median_ms']:7.1f} ms")
+        for name, ms in result["slowest"].items():
+            print(f"    {name:<40} {ms:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# benchmarks/opencc_window_benchmark.py
+"""Compare the old whole-sentence OpenCC fallback with cached converters and context windows, per one-to-many step.
+
+The old approach built a new OpenCC converter on every call and converted the entire document even when it held only
+a few ambiguous characters.
+
+Usage: python benchmarks/opencc_window_benchmark.py --chars 2000 20000
+"""
+
+import argparse
+import csv
+import time
+from pathlib import Path
+from opencc import OpenCC
+
+from mandarin_tamer import ConversionEngine
+from mandarin_tamer.helpers.opencc_utils import convert_positions, find_ambiguous_positions, get_opencc
+
+
+SENTENCE_CSV = Path(__file__).parent.parent / "tests" / "sentence_csvs" / "simp_tatoeba_sentences.csv"
+
+
+def build_document(chars: int) -> str:
+    with SENTENCE_CSV.open(encoding="utf-8") as file:
+        corpus = "".join(row[0] for row in list(csv.reader(file))[1:])
+    return (corpus * (chars // len(corpus) + 1))[:chars]
+
+
+def whole_sentence(document: str, mapping_dict: dict, opencc_config: str, cc: OpenCC | None = None) -> None:
+    cc_converted = (cc or OpenCC(opencc_config)).convert(document)
+    for char in mapping_dict:
+        if char in document:
+            document = document.replace(char, cc_converted[document.index(char)])
+
+
+def cached_whole_sentence(document: str, mapping_dict: dict, opencc_config: str) -> None:
+    whole_sentence(document, mapping_dict, opencc_config, get_opencc(opencc_config))
+
+
+def windowed(document: str, mapping_dict: dict, opencc_config: str) -> None:
+    convert_positions(document, find_ambiguous_positions(document, mapping_dict), opencc_config)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chars", type=int, nargs="+", default=[2000, 20000])
+    parser.add_argument("--target-script", default="zh_tw")
+    args = parser.parse_args()
+
+    engine = ConversionEngine(target_script=args.target_script)
+    steps = {step.config.name: step for step in engine.steps if step.one2many_dict and step.config.opencc_config}
+    for chars in args.chars:
+        document = build_document(chars)
+        print(f"{chars} characters")
+        for name, step in steps.items():
+            config = step.config.opencc_config
+            get_opencc(config).convert("")  # warm the cache so only per-call work is timed
+            timings = []
+            for func in (whole_sentence, cached_whole_sentence, windowed):
+                start = time.perf_counter()
+                func(document, step.one2many_dict, config)
+                timings.append(time.perf_counter() - start)
+            positions = len(find_ambiguous_positions(document, step.one2many_dict))
+            print(
+                f"  {name:<10} {positions:6} ambiguous  new OpenCC + whole {timings[0] * 1000:8.1f} ms  "
+                f"cached + whole {timings[1] * 1000:8.1f} ms  cached + windows {timings[2] * 1000:8.1f} ms  "
+                f"({timings[0] / timings[2]:.1f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# benchmarks/process_pool_benchmark.py
+"""Compare process-pool conversion with workers loading their own dictionaries and with shared mapped artifacts.
+
+For each worker count, converts a warm-up batch (which includes starting the workers and building their engines)
+and then a timed batch of synthetic simplified text to zh_tw, once with every worker parsing the JSON dictionaries
+and once with the workers memory-mapping the shared artifacts. Prints the startup and steady throughput, each
+worker's throughput and the total resident (RSS) and proportional (PSS, shared pages counted once) memory.
+
+Usage: python benchmarks/process_pool_benchmark.py --workers 1 2 4 8 --texts 4000 --start-method spawn
+"""
+
+import argparse
+import multiprocessing
+import time
+from synthetic_corpus import CorpusSpec, generate_corpus
+
+from mandarin_tamer.helpers.batch_conversion import BatchConverter, memory_usage
+
+
+def megabytes(size: int | None) -> str:
+    return f"{size / 2**20:7.0f} MB" if size is not None else "      n/a"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--texts", type=int, default=4000, help="Texts per batch")
+    parser.add_argument("--length", type=int, default=40, help="Characters per text")
+    parser.add_argument(
+        "--start-method",
+        choices=multiprocessing.get_all_start_methods(),
+        default="spawn",
+        help="spawn (the default here, and on macOS and Windows) starts workers from scratch; fork lets them inherit "
+        "the parent's engines copy-on-write",
+    )
+    args = parser.parse_args()
+    multiprocessing.set_start_method(args.start_method, force=True)
+
+    def batch(seed: int) -> list[str]:
+        return [generate_corpus(CorpusSpec(args.length, "simp", seed=seed * args.texts + i)) for i in range(args.texts)]
+
+    warmup, texts = batch(1), batch(2)
+    rss, pss = memory_usage()
+    print(f"parent before pools: RSS {megabytes(rss)}  PSS {megabytes(pss)}")
+    for workers in args.workers:
+        for shared in (False, True):
+            start = time.perf_counter()
+            with BatchConverter(workers, shared_dictionaries=shared, target_script="zh_tw") as converter:
+                converter.convert(warmup)
+                startup = time.perf_counter() - start
+                _, stats = converter.convert(texts)
+            label = "shared" if shared else "own"
+            print(
+                f"{workers} workers, {label:6} dictionaries: first batch {startup:6.2f} s, then "
+                f"{stats.chars_per_second / 1000:7.1f} kchar/s  RSS {megabytes(stats.rss_bytes)}  "
+                f"PSS {megabytes(stats.pss_bytes)}"
+            )
+            for worker in stats.worker_stats:
+                print(
+                    f"    pid {worker.pid}: {worker.chunks:3} chunks {worker.texts:6} texts "
+                    f"{worker.chars_per_second / 1000:7.1f} kchar/s  RSS {megabytes(worker.rss_bytes)}  "
+                    f"PSS {megabytes(worker.pss_bytes)}"
+                )
+
+
+if __name__ == "__main__":
+    main()
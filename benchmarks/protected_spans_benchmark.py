@@ -0,0 +1,95 @@
+# benchmarks/protected_spans_benchmark.py
+"""Compare protected ranges kept as a list of tuples with `ProtectedSpans` on documents with thousands of spans.
+
+For every step's phrase matches on a Tatoeba document, times the overlap check, the union with the new phrase
+ranges and the restore pass, using the list-based code they replaced and `ProtectedSpans`. Then times the whole
+pipeline with named entities covering more and more of the document. Results are checked to be identical.
+
+Usage: python benchmarks/protected_spans_benchmark.py --chars 100000 --spans 1000 5000
+"""
+
+import argparse
+import csv
+import random
+import time
+from collections import Counter
+from pathlib import Path
+
+from mandarin_tamer import ConversionEngine
+from mandarin_tamer.helpers.protected_spans import ProtectedSpans
+
+
+SENTENCE_CSV = Path(__file__).parent.parent / "tests" / "sentence_csvs" / "simp_tatoeba_sentences.csv"
+
+
+def load_document(chars: int) -> str:
+    with SENTENCE_CSV.open(encoding="utf-8") as file:
+        corpus = "".join(row[0] for row in list(csv.reader(file))[1:])
+    return (corpus * (chars // len(corpus) + 1))[:chars]
+
+
+def list_based(sentence: str, converted: str, matches: list, spans: list) -> tuple[list, str]:
+    kept = [
+        (start, end)
+        for start, end, _ in matches
+        if not any(p_start <= start < p_end or p_start < end <= p_end for p_start, p_end in spans)
+    ]
+    merged = sorted(set(spans) | set(kept))
+    for start, end in merged:
+        converted = converted[:start] + sentence[start:end] + converted[end:]
+    return kept, converted
+
+
+def interval_based(sentence: str, converted: str, matches: list, spans: list) -> tuple[list, str]:
+    protected = ProtectedSpans(spans)
+    kept = [(start, end) for start, end, _ in matches if not (protected.contains(start) or protected.contains(end - 1))]
+    return kept, protected.union(kept).restore(sentence, converted)
+
+
+def timed(func, *args) -> tuple[float, object]:
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chars", type=int, default=100_000)
+    parser.add_argument("--spans", type=int, nargs="+", default=[1000, 5000])
+    args = parser.parse_args()
+
+    document = load_document(args.chars)
+    engine = ConversionEngine(target_script="zh_tw")
+    converted = engine.convert(document)
+    rng = random.Random(0)  # noqa: S311 - seeded synthetic data
+    print(f"{len(document)} character document")
+
+    for span_count in args.spans:
+        starts = rng.sample(range(len(document) - 4), span_count)
+        spans = [(start, start + rng.randint(1, 4)) for start in starts]
+        for step in engine.steps:
+            if not step.has_phrases:
+                continue
+            matches = step.phrase_trie.find_all_matches(document)
+            before, expected = timed(list_based, document, converted, matches, spans)
+            after, result = timed(interval_based, document, converted, matches, spans)
+            assert result == expected, f"{step.config.name} results differ"
+            print(
+                f"  {span_count:6} spans  {step.config.name:<12} {len(matches):6} phrase matches  "
+                f"list {before * 1000:9.1f} ms  ProtectedSpans {after * 1000:7.1f} ms  ({before / after:6.1f}x)"
+            )
+
+    # Named entities: the most frequent two-character words, adding more until every span count is reached
+    bigrams = [word for word, _ in Counter(document[i : i + 2] for i in range(len(document) - 1)).most_common()]
+    print("full pipeline")
+    for span_count in [0, *args.spans]:
+        ner_list, covered = [], 0
+        while covered < span_count and bigrams:
+            ner_list.append(bigrams.pop(0))
+            covered += document.count(ner_list[-1])
+        seconds, _ = timed(engine.convert, document, ner_list)
+        print(f"  {covered:6} entity spans  {seconds * 1000:9.1f} ms  {len(document) / seconds / 1e6:5.2f} Mchar/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# benchmarks/result_cache_benchmark.py
+"""Measure `convert_mandarin_script` on repetitive short-text traffic with and without a `ResultCache`.
+
+Draws `--calls` texts from a vocabulary of `--vocabulary` synthetic UI-label-length strings with Zipf-distributed
+popularity (a few labels make up most of the traffic), converts them to zh_tw once uncached and once through a
+result cache of `--max-characters`, and prints the calls per second, the speedup and the cache's hit rate.
+
+Usage: python benchmarks/result_cache_benchmark.py --calls 50000 --vocabulary 2000 --max-characters 100000
+"""
+
+import argparse
+import random
+import time
+from synthetic_corpus import CorpusSpec, generate_corpus
+
+from mandarin_tamer import ResultCache, convert_mandarin_script
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=50_000)
+    parser.add_argument("--vocabulary", type=int, default=2000, help="Distinct texts")
+    parser.add_argument("--length", type=int, default=8, help="Characters per text")
+    parser.add_argument("--zipf", type=float, default=1.1, help="Zipf exponent of text popularity")
+    parser.add_argument("--max-characters", type=int, default=100_000, help="Result cache budget")
+    args = parser.parse_args()
+
+    vocabulary = [generate_corpus(CorpusSpec(args.length, "simp", seed=seed)) for seed in range(args.vocabulary)]
+    weights = [1 / rank**args.zipf for rank in range(1, args.vocabulary + 1)]
+    texts = random.Random(0).choices(vocabulary, weights, k=args.calls)  # noqa: S311 - seeded synthetic data
+    convert_mandarin_script(texts[0], target_script="zh_tw")
+
+    start = time.perf_counter()
+    expected = [convert_mandarin_script(text, target_script="zh_tw") for text in texts]
+    uncached = args.calls / (time.perf_counter() - start)
+
+    cache = ResultCache(max_characters=args.max_characters)
+    start = time.perf_counter()
+    results = [convert_mandarin_script(text, target_script="zh_tw", result_cache=cache) for text in texts]
+    cached = args.calls / (time.perf_counter() - start)
+    assert results == expected, "cached results differ"
+
+    stats = cache.stats
+    print(f"uncached: {uncached:9.0f} calls/s")
+    print(f"cached:   {cached:9.0f} calls/s  speedup {cached / uncached:5.1f}x")
+    print(
+        f"hit rate {stats.hit_rate:.1%}, {stats.entries} entries, {stats.characters} characters, "
+        f"{stats.evictions} evictions"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# benchmarks/server_benchmark.py
+"""Measure conversion-server throughput and latency with and without micro-batching.
+
+Starts a `ConversionServer` in-process on a thread or process pool, then has `--clients` concurrent clients each
+send `--requests` single-text requests over one keep-alive connection. Repeats for every `--batch-sizes` value
+(1 turns batching off) and prints the request rate, the client-side latency percentiles and the server's mean batch
+size from `/stats`.
+
+Usage: python benchmarks/server_benchmark.py --clients 32 --requests 100 --batch-sizes 1 16 64 --workers 2
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from synthetic_corpus import CorpusSpec, generate_corpus
+
+from mandarin_tamer.server import ConversionServer, warm_engines
+
+
+async def client(port: int, texts: list[str], latencies: list[float]) -> None:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    for text in texts:
+        body = json.dumps({"text": text, "target_script": "zh_tw"}).encode()
+        start = time.perf_counter()
+        writer.write(f"POST /convert HTTP/1.1\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+        await reader.readline()
+        length = 0
+        while (line := await reader.readline()) != b"\r\n":
+            if line.lower().startswith(b"content-length:"):
+                length = int(line.split(b":")[1])
+        await reader.readexactly(length)
+        latencies.append(time.perf_counter() - start)
+    writer.close()
+
+
+async def run(args: argparse.Namespace, batch_size: int, texts: list[list[str]]) -> None:
+    warm = [{"target_script": "zh_tw"}]
+    if args.threads:
+        warm_engines(warm)
+        executor: Executor = ThreadPoolExecutor(args.workers)
+    else:
+        executor = ProcessPoolExecutor(args.workers, initializer=warm_engines, initargs=(warm,))
+        await asyncio.gather(*(asyncio.wrap_future(executor.submit(warm_engines, [])) for _ in range(args.workers)))
+    server = ConversionServer(executor, batch_size, args.max_batch_delay / 1000)
+    port = await server.start(port=0)
+    latencies: list[float] = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(port, client_texts, latencies) for client_texts in texts))
+    seconds = time.perf_counter() - start
+    stats = server.stats.snapshot()
+    await server.close()
+
+    latencies.sort()
+    p50, p95 = (latencies[int(fraction * len(latencies))] * 1000 for fraction in (0.5, 0.95))
+    print(
+        f"batch size {batch_size:4}: {len(latencies) / seconds:8.0f} requests/s  p50 {p50:7.1f} ms  p95 {p95:7.1f} ms  "
+        f"mean batch {stats['mean_batch_size']:6.1f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=100, help="Requests per client")
+    parser.add_argument("--length", type=int, default=40, help="Characters per text")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 16, 64])
+    parser.add_argument("--max-batch-delay", type=float, default=5.0, help="Milliseconds")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--threads", action="store_true", help="Use a thread pool instead of worker processes")
+    args = parser.parse_args()
+
+    texts = [
+        [generate_corpus(CorpusSpec(args.length, "simp", seed=index * args.requests + i)) for i in range(args.requests)]
+        for index in range(args.clients)
+    ]
+    pool = f"{args.workers} {'threads' if args.threads else 'processes'}"
+    print(f"{args.clients} clients x {args.requests} requests of {args.length} chars on {pool}")
+    for batch_size in args.batch_sizes:
+        asyncio.run(run(args, batch_size, texts))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+# benchmarks/suite.py
+"""Micro-benchmark every conversion primitive and the full pipelines on synthetic corpora.
+
+Each benchmark times one piece on its own: phrase trie build and match, the phrase, one-to-many (OpenCC fallback),
+char and NER stages of the script conversion step, the v1 engine and `ScriptConverter` pipelines, the v2
+`MandarinConverter` pipeline, and raw OpenCC as a baseline. Corpora come from `synthetic_corpus.py`, so lengths and
+densities are controlled; simplified text runs through the zh_tw direction and traditional text through zh_cn.
+
+Results are printed as a table and, with `--output`, written as JSON (one record per benchmark and corpus, plus the
+commit and environment). `--compare BASELINE.json` reports the change against an earlier run and exits with status 1
+if anything got slower than `--threshold`.
+
+Usage:
+    python benchmarks/suite.py --lengths 100 10000 --output results.json
+    python benchmarks/suite.py --only char,phrase --compare results.json
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+from pathlib import Path
+from synthetic_corpus import SCRIPT_STEPS, CorpusSpec, corpus_material, generate_corpus
+
+from mandarin_tamer import ConversionEngine, EntityMatcher
+from mandarin_tamer.helpers.conversion_operations import ConversionOperation
+from mandarin_tamer.helpers.opencc_utils import get_opencc
+from mandarin_tamer.helpers.replacement_by_dictionary import ReplacementUtils
+from mandarin_tamer.mandarin_tamer import ScriptConverter
+from mandarin_tamer.mandarin_tamer_2 import MandarinConverter
+
+
+# Pipeline each script is converted with, by engine
+TARGETS = {"simp": ("zh_tw", "to_tw_trad", "s2twp"), "trad": ("zh_cn", "to_simp", "tw2sp")}
+NER_ENTITIES = 2000
+# Each timing sample runs the benchmark at least this long
+MIN_SAMPLE_SECONDS = 0.05
+
+
+def measure(func: Callable[[], object], repeat: int) -> list[float]:
+    """Seconds per call for `repeat` samples, each looping enough calls to last `MIN_SAMPLE_SECONDS`."""
+    start = time.perf_counter()
+    func()
+    single = time.perf_counter() - start
+    number = max(1, int(MIN_SAMPLE_SECONDS / single)) if single else 1000
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number)
+    return samples
+
+
+def benchmarks_for(spec: CorpusSpec, text: str) -> dict[str, Callable[[], object]]:
+    """Name -> zero-argument callable for every benchmark on one corpus."""
+    target_script, v2_target, opencc_config = TARGETS[spec.script]
+    _, step_name = SCRIPT_STEPS[spec.script]
+    engine = ConversionEngine(target_script=target_script)
+    step = next(step for step in engine.steps if step.config.name == step_name)
+    phrases, _, _ = corpus_material(spec.script)
+    entities = phrases[:: max(len(phrases) // NER_ENTITIES, 1)][:NER_ENTITIES]
+    matcher = EntityMatcher(entities)
+    converter = MandarinConverter()
+
+    return {
+        "trie_build": lambda: ReplacementUtils.build_trie_from_dict(step.phrase_dict),
+        "trie_build_compact": lambda: ReplacementUtils.build_trie_from_dict(step.phrase_dict, "compact"),
+        "trie_match": lambda: step.phrase_trie.find_all_matches(text),
+        "phrase": lambda: ConversionOperation(text).apply_phrase_conversion(step.phrase_dict, step.phrase_trie),
+        "one2many_opencc": lambda: ConversionOperation(text).apply_one_to_many_conversion(
+            step.one2many_dict, opencc_config=step.config.opencc_config
+        ),
+        "char": lambda: ConversionOperation(text).apply_char_conversion(step.char_dict, step.char_table),
+        "ner_list": lambda: ReplacementUtils.get_ner_indexes(text, entities),
+        "ner_matcher": lambda: matcher.find_spans(text),
+        f"v1_engine_{target_script}": lambda: engine.convert(text),
+        f"v1_script_converter_{target_script}": lambda: ScriptConverter(text, target_script).convert(),
+        f"v2_{v2_target}": lambda: converter.convert_script(text, v2_target),
+        f"opencc_{opencc_config}": lambda: get_opencc(opencc_config).convert(text),
+    }
+
+
+def git_commit() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],  # noqa: S607
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parent,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def run(args: argparse.Namespace) -> dict:
+    only = args.only.split(",") if args.only else None
+    results = []
+    for script in args.scripts:
+        for length in args.lengths:
+            spec = CorpusSpec(length, script, args.phrase_density, args.ambiguity_density, args.seed)
+            text = generate_corpus(spec)
+            for name, func in benchmarks_for(spec, text).items():
+                if only and not any(part in name for part in only):
+                    continue
+                samples = measure(func, args.repeat)
+                best, median = min(samples), statistics.median(samples)
+                results.append(
+                    {
+                        "benchmark": name,
+                        "corpus": spec.name,
+                        "characters": length,
+                        "best_seconds": best,
+                        "median_seconds": median,
+                        # Trie builds don't read the corpus, so a throughput would mean nothing
+                        "chars_per_second": None if name.startswith("trie_build") else length / best,
+                    }
+                )
+                print(format_result(results[-1]), flush=True)
+    return {
+        "commit": git_commit(),
+        "created": datetime.now(UTC).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "options": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        "results": results,
+    }
+
+
+def format_result(result: dict) -> str:
+    rate = result["chars_per_second"]
+    throughput = f"{rate / 1e6:9.3f} Mchar/s" if rate is not None else ""
+    return (
+        f"{result['corpus']:<24} {result['benchmark']:<28} {result['best_seconds'] * 1000:11.4f} ms "
+        f"(median {result['median_seconds'] * 1000:11.4f} ms) {throughput}"
+    )
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> bool:
+    """Print the change of every benchmark present in both runs; return True if any slowed down past `threshold`."""
+    before = {(result["corpus"], result["benchmark"]): result for result in baseline["results"]}
+    regressed = False
+    print(f"\nchange since {baseline.get('commit') or 'baseline'} (best time, + is slower)")
+    for result in current["results"]:
+        old = before.get((result["corpus"], result["benchmark"]))
+        if old is None:
+            continue
+        change = result["best_seconds"] / old["best_seconds"] - 1
+        flag = "  REGRESSION" if change > threshold else ""
+        regressed |= bool(flag)
+        print(f"  {result['corpus']:<24} {result['benchmark']:<28} {change:+8.1%}{flag}")
+    return regressed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lengths", type=int, nargs="+", default=[100, 10000], help="Corpus lengths in characters")
+    parser.add_argument("--scripts", nargs="+", choices=sorted(TARGETS), default=sorted(TARGETS))
+    parser.add_argument("--phrase-density", type=float, default=0.3, help="Share of characters inside phrases")
+    parser.add_argument("--ambiguity-density", type=float, default=0.05, help="Share of one-to-many characters")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5, help="Timing samples per benchmark")
+    parser.add_argument("--only", help="Comma-separated substrings of the benchmark names to run")
+    parser.add_argument("--output", type=Path, help="Write the results as JSON")
+    parser.add_argument("--compare", type=Path, help="JSON results of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Slowdown reported as a regression")
+    args = parser.parse_args()
+
+    current = run(args)
+    if args.output:
+        args.output.write_text(json.dumps(current, indent=2), encoding="utf-8")
+    if args.compare and compare(json.loads(args.compare.read_text(encoding="utf-8")), current, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
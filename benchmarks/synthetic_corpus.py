@@ -0,0 +1,96 @@
+# benchmarks/synthetic_corpus.py
+"""Generate Mandarin corpora of controlled length, script and phrase/ambiguity density for benchmarks.
+
+Text is assembled from the conversion dictionaries themselves: phrase keys of the script's s2t/t2s step, characters
+with one-to-many mappings, and plain characters drawn from the Tatoeba sentences of that script (minus the ambiguous
+ones), with some punctuation. Densities are fractions of the generated characters, and the same arguments always give
+the same text.
+
+Usage: python benchmarks/synthetic_corpus.py --length 200 --script trad --phrase-density 0.4
+"""
+
+import argparse
+import csv
+import random
+from dataclasses import dataclass
+from functools import cache
+from pathlib import Path
+
+from mandarin_tamer import get_engine
+
+
+SENTENCE_CSVS = {
+    "simp": Path(__file__).parent.parent / "tests" / "sentence_csvs" / "simp_tatoeba_sentences.csv",
+    "trad": Path(__file__).parent.parent / "tests" / "sentence_csvs" / "trad_tatoeba_sentences.csv",
+}
+# The script conversion step whose dictionaries each script's text is built from
+SCRIPT_STEPS = {"simp": ("zh_tw", "s2t"), "trad": ("zh_cn", "t2s")}
+PUNCTUATION = "，。！？、；："
+PUNCTUATION_RATE = 0.08
+# Lengths of the dictionary phrases used, long enough to exercise phrase matching without dominating the text
+MIN_PHRASE_LENGTH, MAX_PHRASE_LENGTH = 2, 4
+
+
+@dataclass(frozen=True)
+class CorpusSpec:
+    length: int
+    script: str = "simp"
+    phrase_density: float = 0.3
+    ambiguity_density: float = 0.05
+    seed: int = 0
+
+    @property
+    def name(self) -> str:
+        return f"{self.script}-{self.length}-p{self.phrase_density:.2f}-a{self.ambiguity_density:.2f}"
+
+
+@cache
+def corpus_material(script: str) -> tuple[list[str], list[str], list[str]]:
+    """Phrases, ambiguous characters and plain characters to build `script` text from."""
+    target_script, step_name = SCRIPT_STEPS[script]
+    step = next(step for step in get_engine(target_script=target_script).steps if step.config.name == step_name)
+    phrases = sorted(phrase for phrase in step.phrase_dict if MIN_PHRASE_LENGTH <= len(phrase) <= MAX_PHRASE_LENGTH)
+    ambiguous = sorted(step.one2many_dict)
+    with SENTENCE_CSVS[script].open(encoding="utf-8") as file:
+        text = "".join(row[0] for row in list(csv.reader(file))[1:])
+    excluded = set(ambiguous) | set(PUNCTUATION)
+    plain = sorted({char for char in text if "一" <= char <= "鿿" and char not in excluded})
+    return phrases, ambiguous, plain
+
+
+def generate_corpus(spec: CorpusSpec) -> str:
+    """Text of exactly `spec.length` characters with the requested phrase and ambiguity densities."""
+    phrases, ambiguous, plain = corpus_material(spec.script)
+    rng = random.Random(spec.seed)  # noqa: S311 - seeded synthetic data
+    parts: list[str] = []
+    size = phrase_chars = ambiguous_chars = 0
+    while size < spec.length:
+        # Add whichever kind of text is furthest below its share so far
+        if phrase_chars < spec.phrase_density * (size + 1):
+            piece = rng.choice(phrases)
+            phrase_chars += len(piece)
+        elif ambiguous_chars < spec.ambiguity_density * (size + 1):
+            piece = rng.choice(ambiguous)
+            ambiguous_chars += 1
+        elif rng.random() < PUNCTUATION_RATE:
+            piece = rng.choice(PUNCTUATION)
+        else:
+            piece = rng.choice(plain)
+        parts.append(piece)
+        size += len(piece)
+    return "".join(parts)[: spec.length]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--length", type=int, default=200)
+    parser.add_argument("--script", choices=sorted(SCRIPT_STEPS), default="simp")
+    parser.add_argument("--phrase-density", type=float, default=0.3)
+    parser.add_argument("--ambiguity-density", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    print(generate_corpus(CorpusSpec(args.length, args.script, args.phrase_density, args.ambiguity_density, args.seed)))
+
+
+if __name__ == "__main__":
+    main()
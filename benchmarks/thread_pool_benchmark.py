@@ -0,0 +1,48 @@
+# benchmarks/thread_pool_benchmark.py
+"""Measure how conversion throughput scales with threads sharing one compiled engine.
+
+Converts a batch of distinct synthetic simplified texts to zh_tw with `convert_many_threaded` for each thread count,
+after one warm-up call so the engine is already compiled, and prints the throughput and the speedup over one
+thread. With the GIL enabled the threads take turns and the speedup stays near 1; run it on a free-threaded build
+(e.g. `python3.13t -X gil=0`) to see them convert in parallel.
+
+Usage: python benchmarks/thread_pool_benchmark.py --threads 1 2 4 8 --texts 4000
+"""
+
+import argparse
+import sys
+import time
+from synthetic_corpus import CorpusSpec, generate_corpus
+
+from mandarin_tamer import convert_many_threaded
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--texts", type=int, default=4000, help="Texts per batch")
+    parser.add_argument("--length", type=int, default=40, help="Characters per text")
+    parser.add_argument("--repeat", type=int, default=3, help="Best of this many runs per thread count")
+    args = parser.parse_args()
+
+    texts = [generate_corpus(CorpusSpec(args.length, "simp", seed=seed)) for seed in range(args.texts)]
+    convert_many_threaded(texts[:10], target_script="zh_tw", threads=1)
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"Python {sys.version.split()[0]}, GIL {'enabled' if gil else 'disabled'}")
+
+    baseline = None
+    for threads in args.threads:
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            convert_many_threaded(texts, target_script="zh_tw", threads=threads)
+            best = min(best, time.perf_counter() - start)
+        chars_per_second = args.texts * args.length / best
+        baseline = baseline or chars_per_second
+        print(
+            f"{threads:3} threads: {chars_per_second / 1000:8.1f} kchar/s  speedup {chars_per_second / baseline:5.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
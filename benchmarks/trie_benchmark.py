@@ -0,0 +1,82 @@
+# benchmarks/trie_benchmark.py
+"""Compare the naive Trie scan with the Aho-Corasick and compact backends on multi-megabyte documents.
+
+Reports build time, memory held by each structure and match throughput.
+
+Usage: python benchmarks/trie_benchmark.py --size-mb 1 4
+"""
+
+import argparse
+import csv
+import time
+from pathlib import Path
+
+from mandarin_tamer.helpers.conversion_operations import DictionaryLoader
+from mandarin_tamer.helpers.trie import AhoCorasick, CompactTrie, Trie
+
+
+SENTENCE_CSV = Path(__file__).parent.parent / "tests" / "sentence_csvs" / "simp_tatoeba_sentences.csv"
+
+
+def build_document(size_mb: float) -> str:
+    """Repeat the Tatoeba sentences until the document reaches `size_mb` megabytes of UTF-8."""
+    with SENTENCE_CSV.open(encoding="utf-8") as file:
+        sentences = [row[0] for row in csv.reader(file)][1:]
+    corpus = "".join(sentences)
+    # Chinese characters are three bytes in UTF-8
+    target_chars = int(size_mb * 1024 * 1024 / 3)
+    return (corpus * (target_chars // len(corpus) + 1))[:target_chars]
+
+
+def time_call(func, *args) -> tuple[float, object]:
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def build(trie_class: type, dictionary: dict):
+    trie = trie_class()
+    for key, value in dictionary.items():
+        trie.insert(key, value)
+    if hasattr(trie, "build"):
+        trie.build()
+    return trie
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-mb", type=float, nargs="+", default=[1.0, 4.0])
+    parser.add_argument("--sub-dir", default="simp2trad")
+    parser.add_argument("--dict-file", default="s2t_phrases.json")
+    args = parser.parse_args()
+
+    dictionary = DictionaryLoader().load_dict(args.sub_dir, args.dict_file)
+    print(f"{args.sub_dir}/{args.dict_file}: {len(dictionary)} keys")
+    tries = {}
+    for trie_class in (Trie, AhoCorasick, CompactTrie):
+        build_time, trie = time_call(build, trie_class, dictionary)
+        tries[trie_class.__name__] = trie
+        memory_mb = trie.memory_usage() / 1024 / 1024
+        print(f"  {trie_class.__name__:<12} build {build_time:.3f}s  memory {memory_mb:6.2f} MB")
+
+    for size_mb in args.size_mb:
+        document = build_document(size_mb)
+        print(f"\n{size_mb:g} MB document ({len(document)} chars)")
+        naive_time, naive_matches = time_call(tries["Trie"].find_all_matches, document)
+        ac_time, ac_matches = time_call(tries["AhoCorasick"].find_all_matches, document)
+        compact_time, compact_matches = time_call(tries["CompactTrie"].find_all_matches, document)
+        ll_time, ll_matches = time_call(lambda text: list(tries["AhoCorasick"].iter_leftmost_longest(text)), document)
+        assert naive_matches == ac_matches == compact_matches
+        for label, elapsed, count in (
+            ("Trie.find_all_matches", naive_time, len(naive_matches)),
+            ("AhoCorasick.find_all_matches", ac_time, len(ac_matches)),
+            ("CompactTrie.find_all_matches", compact_time, len(compact_matches)),
+            ("AhoCorasick.iter_leftmost_longest", ll_time, len(ll_matches)),
+        ):
+            rate = len(document) / elapsed / 1e6
+            print(f"  {label:<36} {elapsed:7.3f}s  {rate:6.2f} Mchar/s  {count} matches")
+        print(f"  speedup (all matches): {naive_time / ac_time:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
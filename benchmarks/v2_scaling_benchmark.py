@@ -0,0 +1,89 @@
+# benchmarks/v2_scaling_benchmark.py
+"""Show that the v2 phrase and char steps cost the same per character from a few characters up to megabytes.
+
+Times the compiled `PhraseReplacer` / `CharReplacer` of the simp2trad dictionaries and the whole
+`MandarinConverter.convert_to_tw_trad` pipeline on synthetic simplified text of growing length, next to the substring
+and per-character `str.replace` loops they replaced (only up to `--legacy-limit` characters, as those grow
+quadratically), and checks the outputs agree.
+
+Usage: python benchmarks/v2_scaling_benchmark.py --lengths 10 1000 100000 1000000
+"""
+
+import argparse
+import time
+from synthetic_corpus import CorpusSpec, generate_corpus
+
+from mandarin_tamer import mandarin_tamer_2
+from mandarin_tamer.helpers_2.compiled_dictionaries import compile_dictionaries
+from mandarin_tamer.mandarin_tamer_2 import MandarinConverter
+
+
+def substring_replace(sentence: str, phrase_dictionary: dict) -> str:
+    """The phrase step before compiled matchers."""
+    sentence_length = len(sentence)
+    phrases = sorted(
+        [
+            sentence[i : i + length]
+            for i in range(sentence_length)
+            for length in range(1, 6)
+            if i + length <= sentence_length
+        ],
+        key=lambda x: (-len(x), x),
+    )
+    for phrase in phrases:
+        if phrase in phrase_dictionary:
+            sentence = sentence.replace(phrase, phrase_dictionary[phrase])
+    return sentence
+
+
+def per_char_replace(sentence: str, one_to_one_dictionary: dict) -> str:
+    """The char step before translation tables."""
+    for char in sentence:
+        if char in one_to_one_dictionary:
+            sentence = sentence.replace(char, one_to_one_dictionary[char])
+    return sentence
+
+
+def ns_per_char(func, text: str) -> tuple[float, str]:
+    """Best of a few runs, repeated so each run lasts at least ~50 ms."""
+    start = time.perf_counter()
+    result = func(text)
+    single = time.perf_counter() - start
+    number = max(1, int(0.05 / single)) if single else 1000
+    best = single
+    for _ in range(3 if single < 1 else 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func(text)
+        best = min(best, (time.perf_counter() - start) / number)
+    return best * 1e9 / len(text), result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lengths", type=int, nargs="+", default=[10, 100, 1000, 10000, 100000, 1000000])
+    parser.add_argument("--legacy-limit", type=int, default=10000, help="Longest text to run the old loops on")
+    args = parser.parse_args()
+
+    dictionaries = mandarin_tamer_2.simp2trad
+    compiled = compile_dictionaries(dictionaries)
+    converter = MandarinConverter()
+    print(f"{'chars':>8} {'phrase ns/char':>22} {'char ns/char':>22} {'to_tw_trad ns/char':>19}")
+    print(f"{'':>8} {'compiled':>10} {'old':>11} {'compiled':>10} {'old':>11}")
+    for length in args.lengths:
+        text = generate_corpus(CorpusSpec(length, "simp"))
+        phrase_ns, phrased = ns_per_char(compiled.phrases.convert, text)
+        char_ns, chars = ns_per_char(compiled.chars.convert, text)
+        pipeline_ns, _ = ns_per_char(converter.convert_to_tw_trad, text)
+        old_phrase = old_char = "-"
+        if length <= args.legacy_limit:
+            old_phrase_ns, expected = ns_per_char(lambda text: substring_replace(text, dictionaries["phrases"]), text)
+            assert phrased == expected, "phrase output differs"
+            old_char_ns, expected = ns_per_char(lambda text: per_char_replace(text, dictionaries["chars"]), text)
+            assert chars == expected, "char output differs"
+            old_phrase, old_char = f"{old_phrase_ns:11.0f}", f"{old_char_ns:11.0f}"
+        print(f"{length:8} {phrase_ns:10.0f} {old_phrase:>11} {char_ns:10.0f} {old_char:>11} {pipeline_ns:19.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,37 @@ __version__ = "0.0.11"
 
 from . import conversion_dictionaries
 from . import helpers
+from .helpers.batch_conversion import BatchStats, WorkerStats, convert_many, convert_many_async, convert_many_threaded
+from .helpers.conversion_engine import ConversionEngine, EngineOptions, get_engine
+from .helpers.disambiguation_backends import FakeBackend
+from .helpers.disambiguation_cache import DisambiguationCache
+from .helpers.engine_cache import engine_cache
+from .helpers.entity_matcher import EntityMatcher
+from .helpers.instrumentation import ConversionEvent, StepTimings
+from .helpers.result_cache import ResultCache, ResultCacheStats
+from .helpers.streaming import convert_file, convert_stream
 from .mandarin_tamer import convert_mandarin_script
 
-__all__ = ["convert_mandarin_script", "helpers", "conversion_dictionaries"]
+__all__ = [
+    "convert_mandarin_script",
+    "convert_many",
+    "convert_many_async",
+    "convert_many_threaded",
+    "BatchStats",
+    "WorkerStats",
+    "convert_stream",
+    "convert_file",
+    "ConversionEngine",
+    "EngineOptions",
+    "get_engine",
+    "DisambiguationCache",
+    "FakeBackend",
+    "EntityMatcher",
+    "ConversionEvent",
+    "StepTimings",
+    "engine_cache",
+    "ResultCache",
+    "ResultCacheStats",
+    "helpers",
+    "conversion_dictionaries",
+]
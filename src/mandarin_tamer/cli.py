@@ -0,0 +1,282 @@
+"""src/mandarin_tamer/cli.py - `mandarin-tamer` command-line bulk converter"""
+
+import argparse
+import csv
+import json
+import sys
+import time
+from collections.abc import Callable, Iterable, Iterator
+from functools import partial
+from itertools import islice
+from pathlib import Path
+
+from .helpers.batch_conversion import BatchConverter
+from .helpers.conversion_engine import get_engine
+from .helpers.entity_matcher import EntityMatcher
+from .helpers.streaming import (
+    DEFAULT_CHUNK_SIZE,
+    check_engine,
+    context_radius,
+    convert_windows,
+    iter_windows,
+    read_chunks,
+    replacing_file,
+)
+
+
+FORMATS = ("csv", "tsv", "jsonl", "text")
+SUFFIX_FORMATS = {".csv": "csv", ".tsv": "tsv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+
+class Progress:
+    """Single-line progress and throughput readout on stderr."""
+
+    def __init__(self, label: str, unit: str, quiet: bool = False):
+        self.label = label
+        self.unit = unit
+        self.quiet = quiet
+        self.records = 0
+        self.characters = 0
+        self.start = time.perf_counter()
+
+    def update(self, records: int, characters: int) -> None:
+        self.records += records
+        self.characters += characters
+        if not self.quiet:
+            print(f"\r{self.summary()}", end="", file=sys.stderr, flush=True)
+
+    def summary(self) -> str:
+        seconds = max(time.perf_counter() - self.start, 1e-9)
+        return (
+            f"{self.label}: {self.records} {self.unit}, {self.characters} chars in {seconds:.1f}s "
+            f"({self.records / seconds:.0f} {self.unit}/s, {self.characters / seconds:.0f} chars/s)"
+        )
+
+    def finish(self) -> None:
+        if not self.quiet:
+            print(f"\r{self.summary()}", file=sys.stderr)
+
+
+def batched(items: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def detect_format(path: Path, requested: str) -> str:
+    if requested != "auto":
+        return requested
+    return SUFFIX_FORMATS.get(path.suffix.lower(), "text")
+
+
+def output_path_for(path: Path, output_dir: Path, target_script: str) -> Path:
+    return output_dir / f"{path.stem}_{target_script}{path.suffix}"
+
+
+def resolve_columns(columns: list[str] | None, header: list[str] | None) -> list[int]:
+    """Turn column names or 0-based indexes into indexes; defaults to the first column."""
+    if not columns:
+        return [0]
+    indexes = []
+    for column in columns:
+        if column.isdigit():
+            indexes.append(int(column))
+        elif header and column in header:
+            indexes.append(header.index(column))
+        else:
+            msg = f"Unknown column {column!r}"
+            raise SystemExit(msg)
+    return indexes
+
+
+def convert_rows(
+    rows: Iterable[list[str]],
+    columns: list[int],
+    converter: BatchConverter,
+    batch_size: int,
+    progress: Progress,
+) -> Iterator[list[str]]:
+    """Convert the selected columns of each row, keeping row order; rows are read and written one batch at a time."""
+    for batch in batched(rows, batch_size):
+        cells = [(row_index, column) for row_index, row in enumerate(batch) for column in columns if column < len(row)]
+        texts = [batch[row_index][column] for row_index, column in cells]
+        converted, _ = converter.convert(texts)
+        for (row_index, column), text in zip(cells, converted, strict=True):
+            batch[row_index][column] = text
+        progress.update(len(batch), sum(map(len, texts)))
+        yield from batch
+
+
+def line_terminator(path: Path, encoding: str) -> str:
+    """The line ending of the file's first line (LF for a file without one), so output keeps the input's endings."""
+    with path.open(encoding=encoding, newline="") as file:
+        first_line = file.readline()
+    return first_line[len(first_line.rstrip("\r\n")) :] or "\n"
+
+
+def convert_delimited(
+    source: Path,
+    target: Path,
+    args: argparse.Namespace,
+    converter: BatchConverter,
+    progress: Progress,
+    delimiter: str = ",",
+) -> None:
+    terminator = line_terminator(source, args.encoding)
+    with (
+        source.open(encoding=args.encoding, newline="") as infile,
+        replacing_file(target, args.encoding) as outfile,
+    ):
+        if delimiter == ",":
+            reader = csv.reader(infile)
+            writer_row: Callable[[list[str]], object] = csv.writer(outfile, lineterminator=terminator).writerow
+        else:
+            # Plain split/join rather than the csv module: TSV fields are not quoted
+            reader = (line.rstrip("\r\n").split("\t") for line in infile)
+
+            def writer_row(row: list[str]) -> None:
+                outfile.write("\t".join(row) + terminator)
+
+        header = None if args.no_header else next(reader, None)
+        if header is not None:
+            writer_row(header)
+        columns = resolve_columns(args.columns, header)
+        for row in convert_rows(reader, columns, converter, args.batch_size, progress):
+            writer_row(row)
+
+
+def convert_jsonl(
+    source: Path, target: Path, args: argparse.Namespace, converter: BatchConverter, progress: Progress
+) -> None:
+    """Convert the selected string fields of each JSON object, one record per line.
+
+    Only records whose fields changed are serialized again, with the line's own terminator. Every other line (blank
+    lines, records that aren't objects and records with nothing to convert) is written back exactly as it was read.
+    """
+    fields = args.columns or ["text"]
+    with (
+        source.open(encoding=args.encoding, newline="") as infile,
+        replacing_file(target, args.encoding) as outfile,
+    ):
+        for lines in batched(infile, args.batch_size):
+            records = [json.loads(line) if line.strip() else None for line in lines]
+            cells = [
+                (index, field)
+                for index, record in enumerate(records)
+                if isinstance(record, dict)
+                for field in fields
+                if isinstance(record.get(field), str)
+            ]
+            texts = [records[index][field] for index, field in cells]
+            converted, _ = converter.convert(texts)
+            changed = set()
+            for (index, field), original, text in zip(cells, texts, converted, strict=True):
+                if text != original:
+                    records[index][field] = text
+                    changed.add(index)
+            for index, line in enumerate(lines):
+                if index in changed:
+                    terminator = line[len(line.rstrip("\r\n")) :]
+                    outfile.write(json.dumps(records[index], ensure_ascii=False) + terminator)
+                else:
+                    outfile.write(line)
+            progress.update(len(lines), sum(map(len, texts)))
+
+
+def convert_text(
+    source: Path, target: Path, args: argparse.Namespace, converter: BatchConverter, progress: Progress
+) -> None:
+    """Convert a whole text file in the overlapping windows of `convert_stream`, farmed out to the worker pool.
+
+    The windows go through the same `convert_windows` as `convert_stream`, so the output matches it.
+    """
+    engine = get_engine(**converter.engine_options)
+    check_engine(engine)
+    radius = context_radius(engine, converter.ner_list)
+    windows = iter_windows(read_chunks(source, args.chunk_size, args.encoding), args.chunk_size, radius)
+    with replacing_file(target, args.encoding) as outfile:
+        for text in convert_windows(windows, lambda texts: converter.convert(texts)[0], max(converter.workers * 4, 1)):
+            outfile.write(text)
+            progress.update(1, len(text))
+
+
+CONVERTERS = {
+    "csv": convert_delimited,
+    "tsv": partial(convert_delimited, delimiter="\t"),
+    "jsonl": convert_jsonl,
+    "text": convert_text,
+}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="mandarin-tamer",
+        description="Convert CSV/TSV/JSONL columns or whole text files between Mandarin scripts.",
+    )
+    parser.add_argument("inputs", nargs="+", type=Path, help="Files to convert")
+    parser.add_argument("-o", "--output-dir", type=Path, required=True, help="Directory for converted files")
+    parser.add_argument("-t", "--target-script", choices=("zh_cn", "zh_tw"), default="zh_cn")
+    parser.add_argument(
+        "--format", choices=("auto", *FORMATS), default="auto", help="Input format (default: by suffix)"
+    )
+    parser.add_argument(
+        "-c",
+        "--columns",
+        type=lambda value: value.split(","),
+        help="Comma-separated column names or 0-based indexes (CSV/TSV) or field names (JSONL)",
+    )
+    parser.add_argument("--no-header", action="store_true", help="CSV/TSV files have no header row")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Worker processes (default: one per CPU)")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Rows read, converted and written per batch")
+    parser.add_argument("--chunksize", type=int, default=None, help="Texts handed to a worker at a time")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Characters per text window")
+    parser.add_argument("--encoding", default="utf-8")
+    parser.add_argument("--ner", nargs="*", default=None, help="Named entities to leave unchanged")
+    parser.add_argument("--ner-file", type=Path, help="File of named entities to leave unchanged, one per line")
+    parser.add_argument(
+        "--mask-entities", action="store_true", help="Swap named entities for placeholders while converting"
+    )
+    parser.add_argument("--no-modernize", action="store_true")
+    parser.add_argument("--no-normalize", action="store_true")
+    parser.add_argument("--no-taiwanize", action="store_true")
+    parser.add_argument("-q", "--quiet", action="store_true", help="Don't print progress")
+    return parser
+
+
+def load_entities(args: argparse.Namespace) -> list | EntityMatcher | None:
+    """`--ner` as given, or compiled together with `--ner-file` into one matcher shared by every worker."""
+    if not args.ner_file and not args.mask_entities:
+        return args.ner
+    entities = list(args.ner or [])
+    if args.ner_file:
+        entities += args.ner_file.read_text(encoding=args.encoding).splitlines()
+    return EntityMatcher(entities, masking=args.mask_entities)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = build_parser().parse_args(argv)
+    # Allow long text cells (the default limit is 128 KiB)
+    csv.field_size_limit(2**31 - 1)
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+
+    with BatchConverter(
+        args.workers,
+        args.chunksize,
+        load_entities(args),
+        target_script=args.target_script,
+        modernize=not args.no_modernize,
+        normalize=not args.no_normalize,
+        taiwanize=not args.no_taiwanize,
+    ) as converter:
+        for source in args.inputs:
+            file_format = detect_format(source, args.format)
+            target = output_path_for(source, args.output_dir, args.target_script)
+            progress = Progress(source.name, "windows" if file_format == "text" else "rows", args.quiet)
+            CONVERTERS[file_format](source, target, args, converter, progress)
+            progress.finish()
+            if not args.quiet:
+                print(f"{source} -> {target}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,9 +7,20 @@ from .conversion_config import (
     get_conversion_steps,
 )
 from .conversion_operations import ConversionOperation, DictionaryLoader
+from .conversion_engine import CompiledStep, ConversionEngine, EngineOptions, engine_key, get_engine
+from .batch_conversion import BatchStats, WorkerStats, convert_many, convert_many_async, convert_many_threaded
+from .shared_dictionaries import shared_dictionary_root
+from .streaming import context_radius, convert_file, convert_stream
+from .disambiguation_backends import DisambiguationBackend, FakeBackend, FakeBackendStats, OpenAIBackend
+from .disambiguation_cache import DisambiguationCache, DisambiguationCacheStats
+from .entity_matcher import EntityMatcher
+from .instrumentation import ConversionEvent, StageTotals, StepTimings
+from .engine_cache import EngineCache, EngineCacheStats, engine_cache, fingerprint_payload
+from .result_cache import ResultCache, ResultCacheStats
+from .opencc_utils import convert_positions, get_opencc
 from .replacement_by_dictionary import ReplacementUtils
 from .punctuation_utils import *
-from .trie import Trie
+from .trie import AhoCorasick, CompactTrie, Trie, TRIE_BACKENDS, create_trie
 from .file_conversion import *
 from .open_ai_prompts import *
 
@@ -19,8 +30,45 @@ __all__ = [
     "ConversionConfig",
     "get_conversion_steps",
     "ConversionOperation",
+    "CompiledStep",
+    "ConversionEngine",
+    "EngineOptions",
+    "get_engine",
+    "engine_key",
+    "BatchStats",
+    "WorkerStats",
+    "convert_many",
+    "convert_many_async",
+    "convert_many_threaded",
+    "shared_dictionary_root",
+    "context_radius",
+    "convert_file",
+    "convert_stream",
+    "DisambiguationBackend",
+    "FakeBackend",
+    "FakeBackendStats",
+    "OpenAIBackend",
+    "DisambiguationCache",
+    "DisambiguationCacheStats",
+    "EntityMatcher",
+    "ConversionEvent",
+    "StageTotals",
+    "StepTimings",
+    "EngineCache",
+    "EngineCacheStats",
+    "engine_cache",
+    "fingerprint_payload",
+    "ResultCache",
+    "ResultCacheStats",
     "initialize_openai_client",
+    "initialize_async_openai_client",
     "DictionaryLoader",
     "ReplacementUtils",
+    "convert_positions",
+    "get_opencc",
     "Trie",
+    "AhoCorasick",
+    "CompactTrie",
+    "TRIE_BACKENDS",
+    "create_trie",
 ]
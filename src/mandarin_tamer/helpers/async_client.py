@@ -0,0 +1,83 @@
+import asyncio
+import random
+import weakref
+from types import SimpleNamespace
+
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_MAX_RETRIES = 5
+HTTP_TOO_MANY_REQUESTS = 429
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """True for an HTTP 429 from the API, without importing openai to check the exception type."""
+    return getattr(error, "status_code", None) == HTTP_TOO_MANY_REQUESTS or type(error).__name__ == "RateLimitError"
+
+
+def retry_after(error: Exception) -> float | None:
+    """Seconds the server asked us to wait before retrying, if it sent a Retry-After header."""
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class LimitedAsyncClient:
+    """Wraps an async OpenAI client so at most `concurrency` requests are in flight at once.
+
+    Requests that hit a rate limit are retried up to `max_retries` times with exponential backoff and jitter, or
+    after the server's Retry-After delay when it sends one. Only `chat.completions.create` is exposed, which is all
+    the disambiguation prompts use. A separate semaphore is kept per event loop, so one client can be shared by
+    conversions run with successive `asyncio.run` calls.
+    """
+
+    def __init__(
+        self,
+        client,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+    ):
+        if concurrency < 1:
+            msg = "concurrency must be at least 1"
+            raise ValueError(msg)
+        self.client = client
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retries = 0
+        self._semaphores: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.concurrency)
+        return semaphore
+
+    def backoff(self, attempt: int, error: Exception) -> float:
+        """Delay before retry number `attempt` (starting at 0)."""
+        delay = retry_after(error)
+        if delay is None:
+            delay = min(self.max_delay, self.base_delay * 2**attempt)
+            delay *= 1 + random.random() / 4  # noqa: S311
+        return delay
+
+    async def create(self, **kwargs):
+        attempt = 0
+        while True:
+            async with self._semaphore():
+                try:
+                    return await self.client.chat.completions.create(**kwargs)
+                except Exception as error:
+                    if not is_rate_limit_error(error) or attempt >= self.max_retries:
+                        raise
+                    delay = self.backoff(attempt, error)
+            # Sleep outside the semaphore so a throttled request doesn't hold up a slot
+            self.retries += 1
+            attempt += 1
+            await asyncio.sleep(delay)
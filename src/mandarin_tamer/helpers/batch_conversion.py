@@ -0,0 +1,324 @@
+import os
+import sys
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Self
+
+from .conversion_config import CONVERSION_CONFIGS
+from .conversion_engine import ConversionEngine, EngineOptions, get_engine
+from .conversion_operations import DictionaryLoader
+from .entity_matcher import EntityMatcher
+from .open_ai_prompts import initialize_async_openai_client
+from .shared_dictionaries import shared_dictionary_root
+
+
+@dataclass
+class WorkerStats:
+    """What one pool worker converted during a batch, and its memory at the end of its last chunk."""
+
+    pid: int
+    chunks: int = 0
+    texts: int = 0
+    characters: int = 0
+    seconds: float = 0.0
+    rss_bytes: int = 0
+    pss_bytes: int | None = None
+
+    @property
+    def chars_per_second(self) -> float:
+        return self.characters / self.seconds if self.seconds else 0.0
+
+
+@dataclass
+class BatchStats:
+    """Throughput figures for one `convert_many` call.
+
+    `rss_bytes` adds up the resident memory of the calling process and every worker, so pages shared between them
+    (such as memory-mapped dictionaries) are counted once per process; `pss_bytes` splits shared pages between the
+    processes sharing them and is the better total, where the platform reports it.
+    """
+
+    texts: int = 0
+    unique_texts: int = 0
+    characters: int = 0
+    workers: int = 1
+    chunksize: int = 1
+    seconds: float = 0.0
+    worker_stats: list[WorkerStats] = field(default_factory=list)
+    rss_bytes: int = 0
+    pss_bytes: int | None = None
+
+    @property
+    def duplicate_rate(self) -> float:
+        return 1 - self.unique_texts / self.texts if self.texts else 0.0
+
+    @property
+    def texts_per_second(self) -> float:
+        return self.texts / self.seconds if self.seconds else 0.0
+
+    @property
+    def chars_per_second(self) -> float:
+        return self.characters / self.seconds if self.seconds else 0.0
+
+
+def memory_usage() -> tuple[int, int | None]:
+    """Resident and proportional set size of this process in bytes (PSS is None where it isn't reported)."""
+    try:
+        lines = Path("/proc/self/smaps_rollup").read_text().splitlines()[1:]
+        sizes = {name: int(value.split()[0]) * 1024 for name, value in (line.split(":", 1) for line in lines)}
+        return sizes["Rss"], sizes["Pss"]
+    except (OSError, KeyError, ValueError):
+        pass
+    try:
+        import resource  # noqa: PLC0415 - Unix only
+    except ImportError:  # Windows
+        return 0, None
+    # Peak rather than current resident size, in kilobytes except on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024, None
+
+
+# Per-process state for pool workers, set up once by `_init_worker`
+_worker_engine: ConversionEngine | None = None
+_worker_ner_list: list | EntityMatcher | None = None
+
+
+def _init_worker(engine_options: dict, ner_list: list | EntityMatcher | None, dictionary_root: Path | None) -> None:
+    global _worker_engine, _worker_ner_list  # noqa: PLW0603
+    if dictionary_root is None:
+        _worker_engine = get_engine(**engine_options)
+    else:
+        _worker_engine = ConversionEngine(**engine_options, loader=DictionaryLoader(dictionary_root))
+    _worker_ner_list = ner_list
+
+
+def _convert_chunk(texts: list[str]) -> tuple[list[str], WorkerStats]:
+    start = time.perf_counter()
+    converted = [_worker_engine.convert(text, _worker_ner_list) for text in texts]
+    seconds = time.perf_counter() - start
+    rss, pss = memory_usage()
+    return converted, WorkerStats(os.getpid(), 1, len(texts), sum(map(len, texts)), seconds, rss, pss)
+
+
+class BatchConverter:
+    """Converts batches of texts with one engine per process, keeping the worker pool alive between batches.
+
+    Use as a context manager so the pool is shut down afterwards. `engine_options` are passed to `get_engine`.
+    With `shared_dictionaries` the workers load memory-mapped dictionary artifacts (see `shared_dictionary_root`)
+    instead of each parsing the JSON dictionaries and building its own phrase tries, so starting a worker is cheap
+    and the dictionary pages are held in memory once however many workers there are.
+    """
+
+    def __init__(
+        self,
+        workers: int | None = 1,
+        chunksize: int | None = None,
+        ner_list: list | EntityMatcher | None = None,
+        shared_dictionaries: bool = True,
+        **engine_options,
+    ):
+        # Reject unknown options here rather than in every worker
+        EngineOptions(**engine_options)
+        self.workers = workers or os.cpu_count() or 1
+        self.chunksize = chunksize
+        self.ner_list = ner_list
+        self.engine_options = engine_options
+        self._pool = None
+        if self.workers > 1:
+            # Imported here because concurrent.futures.process noticeably slows down importing the package
+            from concurrent.futures import ProcessPoolExecutor  # noqa: PLC0415
+
+            dictionary_root = shared_dictionary_root(CONVERSION_CONFIGS) if shared_dictionaries else None
+            self._pool = ProcessPoolExecutor(
+                self.workers, initializer=_init_worker, initargs=(engine_options, ner_list, dictionary_root)
+            )
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def convert(self, texts: Iterable[str]) -> tuple[list[str], BatchStats]:
+        """Convert one batch, converting identical texts once, and return the results in input order."""
+        start = time.perf_counter()
+        texts = list(texts)
+        unique_texts = list(dict.fromkeys(texts))
+        chunksize = self.chunksize or max(1, len(unique_texts) // (self.workers * 4))
+
+        workers: dict[int, WorkerStats] = {}
+        if self._pool is not None and len(unique_texts) > 1:
+            chunks = [unique_texts[index : index + chunksize] for index in range(0, len(unique_texts), chunksize)]
+            converted = []
+            for chunk_results, chunk_stats in self._pool.map(_convert_chunk, chunks):
+                converted.extend(chunk_results)
+                _add_chunk(workers.setdefault(chunk_stats.pid, WorkerStats(chunk_stats.pid)), chunk_stats)
+        else:
+            engine = get_engine(**self.engine_options)
+            converted = [engine.convert(text, self.ner_list) for text in unique_texts]
+
+        by_text = dict(zip(unique_texts, converted, strict=True))
+        rss, pss = memory_usage()
+        worker_stats = sorted(workers.values(), key=lambda worker: worker.pid)
+        stats = BatchStats(
+            texts=len(texts),
+            unique_texts=len(unique_texts),
+            characters=sum(map(len, texts)),
+            workers=self.workers,
+            chunksize=chunksize,
+            seconds=time.perf_counter() - start,
+            worker_stats=worker_stats,
+            rss_bytes=rss + sum(worker.rss_bytes for worker in worker_stats),
+            pss_bytes=None
+            if pss is None or any(worker.pss_bytes is None for worker in worker_stats)
+            else pss + sum(worker.pss_bytes for worker in worker_stats),
+        )
+        return [by_text[text] for text in texts], stats
+
+
+def _add_chunk(worker: WorkerStats, chunk: WorkerStats) -> None:
+    worker.chunks += chunk.chunks
+    worker.texts += chunk.texts
+    worker.characters += chunk.characters
+    worker.seconds += chunk.seconds
+    worker.rss_bytes, worker.pss_bytes = chunk.rss_bytes, chunk.pss_bytes
+
+
+def convert_many(
+    texts: Iterable[str],
+    target_script: str = "zh_cn",
+    ner_list: list | EntityMatcher | None = None,
+    *,
+    workers: int | None = 1,
+    chunksize: int | None = None,
+    shared_dictionaries: bool = True,
+    return_stats: bool = False,
+    **engine_options,
+) -> list[str] | tuple[list[str], BatchStats]:
+    """Convert many texts with one compiled pipeline, returning results in input order.
+
+    Identical inputs are converted once. With `workers` > 1 (or None for one per CPU) the unique texts are spread
+    over a process pool in chunks of `chunksize`; each worker builds its engine once, on memory-mapped dictionaries
+    shared by all workers unless `shared_dictionaries` is False. `ner_list` (a list or a compiled `EntityMatcher`)
+    applies to every text and `engine_options` are the other `EngineOptions` fields. Pass `return_stats=True` to also
+    get a `BatchStats` with the batch throughput, per-worker throughput and memory.
+    """
+    texts = list(texts)
+    workers = min(workers or os.cpu_count() or 1, max(len(set(texts)), 1))
+    with BatchConverter(
+        workers, chunksize, ner_list, shared_dictionaries, target_script=target_script, **engine_options
+    ) as converter:
+        results, stats = converter.convert(texts)
+    return (results, stats) if return_stats else results
+
+
+def convert_many_threaded(
+    texts: Iterable[str],
+    target_script: str = "zh_cn",
+    ner_list: list | EntityMatcher | None = None,
+    *,
+    threads: int | None = None,
+    chunksize: int | None = None,
+    return_stats: bool = False,
+    **engine_options,
+) -> list[str] | tuple[list[str], BatchStats]:
+    """Convert many texts on a thread pool that shares one compiled engine, returning results in input order.
+
+    Identical inputs are converted once and the unique texts are handed to `threads` threads (None for one per CPU)
+    in chunks of `chunksize`. Nothing is pickled or loaded per worker, so this suits servers that already hold the
+    engine; on free-threaded builds the threads convert in parallel, with the GIL they only overlap improved-mode
+    requests. Results match `convert_many`, which takes the same `engine_options`.
+    """
+    # Imported here so the thread pool machinery is only loaded by its callers
+    from concurrent.futures import ThreadPoolExecutor  # noqa: PLC0415
+
+    start = time.perf_counter()
+    texts = list(texts)
+    unique_texts = list(dict.fromkeys(texts))
+    engine = get_engine(target_script, **engine_options)
+    threads = min(threads or os.cpu_count() or 1, max(len(unique_texts), 1))
+    chunksize = chunksize or max(1, len(unique_texts) // (threads * 4))
+    chunks = [unique_texts[index : index + chunksize] for index in range(0, len(unique_texts), chunksize)]
+
+    def convert_chunk(chunk: list[str]) -> list[str]:
+        return [engine.convert(text, ner_list) for text in chunk]
+
+    with ThreadPoolExecutor(threads) as pool:
+        converted = [text for chunk in pool.map(convert_chunk, chunks) for text in chunk]
+
+    by_text = dict(zip(unique_texts, converted, strict=True))
+    results = [by_text[text] for text in texts]
+    if not return_stats:
+        return results
+    stats = BatchStats(
+        texts=len(texts),
+        unique_texts=len(unique_texts),
+        characters=sum(map(len, texts)),
+        workers=threads,
+        chunksize=chunksize,
+        seconds=time.perf_counter() - start,
+    )
+    return results, stats
+
+
+async def convert_many_async(
+    texts: Iterable[str],
+    target_script: str = "zh_cn",
+    ner_list: list | EntityMatcher | None = None,
+    *,
+    concurrency: int = 8,
+    max_retries: int = 5,
+    retry_delay: float = 1.0,
+    client=None,
+    return_stats: bool = False,
+    **engine_options,
+) -> list[str] | tuple[list[str], BatchStats]:
+    """Convert many texts concurrently, overlapping the improved-mode OpenAI requests of different texts.
+
+    At most `concurrency` requests are in flight at once; rate-limited requests are retried up to `max_retries`
+    times with exponential backoff starting at `retry_delay` seconds. Results come back in input order and match
+    `convert_many`, which takes the same `engine_options`. `client` is an async OpenAI-compatible client, built from
+    `openai_backend` or `openai_key` when omitted. Without improved mode there is nothing to wait on, so the texts
+    are simply converted in turn.
+    """
+    start = time.perf_counter()
+    texts = list(texts)
+    unique_texts = list(dict.fromkeys(texts))
+    engine = get_engine(target_script, **engine_options)
+
+    if engine.improved_one_to_many:
+        # Imported here so asyncio is only loaded by callers of the async path
+        import asyncio  # noqa: PLC0415
+
+        from .async_client import LimitedAsyncClient  # noqa: PLC0415
+
+        limited_client = LimitedAsyncClient(
+            client or initialize_async_openai_client(engine.openai_key, engine.openai_backend),
+            concurrency=concurrency,
+            max_retries=max_retries,
+            base_delay=retry_delay,
+        )
+        converted = await asyncio.gather(
+            *(engine.convert_async(text, ner_list, limited_client) for text in unique_texts)
+        )
+    else:
+        converted = [engine.convert(text, ner_list) for text in unique_texts]
+
+    by_text = dict(zip(unique_texts, converted, strict=True))
+    results = [by_text[text] for text in texts]
+    if not return_stats:
+        return results
+    stats = BatchStats(
+        texts=len(texts),
+        unique_texts=len(unique_texts),
+        characters=sum(map(len, texts)),
+        seconds=time.perf_counter() - start,
+    )
+    return results, stats
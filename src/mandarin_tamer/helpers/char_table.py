@@ -0,0 +1,158 @@
+import itertools
+import math
+import sys
+from collections.abc import Iterable
+
+
+# Rough CPython costs: the replace loop checks the sentence once per key (a fixed cost plus a fast memchr-style
+# scan), while `translate` looks every non-ASCII character up in the table
+_SCAN_NS_PER_KEY = 40
+_SCAN_NS_PER_KEY_CHAR = 0.22
+_TRANSLATE_NS_PER_CHAR = 150
+
+
+class CharTable:
+    """A step's char dictionary compiled once into a `str.translate` table.
+
+    The pipeline's char stage used to call `str.replace` for each dictionary key found in the sentence, in
+    dictionary order. That has two effects a plain translate table would lose:
+
+    - a key's output is rewritten again by any *later* key that was also in the original sentence
+      (e.g. `a -> b` then `b -> c` turns `a` into `c`, but only if `b` was there to begin with);
+    - output matching an *earlier* key is left alone.
+
+    Keys whose values contain no later key can't chain, so they go straight into the table. The few "chained" keys
+    are resolved per sentence by replaying those replacements on the value alone.
+
+    Scanning for a handful of keys beats a table lookup per character on long texts, so texts longer than
+    `scan_threshold` (infinite for large dictionaries) keep the sequential replacements, as do dictionaries with
+    multi-character keys. Both routes give the same output.
+    """
+
+    def __init__(self, char_dict: dict):
+        self.char_dict = char_dict
+        self.sequential = any(len(key) != 1 for key in char_dict)
+        self.table: dict[int, str] = {}
+        # Chained key -> later keys its output can be rewritten by, in dictionary order
+        self.chains: dict[str, list[str]] = {}
+        # Key -> rank in dictionary order; only relative ranks matter, so overlays can leave gaps
+        self.order: dict[str, int] = {}
+        self.scan_threshold = _scan_threshold(len(char_dict))
+        self._referrers: dict[str, list[str]] | None = None
+        if self.sequential:
+            return
+
+        self.order = {key: index for index, key in enumerate(char_dict)}
+        for key in char_dict:
+            self._classify(key)
+
+    def _classify(self, key: str) -> None:
+        value = self.char_dict[key]
+        if any(self.order.get(char, -1) > self.order[key] for char in value):
+            self.chains[key] = self._reachable(key)
+        else:
+            self.table[ord(key)] = value
+
+    def _reachable(self, key: str) -> list[str]:
+        order = self.order
+        reachable, pending = set(), [key]
+        while pending:
+            current = pending.pop()
+            for char in self.char_dict[current]:
+                if order.get(char, -1) > order[key] and char not in reachable:
+                    reachable.add(char)
+                    pending.append(char)
+        return sorted(reachable, key=order.__getitem__)
+
+    def overlay(self, include: dict | None = None, exclude: Iterable[str] | None = None) -> "CharTable":
+        """The table for this dictionary merged with `include` and without the `exclude` keys.
+
+        Same result as compiling the merged dictionary (as `DictionaryLoader.merge_dicts` builds it) from scratch,
+        but only the keys whose replacements can chain through a changed key are classified again.
+        """
+        include = include or {}
+        exclude = set(exclude or ())
+        merged = dict(self.char_dict)
+        merged.update(include)
+        for key in exclude:
+            merged.pop(key, None)
+        if self.sequential or any(len(key) != 1 for key in include if key in merged):
+            return CharTable(merged)
+
+        # Overridden keys keep their place and new keys go after every base key, as with dict.update
+        order = {key: rank for key, rank in self.order.items() if key not in exclude}
+        new_keys = (key for key in include if key in merged and key not in self.order)
+        order.update(zip(new_keys, itertools.count(len(self.order))))
+        return self._overlaid(merged, order, self, self._affected(include.keys() | exclude, include))
+
+    @classmethod
+    def _overlaid(cls, char_dict: dict, order: dict[str, int], base: "CharTable", affected: set[str]) -> "CharTable":
+        """`base`'s table and chains carried over to `char_dict`, with only the `affected` keys classified again."""
+        table = cls({})
+        table.char_dict = char_dict
+        table.scan_threshold = _scan_threshold(len(char_dict))
+        table.order = order
+        table.table = base.table.copy()
+        table.chains = base.chains.copy()
+        for key in affected:
+            if len(key) == 1:
+                table.table.pop(ord(key), None)
+                table.chains.pop(key, None)
+            if key in char_dict:
+                table._classify(key)
+        return table
+
+    def _affected(self, changed: set[str], include: dict) -> set[str]:
+        """Changed keys plus every key whose value can lead to one of them, through old or new values."""
+        if self._referrers is None:
+            self._referrers = _referrers(self.char_dict)
+        new_referrers = _referrers(include)
+
+        affected, pending = set(changed), list(changed)
+        while pending:
+            char = pending.pop()
+            for key in (*self._referrers.get(char, ()), *new_referrers.get(char, ())):
+                if key not in affected:
+                    affected.add(key)
+                    pending.append(key)
+        return affected
+
+    def translate(self, sentence: str) -> str:
+        """`sentence` with the replacements applied as the old loop did, keys found in the original sentence only."""
+        if self.sequential or len(sentence) > self.scan_threshold:
+            keys = [key for key in self.char_dict if key in sentence]
+            for key in keys:
+                sentence = sentence.replace(key, self.char_dict[key])
+            return sentence
+        present = [key for key in self.chains if key in sentence]
+        if not present:
+            return sentence.translate(self.table)
+        table = self.table.copy()
+        for key in present:
+            table[ord(key)] = self._resolve_chain(key, sentence)
+        return sentence.translate(table)
+
+    def _resolve_chain(self, key: str, sentence: str) -> str:
+        value = self.char_dict[key]
+        for later_key in self.chains[key]:
+            if later_key in sentence:
+                value = value.replace(later_key, self.char_dict[later_key])
+        return value
+
+    def estimated_size(self) -> int:
+        return sys.getsizeof(self.table) + sys.getsizeof(self.chains) + sys.getsizeof(self.order)
+
+
+def _scan_threshold(key_count: int) -> float:
+    saving_per_char = _TRANSLATE_NS_PER_CHAR - key_count * _SCAN_NS_PER_KEY_CHAR
+    return key_count * _SCAN_NS_PER_KEY / saving_per_char if saving_per_char > 0 else math.inf
+
+
+def _referrers(char_dict: dict) -> dict[str, list[str]]:
+    """Char -> the keys whose values contain it."""
+    referrers: dict[str, list[str]] = {}
+    for key, value in char_dict.items():
+        for char in set(value):
+            referrers.setdefault(char, []).append(key)
+    return referrers
+
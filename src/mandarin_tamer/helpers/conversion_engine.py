@@ -0,0 +1,432 @@
+import sys
+import threading
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from functools import cached_property, partial
+from time import perf_counter
+from weakref import WeakValueDictionary
+
+from .char_table import CharTable
+from .conversion_config import (
+    CONVERSION_CONFIGS,
+    SCRIPT_RESET_STEPS,
+    ConversionConfig,
+    get_conversion_steps,
+)
+from .conversion_operations import ConversionOperation, DictionaryLoader
+from .dictionary_compiler import MappedDictionary
+from .dictionary_overlay import OverlayDict, OverlayMatcher
+from .disambiguation_backends import DisambiguationBackend
+from .disambiguation_cache import (
+    DisambiguationCache,
+    as_disambiguation_cache,
+    cached_batch_func,
+    cached_batch_func_async,
+    cached_token_func,
+    cached_token_func_async,
+)
+from .engine_cache import engine_cache, fingerprint_payload
+from .entity_matcher import EntityMatcher, entity_spans
+from .instrumentation import Observer, emit, emit_operation
+from .open_ai_prompts import (
+    ONE2MANY_PROMPT_INTENTS,
+    OPENAI_MODEL,
+    initialize_async_openai_client,
+    initialize_openai_client,
+    openai_one2many_batch_mappings,
+    openai_one2many_batch_mappings_async,
+    openai_one2many_mapping_async,
+)
+from .protected_spans import ProtectedSpans
+from .replacement_by_dictionary import ReplacementUtils
+from .trie import PhraseMatcher
+
+
+@dataclass(frozen=True)
+class CompiledStep:
+    """Dictionaries and phrase trie for one conversion config, built once and reused for every sentence."""
+
+    config: ConversionConfig
+    char_dict: dict
+    phrase_dict: dict | MappedDictionary | OverlayDict
+    one2many_dict: dict | None
+    phrase_trie: PhraseMatcher | OverlayMatcher | None
+    char_table: CharTable | None = None
+
+    @property
+    def has_phrases(self) -> bool:
+        return self.phrase_trie is not None
+
+    @property
+    def resets_indexes(self) -> bool:
+        return self.config.name in SCRIPT_RESET_STEPS and self.has_phrases
+
+    @cached_property
+    def length_changing_entry(self) -> tuple[str, str] | None:
+        """The first phrase or char replacement whose value is longer or shorter than its key, if there is one.
+
+        Worked out on first use and kept, so the large phrase dictionaries are only walked once per step.
+        """
+        for dictionary in (self.phrase_dict, self.char_dict):
+            for key, value in dictionary.items():
+                if len(key) != len(value):
+                    return key, value
+        return None
+
+    def estimated_size(self) -> int:
+        """Rough number of bytes held by this step's dictionaries and trie."""
+        size = sum(sys.getsizeof(d) for d in (self.char_dict, self.phrase_dict, self.one2many_dict) if d)
+        size += self.char_table.estimated_size() if self.char_table else 0
+        return size + (self.phrase_trie.estimated_size() if self.phrase_trie else 0)
+
+    def with_overlay(
+        self, include: dict | None, exclude: Iterable[str] | None, trie_backend: str | None = None
+    ) -> "CompiledStep":
+        """This step with `include` entries added to (or overriding) every table and the `exclude` keys removed.
+
+        The large phrase dictionary and its trie are layered over rather than copied and rebuilt, so the cost is
+        proportional to the customization; the small char and one-to-many tables are copied at C speed.
+        """
+        merge = DictionaryLoader.merge_dicts
+        phrase_dict = OverlayDict(self.phrase_dict, include, exclude)
+        if not phrase_dict or not any(phrase_dict.values()):
+            phrase_trie = None
+        elif self.phrase_trie is None:
+            # The base had nothing to match, so the trie only holds the included phrases
+            phrase_trie = ReplacementUtils.build_trie_from_dict(phrase_dict, trie_backend)
+        else:
+            phrase_trie = OverlayMatcher(self.phrase_trie, include, exclude, trie_backend)
+        return CompiledStep(
+            config=self.config,
+            char_dict=merge(self.char_dict, include, exclude),
+            phrase_dict=phrase_dict,
+            one2many_dict=merge(self.one2many_dict, include, exclude) if self.one2many_dict is not None else None,
+            phrase_trie=phrase_trie,
+            char_table=self.char_table.overlay(include, exclude),
+        )
+
+
+@dataclass
+class EngineOptions:
+    """The options that select and customize a conversion pipeline.
+
+    `ConversionEngine`, `get_engine`, `engine_key` and the batch and streaming helpers take these as keyword
+    arguments and pass them through, so an option is only declared here.
+    """
+
+    target_script: str = "zh_cn"
+    modernize: bool = True
+    normalize: bool = True
+    taiwanize: bool = True
+    improved_one_to_many: bool = False
+    include_dicts: dict | None = None
+    exclude_lists: dict | None = None
+    openai_key: str | None = None
+    trie_backend: str | None = None
+    batch_one_to_many: bool = False
+    disambiguation_cache: DisambiguationCache | str | None = None
+    openai_backend: DisambiguationBackend | None = None
+
+    def __post_init__(self):
+        self.disambiguation_cache = as_disambiguation_cache(self.disambiguation_cache)
+
+    def key(self) -> tuple:
+        """The `engine_cache` key of an engine built with these options, equal for equal custom dictionaries."""
+        return (
+            self.target_script,
+            self.modernize,
+            self.normalize,
+            self.taiwanize,
+            self.improved_one_to_many,
+            self.trie_backend,
+            self.batch_one_to_many,
+            self.disambiguation_cache,
+            self.openai_backend,
+            # Hashing is most of the cost of a key, so skip it for the common uncustomized case
+            fingerprint_payload(self.include_dicts or {}, self.exclude_lists or {}, self.openai_key)
+            if self.include_dicts or self.exclude_lists or self.openai_key
+            else None,
+        )
+
+
+# Uncustomized steps shared by every live engine, so engines with include/exclude options only build overlays
+_base_steps: "WeakValueDictionary[tuple, CompiledStep]" = WeakValueDictionary()
+_base_steps_lock = threading.Lock()
+
+
+class ConversionEngine:
+    """Long-lived conversion pipeline for one combination of options.
+
+    All dictionaries and phrase tries are loaded and compiled when the engine is created, so `convert` only
+    does the per-sentence work and can be called any number of times.
+
+    The compiled pipeline is immutable: `steps` is a tuple of frozen `CompiledStep`s whose matchers and tables are
+    fully built before the constructor returns, and `convert` keeps all per-sentence state in locals. One engine can
+    therefore be called from any number of threads at once without locking, including on free-threaded builds
+    (see `convert_many_threaded`). Don't mutate the dictionaries of a step that is in use.
+    """
+
+    def __init__(self, target_script: str = "zh_cn", loader: DictionaryLoader | None = None, **engine_options):
+        """Compile the pipeline for `target_script`; `engine_options` are the other `EngineOptions` fields."""
+        options = EngineOptions(target_script, **engine_options)
+        self.options = options
+        self.target_script = target_script
+        self.improved_one_to_many = options.improved_one_to_many
+        self.batch_one_to_many = options.batch_one_to_many
+        self.disambiguation_cache = options.disambiguation_cache
+        self.openai_key = options.openai_key
+        self.openai_backend = options.openai_backend
+        self.openai_client = initialize_openai_client(
+            options.openai_key, options.improved_one_to_many, options.openai_backend
+        )
+        self._async_openai_client = None
+        self._async_openai_client_lock = threading.Lock()
+        self.conversion_sequence = get_conversion_steps(
+            target_script,
+            {
+                "modernize": options.modernize,
+                "normalize": options.normalize,
+                "taiwanize": options.taiwanize,
+            },
+        )
+
+        loader = loader or DictionaryLoader()
+        compiled: dict[str, CompiledStep] = {}
+        for config_name in self.conversion_sequence:
+            if config_name not in compiled:
+                compiled[config_name] = self.compile_step(
+                    CONVERSION_CONFIGS[config_name],
+                    loader,
+                    options.include_dicts,
+                    options.exclude_lists,
+                    options.trie_backend,
+                )
+        self.steps = tuple(compiled[config_name] for config_name in self.conversion_sequence)
+
+    @staticmethod
+    def compile_step(
+        config: ConversionConfig,
+        loader: DictionaryLoader,
+        include_dicts: dict | None = None,
+        exclude_lists: dict | None = None,
+        trie_backend: str | None = None,
+    ) -> CompiledStep:
+        """Compiled step for a config: the shared base step, with the config's include/exclude entries layered on."""
+        base = ConversionEngine.base_step(config, loader, trie_backend)
+        include_dict = include_dicts.get(config.include_key) if include_dicts and config.include_key else None
+        exclude_list = exclude_lists.get(config.include_key) if exclude_lists and config.include_key else None
+        if not include_dict and not exclude_list:
+            return base
+        return base.with_overlay(include_dict, exclude_list, trie_backend)
+
+    @staticmethod
+    def base_step(config: ConversionConfig, loader: DictionaryLoader, trie_backend: str | None = None) -> CompiledStep:
+        """Uncustomized step for a config, compiled once and shared while any engine still uses it."""
+        # The step keeps its config alive, so the config's id can't be reused while the entry exists
+        key = (id(config), type(loader), loader.base_path, loader.use_artifacts, trie_backend)
+        with _base_steps_lock:
+            step = _base_steps.get(key)
+        if step is None:
+            step = ConversionEngine.load_step(config, loader, trie_backend)
+            with _base_steps_lock:
+                step = _base_steps.setdefault(key, step)
+        return step
+
+    @staticmethod
+    def load_step(config: ConversionConfig, loader: DictionaryLoader, trie_backend: str | None = None) -> CompiledStep:
+        """Load the dictionaries for a config and build its phrase trie with the chosen backend.
+
+        A phrase dictionary loaded from a precompiled artifact already carries its automaton, which is used
+        directly unless a different backend was requested explicitly.
+        """
+        dicts = loader.load_conversion_config(config)
+        phrase_dict = dicts["phrase"] or {}
+        has_phrases = bool(phrase_dict) and any(phrase_dict.values())
+        if not has_phrases:
+            phrase_trie = None
+        elif isinstance(phrase_dict, MappedDictionary) and trie_backend in (None, "compact"):
+            phrase_trie = phrase_dict.trie
+        else:
+            phrase_trie = ReplacementUtils.build_trie_from_dict(phrase_dict, trie_backend)
+        # Char and one2many tables are small and looked up per character, so keep them as plain dicts
+        char_dict = dict(dicts["char"] or {})
+        return CompiledStep(
+            config=config,
+            char_dict=char_dict,
+            phrase_dict=phrase_dict,
+            one2many_dict=dict(dicts["one2many"]) if dicts["one2many"] is not None else None,
+            phrase_trie=phrase_trie,
+            char_table=CharTable(char_dict),
+        )
+
+    def estimated_size(self) -> int:
+        """Rough number of bytes held by the compiled steps, used to budget the engine cache."""
+        unique_steps = {id(step): step for step in self.steps}
+        return sum(step.estimated_size() for step in unique_steps.values())
+
+    def convert(self, text: str, ner_list: list | EntityMatcher | None = None, observer: Observer | None = None) -> str:
+        """Convert a single text through every step of the pipeline, leaving the named entities unchanged.
+
+        `observer`, when given, is called with a `ConversionEvent` for every step and sub-stage.
+        """
+        if getattr(ner_list, "masking", False):
+            masked, placeholders = ner_list.mask(text)
+            return self.convert(masked, observer=observer).translate(placeholders)
+        ner_indexes = entity_spans(text, ner_list)
+        current_indexes = ner_indexes
+        for step in self.steps:
+            text, current_indexes = self.apply_step(text, step, current_indexes, ner_indexes, observer)
+        return text
+
+    async def convert_async(self, text: str, ner_list: list | EntityMatcher | None = None, client=None) -> str:
+        """Coroutine version of `convert` that awaits improved-mode disambiguation requests on an async client.
+
+        Run many of these concurrently (see `convert_many_async`) to overlap the requests of different texts. The
+        result is the same as `convert`. `client` should be one `LimitedAsyncClient` shared by all the concurrent
+        calls so its limit covers them together; it defaults to one built from the engine's OpenAI key.
+        """
+        if not self.improved_one_to_many:
+            return self.convert(text, ner_list)
+        client = client or self.async_openai_client
+        if getattr(ner_list, "masking", False):
+            masked, placeholders = ner_list.mask(text)
+            return (await self.convert_async(masked, client=client)).translate(placeholders)
+        ner_indexes = entity_spans(text, ner_list)
+        current_indexes = ner_indexes
+        for step in self.steps:
+            text, current_indexes = await self.apply_step_async(text, step, current_indexes, ner_indexes, client)
+        return text
+
+    @property
+    def async_openai_client(self):
+        """Concurrency-limited async OpenAI client for `convert_async`, created on first use."""
+        with self._async_openai_client_lock:
+            if self._async_openai_client is None:
+                # Imported here so asyncio is only loaded by callers of the async path
+                from .async_client import LimitedAsyncClient  # noqa: PLC0415
+
+                # One client per engine, or threads racing here would each get their own concurrency limit
+                self._async_openai_client = LimitedAsyncClient(
+                    initialize_async_openai_client(self.openai_key, self.openai_backend)
+                )
+            return self._async_openai_client
+
+    def token_func(self, config: ConversionConfig, asynchronous: bool = False) -> Callable | None:
+        """The per-token disambiguation function for a step, consulting the disambiguation cache when there is one."""
+        if not config.openai_func:
+            return None
+        func = partial(openai_one2many_mapping_async, config.openai_func) if asynchronous else config.openai_func
+        if self.disambiguation_cache is None:
+            return func
+        wrap = cached_token_func_async if asynchronous else cached_token_func
+        return wrap(self.disambiguation_cache, func, config.openai_func.__name__, OPENAI_MODEL)
+
+    def batch_func(self, config: ConversionConfig, asynchronous: bool = False) -> Callable | None:
+        """The one-request-per-sentence disambiguation function for a step, when batching is enabled."""
+        if not self.batch_one_to_many or config.openai_func not in ONE2MANY_PROMPT_INTENTS:
+            return None
+        func = openai_one2many_batch_mappings_async if asynchronous else openai_one2many_batch_mappings
+        func = partial(func, ONE2MANY_PROMPT_INTENTS[config.openai_func])
+        if self.disambiguation_cache is None:
+            return func
+        wrap = cached_batch_func_async if asynchronous else cached_batch_func
+        return wrap(self.disambiguation_cache, func, config.openai_func.__name__, OPENAI_MODEL)
+
+    def apply_step(
+        self,
+        sentence: str,
+        step: CompiledStep,
+        current_indexes: ProtectedSpans,
+        ner_indexes: ProtectedSpans,
+        observer: Observer | None = None,
+    ) -> tuple[str, ProtectedSpans]:
+        """Apply one compiled conversion step to a sentence."""
+        config = step.config
+        step_start = perf_counter() if observer else 0.0
+        new_sentence, phrase_indexes = self.apply_phrases(sentence, step, current_indexes, ner_indexes, observer)
+
+        if step.one2many_dict and (config.openai_func or config.opencc_config):
+            start = perf_counter() if observer else 0.0
+            operation = ConversionOperation(new_sentence, phrase_indexes)
+            new_sentence = operation.apply_one_to_many_conversion(
+                step.one2many_dict,
+                self.improved_one_to_many,
+                self.token_func(config) if self.improved_one_to_many else None,
+                # Also the fallback for steps without a prompt and for positions a batched response left unanswered
+                config.opencc_config,
+                self.openai_client if self.improved_one_to_many else None,
+                self.batch_func(config) if self.improved_one_to_many else None,
+            )
+            if observer:
+                emit_operation(observer, "one2many", config.name, start, operation, new_sentence, phrase_indexes)
+
+        start = perf_counter() if observer else 0.0
+        operation = ConversionOperation(new_sentence, phrase_indexes)
+        result = operation.apply_char_conversion(step.char_dict, step.char_table)
+        if observer:
+            emit_operation(observer, "char", config.name, start, operation, result[0], phrase_indexes)
+            emit(observer, "step", config.name, step_start, sentence, result[0], phrase_indexes)
+        return result
+
+    async def apply_step_async(
+        self,
+        sentence: str,
+        step: CompiledStep,
+        current_indexes: ProtectedSpans,
+        ner_indexes: ProtectedSpans,
+        client,
+    ) -> tuple[str, ProtectedSpans]:
+        """`apply_step` for improved mode, awaiting the one-to-many requests on `client`."""
+        config = step.config
+        new_sentence, phrase_indexes = self.apply_phrases(sentence, step, current_indexes, ner_indexes)
+
+        if step.one2many_dict and (config.openai_func or config.opencc_config):
+            operation = ConversionOperation(new_sentence, phrase_indexes)
+            new_sentence = await operation.apply_one_to_many_conversion_async(
+                step.one2many_dict,
+                self.token_func(config, asynchronous=True),
+                config.opencc_config,
+                client,
+                self.batch_func(config, asynchronous=True),
+            )
+
+        operation = ConversionOperation(new_sentence, phrase_indexes)
+        return operation.apply_char_conversion(step.char_dict, step.char_table)
+
+    @staticmethod
+    def apply_phrases(
+        sentence: str,
+        step: CompiledStep,
+        current_indexes: ProtectedSpans,
+        ner_indexes: ProtectedSpans,
+        observer: Observer | None = None,
+    ) -> tuple[str, ProtectedSpans]:
+        """Phrase stage of a step, returning the sentence and the indexes later stages must leave alone."""
+        # Always include NER indexes in current_indexes
+        current_indexes = current_indexes.union(ner_indexes)
+        phrase_indexes = ner_indexes if step.resets_indexes else current_indexes
+
+        if step.has_phrases:
+            start = perf_counter() if observer else 0.0
+            operation = ConversionOperation(sentence, phrase_indexes)
+            result = operation.apply_phrase_conversion(step.phrase_dict, step.phrase_trie)
+            if observer:
+                emit_operation(observer, "phrase", step.config.name, start, operation, *result)
+            return result
+        return sentence, phrase_indexes
+
+
+def get_engine(target_script: str = "zh_cn", **engine_options) -> ConversionEngine:
+    """Return a shared engine for the given options from the process-wide `engine_cache`.
+
+    `engine_options` are the other `EngineOptions` fields. Engines are keyed by the target script, the step flags and
+    a content hash of the include/exclude payloads, so callers passing equal custom dictionaries share one compiled
+    engine.
+    """
+    options = EngineOptions(target_script, **engine_options)
+    return engine_cache.get_or_create(options.key(), lambda: ConversionEngine(**vars(options)))
+
+
+def engine_key(target_script: str = "zh_cn", **engine_options) -> tuple:
+    """The `engine_cache` key of an engine built with these options, equal for equal custom dictionaries."""
+    return EngineOptions(target_script, **engine_options).key()
@@ -2,11 +2,14 @@ from collections.abc import Callable
 from dataclasses import dataclass
 from pathlib import Path
 
-from opencc import OpenCC
-
+from .char_table import CharTable
 from .conversion_config import ConversionConfig
+from .dictionary_compiler import MappedDictionary, load_fresh_artifact
 from .file_conversion import FileConversion
+from .opencc_utils import convert_positions, find_ambiguous_positions
+from .protected_spans import ProtectedSpans
 from .replacement_by_dictionary import ReplacementUtils
+from .trie import PhraseMatcher, Trie
 
 
 @dataclass
@@ -14,38 +17,42 @@ class ConversionOperation:
     """Base class for conversion operations."""
 
     sentence: str
-    indexes_to_protect: list[tuple[int, int]] | None = None
+    indexes_to_protect: ProtectedSpans | None = None
     include_dict: dict | None = None
     exclude_list: list | None = None
 
-    def __init__(self, sentence: str, indexes_to_protect: list[tuple[int, int]] | None = None):
+    def __init__(self, sentence: str, indexes_to_protect: ProtectedSpans | list[tuple[int, int]] | None = None):
         self.sentence = sentence
-        self.indexes_to_protect = indexes_to_protect or []
-        self._phrase_trie = None
-
-    def apply_phrase_conversion(self, phrase_dict: dict) -> tuple[str, list[tuple[int, int]]]:
-        """Apply phrase-level conversion."""
-        if not phrase_dict or not any(phrase_dict.values()):
-            return self.sentence, self.indexes_to_protect or []
-
-        # Build trie once
-        self._phrase_trie = self._phrase_trie or ReplacementUtils.build_trie_from_dict(phrase_dict)
-        # Get all matches
-        matches = sorted(self._phrase_trie.find_all_matches(self.sentence), reverse=True)
+        self.indexes_to_protect = ProtectedSpans.of(indexes_to_protect)
+        # Phrases replaced or ambiguous characters found by the last conversion, for observers
+        self.matches: int | None = None
+
+    def apply_phrase_conversion(
+        self, phrase_dict: dict, phrase_trie: Trie | PhraseMatcher | None = None
+    ) -> tuple[str, ProtectedSpans]:
+        """Apply phrase-level conversion, reusing `phrase_trie` when it was built ahead of time."""
+        # A prebuilt trie means the caller already checked there are phrases, which is slow on a mapped artifact
+        if phrase_trie is None and (not phrase_dict or not any(phrase_dict.values())):
+            return self.sentence, self.indexes_to_protect
+
+        # Shared matchers are only read, never built or cached here, so one can serve many threads at once
+        phrase_trie = phrase_trie or ReplacementUtils.build_trie_from_dict(phrase_dict)
+        # Get all matches, last start first (find_all_matches already returns them in ascending order)
+        matches = reversed(phrase_trie.find_all_matches(self.sentence))
 
         # Apply replacements from end to start
         result = list(self.sentence)
-        new_indexes = set(self.indexes_to_protect or [])
+        protected = self.indexes_to_protect
+        new_indexes = []
 
         for start, end, replacement in matches:
-            # Check if this range overlaps with protected indexes
-            if not any(
-                p_start <= start < p_end or p_start < end <= p_end for p_start, p_end in (self.indexes_to_protect or [])
-            ):
+            # Skip matches that start or end inside a protected range
+            if not (protected.contains(start) or protected.contains(end - 1)):
                 result[start:end] = replacement
-                new_indexes.add((start, start + len(replacement)))
+                new_indexes.append((start, start + len(replacement)))
 
-        return "".join(result), sorted(new_indexes)
+        self.matches = len(new_indexes)
+        return "".join(result), protected.union(new_indexes)
 
     def apply_one_to_many_conversion(
         self,
@@ -54,51 +61,104 @@ class ConversionOperation:
         openai_func: Callable | None = None,
         opencc_config: str | None = None,
         openai_client: Callable | None = None,
+        openai_batch_func: Callable | None = None,
     ) -> str:
-        """Apply one-to-many character conversion."""
+        """Apply one-to-many character conversion.
+
+        In improved mode `openai_batch_func`, when given, resolves all ambiguous positions with one request; any
+        position it leaves unanswered falls back to OpenCC.
+        """
         if not use_improved_mode and not opencc_config:
             msg = "Either improved mode or opencc_config must be specified"
             raise ValueError(msg)
 
         new_sentence = self.sentence
-        indexes_to_protect = self.indexes_to_protect or []
 
-        if use_improved_mode and openai_func:
+        positions = find_ambiguous_positions(new_sentence, mapping_dict)
+        self.matches = len(positions)
+        if use_improved_mode and openai_batch_func and positions:
+            choices = openai_batch_func(new_sentence, self._ambiguous(positions, mapping_dict), openai_client)
+            new_sentence = self._apply_batch_choices(new_sentence, positions, choices, opencc_config)
+        elif use_improved_mode and openai_func:
             for char in mapping_dict:
                 if char in new_sentence:
                     new_sentence = new_sentence.replace(
                         char, openai_func(new_sentence, char, mapping_dict, openai_client)
                     )
-        else:
-            cc = OpenCC(opencc_config)
-            cc_converted = cc.convert(new_sentence)
+        elif positions:
+            # OpenCC only sees a small window around each ambiguous character, not the whole sentence
+            new_sentence = self._replace_positions(
+                new_sentence, convert_positions(new_sentence, positions, opencc_config)
+            )
+
+        return self.indexes_to_protect.restore(self.sentence, new_sentence)
+
+    async def apply_one_to_many_conversion_async(
+        self,
+        mapping_dict: dict,
+        openai_func: Callable | None = None,
+        opencc_config: str | None = None,
+        openai_client=None,
+        openai_batch_func: Callable | None = None,
+    ) -> str:
+        """Improved-mode one-to-many conversion with coroutine `openai_func` / `openai_batch_func` and an async client.
+
+        Sends the same requests in the same order as `apply_one_to_many_conversion`, so the result is identical.
+        Requests within a sentence stay sequential because each per-token prompt sees the earlier replacements;
+        the concurrency comes from converting many sentences at once.
+        """
+        new_sentence = self.sentence
+        positions = find_ambiguous_positions(new_sentence, mapping_dict)
+        self.matches = len(positions)
+        if openai_batch_func and positions:
+            choices = await openai_batch_func(new_sentence, self._ambiguous(positions, mapping_dict), openai_client)
+            new_sentence = self._apply_batch_choices(new_sentence, positions, choices, opencc_config)
+        elif openai_func:
             for char in mapping_dict:
                 if char in new_sentence:
-                    new_sentence = new_sentence.replace(char, cc_converted[new_sentence.index(char)])
+                    replacement = await openai_func(new_sentence, char, mapping_dict, openai_client)
+                    new_sentence = new_sentence.replace(char, replacement)
+        elif positions:
+            new_sentence = self._replace_positions(
+                new_sentence, convert_positions(new_sentence, positions, opencc_config)
+            )
 
-        return ReplacementUtils.revert_protected_indexes(self.sentence, new_sentence, indexes_to_protect)
+        return self.indexes_to_protect.restore(self.sentence, new_sentence)
 
-    def apply_char_conversion(self, char_dict: dict) -> tuple[str, list[tuple[int, int]] | None]:
-        """Apply character-level conversion."""
-        chars_in_sentence = [char for char in char_dict if char in self.sentence]
-        new_sentence = self.sentence
-        indexes_to_protect = self.indexes_to_protect or []
+    def _ambiguous(self, positions: list[int], mapping_dict: dict) -> list[tuple[int, str, list[str]]]:
+        return [(position, self.sentence[position], mapping_dict[self.sentence[position]]) for position in positions]
+
+    def _apply_batch_choices(
+        self, sentence: str, positions: list[int], choices: dict[int, str], opencc_config: str | None
+    ) -> str:
+        unanswered = [position for position in positions if position not in choices]
+        if unanswered and opencc_config:
+            choices |= convert_positions(sentence, unanswered, opencc_config)
+        return self._replace_positions(sentence, choices)
 
-        for char in chars_in_sentence:
-            new_sentence = new_sentence.replace(char, char_dict[char])
+    @staticmethod
+    def _replace_positions(sentence: str, replacements: dict[int, str]) -> str:
+        chars = list(sentence)
+        for position, replacement in replacements.items():
+            chars[position] = replacement
+        return "".join(chars)
 
-        final_sentence = ReplacementUtils.revert_protected_indexes(self.sentence, new_sentence, indexes_to_protect)
-        return final_sentence, indexes_to_protect
+    def apply_char_conversion(self, char_dict: dict, char_table: CharTable | None = None) -> tuple[str, ProtectedSpans]:
+        """Apply character-level conversion, reusing `char_table` when it was compiled ahead of time."""
+        char_table = char_table or CharTable(char_dict)
+        new_sentence = char_table.translate(self.sentence)
+        return self.indexes_to_protect.restore(self.sentence, new_sentence), self.indexes_to_protect
 
 
 class DictionaryLoader:
     """Handles loading and merging of conversion dictionaries."""
 
-    def __init__(self, base_path: Path | None = None):
+    def __init__(self, base_path: Path | None = None, use_artifacts: bool = True):
         if base_path is None:
             # Use the package's conversion_dictionaries directory
             base_path = Path(__file__).parent.parent / "conversion_dictionaries"
         self.base_path = base_path
+        self.use_artifacts = use_artifacts
 
     def load_conversion_config(
         self,
@@ -130,13 +190,18 @@ class DictionaryLoader:
             else None,
         }
 
+    @staticmethod
     def merge_dicts(
-        self,
-        base_dict: dict,
+        base_dict: dict | MappedDictionary,
         include_dict: dict | None = None,
         exclude_list: list | None = None,
-    ) -> dict:
-        """Merge dictionaries with include/exclude options."""
+    ) -> dict | MappedDictionary:
+        """Merge dictionaries with include/exclude options.
+
+        Without options the base dictionary is returned as is, so a memory-mapped artifact is not copied.
+        """
+        if not include_dict and not exclude_list:
+            return base_dict
         merged_dict = base_dict.copy()
         if include_dict:
             merged_dict.update(include_dict)
@@ -145,7 +210,9 @@ class DictionaryLoader:
                 merged_dict.pop(item, None)
         return merged_dict
 
-    def load_dict(self, sub_dir: str, filename: str) -> dict:
-        """Load a dictionary from file."""
+    def load_dict(self, sub_dir: str, filename: str) -> dict | MappedDictionary:
+        """Load a dictionary from file, preferring a fresh precompiled artifact over parsing the JSON."""
         path = self.base_path / sub_dir / filename if sub_dir else self.base_path / filename
+        if self.use_artifacts and (artifact := load_fresh_artifact(path)) is not None:
+            return artifact
         return FileConversion.json_to_dict(path)
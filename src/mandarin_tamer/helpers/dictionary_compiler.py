@@ -0,0 +1,247 @@
+import hashlib
+import json
+import mmap
+import struct
+import sys
+from array import array
+from collections.abc import Iterator, Mapping, Sequence
+from pathlib import Path
+
+from .trie import CompactTrie
+
+
+ARTIFACT_SUFFIX = ".mtd"
+ARTIFACT_VERSION = 1
+DICTIONARY_PATTERNS = ("*_chars.json", "*_phrases.json", "*_one2many.json")
+
+_MAGIC = b"MTDICT\0\0"
+# magic, version, little-endian flag, value kind, max key length, node count, key count, value count,
+# source size, source mtime, source sha256
+_HEADER = struct.Struct("<8sIIIIIIIQq32s")
+_VALUE_KIND_STR = 0
+_VALUE_KIND_JSON = 1
+# (type code, length offset from node count) for each node array section, in file order
+_SECTIONS = (
+    ("first_child", "I", 1),
+    ("edge_chars", "I", -1),
+    ("value_index", "i", 0),
+    ("fail", "I", 0),
+    ("output", "I", 0),
+    ("depth", "H", 0),
+)
+
+
+def artifact_path_for(json_path: Path) -> Path:
+    return Path(json_path).with_suffix(ARTIFACT_SUFFIX)
+
+
+class _MappedValues(Sequence):
+    """Interned dictionary values, decoded from the memory map on first access."""
+
+    def __init__(self, offsets: memoryview, blob: memoryview, kind: int):
+        self._offsets = offsets
+        self._blob = blob
+        self._kind = kind
+        self._decoded: dict[int, object] = {}
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        value = self._decoded.get(index)
+        if value is None:
+            raw = bytes(self._blob[self._offsets[index] : self._offsets[index + 1]]).decode("utf-8")
+            value = raw if self._kind == _VALUE_KIND_STR else json.loads(raw)
+            self._decoded[index] = value
+        return value
+
+
+class MappedDictionary(Mapping):
+    """Read-only dictionary backed by a memory-mapped artifact.
+
+    Lookups walk the compiled `trie`, which is also the ready-made phrase matcher, so nothing is parsed at load
+    time and every process mapping the same artifact shares its physical pages.
+    """
+
+    def __init__(self, trie: CompactTrie, key_count: int, path: Path, buffer: mmap.mmap | None = None):
+        self.trie = trie
+        self.path = path
+        self._key_count = key_count
+        self._buffer = buffer
+
+    def __getitem__(self, key):
+        if not isinstance(key, str):
+            raise KeyError(key)
+        node = self.trie.find_node(key)
+        if not node or self.trie.value_index[node] < 0:
+            raise KeyError(key)
+        return self.trie.values[self.trie.value_index[node]]
+
+    def __contains__(self, key) -> bool:
+        if not isinstance(key, str):
+            return False
+        node = self.trie.find_node(key)
+        return bool(node) and self.trie.value_index[node] >= 0
+
+    def __iter__(self) -> Iterator[str]:
+        return (key for key, _ in self.trie.items())
+
+    def __len__(self) -> int:
+        return self._key_count
+
+    def __repr__(self) -> str:
+        return repr(dict(self.trie.items()))
+
+    def copy(self) -> dict:
+        return dict(self.trie.items())
+
+
+def compile_dictionary(json_path: Path, artifact_path: Path | None = None) -> Path:
+    """Compile one JSON dictionary, including its matching automaton, into a binary artifact."""
+    json_path = Path(json_path)
+    artifact_path = artifact_path or artifact_path_for(json_path)
+    source = json_path.read_bytes()
+    dictionary = json.loads(source)
+
+    trie = CompactTrie()
+    for key, value in dictionary.items():
+        trie.insert(key, value)
+    trie.build()
+
+    kind = _VALUE_KIND_STR if all(isinstance(value, str) for value in trie.values) else _VALUE_KIND_JSON
+    encoded_values = [
+        (value if kind == _VALUE_KIND_STR else json.dumps(value, ensure_ascii=False)).encode("utf-8")
+        for value in trie.values
+    ]
+    value_offsets = array("I", [0])
+    for encoded in encoded_values:
+        value_offsets.append(value_offsets[-1] + len(encoded))
+
+    stat = json_path.stat()
+    header = _HEADER.pack(
+        _MAGIC,
+        ARTIFACT_VERSION,
+        sys.byteorder == "little",
+        kind,
+        trie.max_key_length,
+        trie.node_count,
+        len(trie.key_nodes),
+        len(trie.values),
+        stat.st_size,
+        stat.st_mtime_ns,
+        hashlib.sha256(source).digest(),
+    )
+    sections = [getattr(trie, name).tobytes() for name, _, _ in _SECTIONS]
+    sections += [trie.key_nodes.tobytes(), value_offsets.tobytes(), b"".join(encoded_values)]
+
+    tmp_path = artifact_path.with_suffix(artifact_path.suffix + ".tmp")
+    with tmp_path.open("wb") as file:
+        file.write(_pad(header))
+        for section in sections:
+            file.write(_pad(section))
+    # Atomic rename so concurrent readers never map a half-written file
+    tmp_path.replace(artifact_path)
+    return artifact_path
+
+
+def compile_dictionaries(root: Path | None = None) -> list[Path]:
+    """Compile every chars/phrases/one2many JSON dictionary below `root` (the bundled dictionaries by default)."""
+    if root is None:
+        root = Path(__file__).parent.parent / "conversion_dictionaries"
+    json_paths = sorted({path for pattern in DICTIONARY_PATTERNS for path in Path(root).rglob(pattern)})
+    return [compile_dictionary(path) for path in json_paths]
+
+
+def _pad(data: bytes) -> bytes:
+    return data + b"\0" * (-len(data) % 8)
+
+
+def _read_header(buffer) -> tuple | None:
+    if len(buffer) < _HEADER.size:
+        return None
+    header = _HEADER.unpack_from(buffer)
+    if header[0] != _MAGIC or header[1] != ARTIFACT_VERSION or header[2] != (sys.byteorder == "little"):
+        return None
+    return header
+
+
+def is_artifact_fresh(json_path: Path, artifact_path: Path | None = None) -> bool:
+    """True when the artifact exists, has the current format and was compiled from the current JSON."""
+    artifact_path = artifact_path or artifact_path_for(json_path)
+    try:
+        with Path(artifact_path).open("rb") as file:
+            header = _read_header(file.read(_HEADER.size))
+        stat = Path(json_path).stat()
+    except OSError:
+        return False
+    if header is None or header[8] != stat.st_size:
+        return False
+    if header[9] == stat.st_mtime_ns:
+        return True
+    # Installers often reset modification times, so fall back to comparing content hashes
+    return hashlib.sha256(Path(json_path).read_bytes()).digest() == header[10]
+
+
+def load_artifact(artifact_path: Path) -> MappedDictionary:
+    """Memory-map an artifact and wrap its arrays without copying or parsing them."""
+    artifact_path = Path(artifact_path)
+    with artifact_path.open("rb") as file:
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(buffer)
+    header = _read_header(view)
+    if header is None:
+        msg = f"{artifact_path} is not a version {ARTIFACT_VERSION} dictionary artifact"
+        raise ValueError(msg)
+    _, _, _, kind, max_key_length, node_count, key_count, value_count, _, _, _ = header
+
+    offset = _HEADER.size + (-_HEADER.size % 8)
+    arrays = {}
+    for name, typecode, extra in _SECTIONS:
+        length = (node_count + extra) * array(typecode).itemsize
+        arrays[name] = view[offset : offset + length].cast(typecode)
+        offset += length + (-length % 8)
+    key_nodes_length = key_count * array("I").itemsize
+    arrays["key_nodes"] = view[offset : offset + key_nodes_length].cast("I")
+    offset += key_nodes_length + (-key_nodes_length % 8)
+    offsets_length = (value_count + 1) * array("I").itemsize
+    value_offsets = view[offset : offset + offsets_length].cast("I")
+    offset += offsets_length + (-offsets_length % 8)
+    blob = view[offset : offset + value_offsets[-1]]
+
+    trie = CompactTrie.from_arrays(
+        values=_MappedValues(value_offsets, blob, kind), max_key_length=max_key_length, **arrays
+    )
+    return MappedDictionary(trie, key_count, artifact_path, buffer)
+
+
+_loaded_artifacts: dict[tuple[Path, int], MappedDictionary] = {}
+
+
+def load_fresh_artifact(json_path: Path) -> MappedDictionary | None:
+    """Return the mapped artifact for a JSON dictionary if it is present and fresh, otherwise None.
+
+    Mappings are shared within the process, so every engine using the same dictionary reads the same pages.
+    """
+    artifact_path = artifact_path_for(json_path)
+    if not is_artifact_fresh(json_path, artifact_path):
+        return None
+    key = (artifact_path, artifact_path.stat().st_mtime_ns)
+    if key not in _loaded_artifacts:
+        _loaded_artifacts[key] = load_artifact(artifact_path)
+    return _loaded_artifacts[key]
+
+
+def main(argv: list[str] | None = None) -> None:
+    import argparse  # noqa: PLC0415 - only the command-line entry point needs it
+
+    parser = argparse.ArgumentParser(description="Compile JSON conversion dictionaries into mmap-able artifacts.")
+    parser.add_argument("root", nargs="?", type=Path, help="Directory to search (default: bundled dictionaries)")
+    args = parser.parse_args(argv)
+    for path in compile_dictionaries(args.root):
+        print(f"compiled {path}")
+
+
+if __name__ == "__main__":
+    main()
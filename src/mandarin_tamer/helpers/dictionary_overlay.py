@@ -0,0 +1,94 @@
+import sys
+from collections.abc import Iterable, Iterator, Mapping
+from heapq import merge
+
+from .trie import PhraseMatcher, create_trie, leftmost_longest
+
+
+class OverlayDict(Mapping):
+    """Read-only view of a base dictionary with `include` entries added or overriding and `exclude` keys removed.
+
+    Iterates and looks up exactly like the dictionary `DictionaryLoader.merge_dicts` would build, but without
+    copying the base, so customizing a large shared table costs time and memory in proportion to the customization.
+    """
+
+    def __init__(self, base: Mapping, include: dict | None = None, exclude: Iterable[str] | None = None):
+        self.base = base
+        self.exclude = frozenset(exclude or ())
+        self.include = {key: value for key, value in (include or {}).items() if key not in self.exclude}
+        self.shadowed = self.exclude | self.include.keys()
+        self._added = [key for key in self.include if key not in base]
+        self._length = len(base) - sum(key in base for key in self.exclude) + len(self._added)
+
+    def __getitem__(self, key):
+        if key in self.include:
+            return self.include[key]
+        if key in self.exclude:
+            raise KeyError(key)
+        return self.base[key]
+
+    def __contains__(self, key) -> bool:
+        return key in self.include or (key not in self.exclude and key in self.base)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from (key for key in self.base if key not in self.exclude)
+        yield from self._added
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __repr__(self) -> str:
+        return repr(self.copy())
+
+    def copy(self) -> dict:
+        return dict(self.items())
+
+
+class OverlayMatcher:
+    """Phrase matcher layering a small matcher for `include` keys over a shared, immutable base matcher.
+
+    Base matches whose key is included (and so overridden) or excluded are dropped, and the overlay's matches are
+    merged in, giving the same matches in the same order as a matcher compiled from the merged dictionary.
+    """
+
+    def __init__(
+        self,
+        base: PhraseMatcher,
+        include: dict | None = None,
+        exclude: Iterable[str] | None = None,
+        backend: str | None = None,
+    ):
+        overlay = OverlayDict({}, include, exclude)
+        self.base = base
+        self.shadowed = overlay.shadowed
+        self.overlay = create_trie(backend)
+        for key, value in overlay.include.items():
+            self.overlay.insert(key, value)
+        self.overlay.build()
+        self.max_key_length = max(base.max_key_length, self.overlay.max_key_length)
+
+    def _visible(self, text: str, matches: Iterable[tuple[int, int, str]]) -> Iterator[tuple[int, int, str]]:
+        return (match for match in matches if text[match[0] : match[1]] not in self.shadowed)
+
+    def find_all_matches(self, text: str) -> list[tuple[int, int, str]]:
+        """Returns list of (start_idx, end_idx, replacement_value), in the same order as `Trie`."""
+        return sorted([*self._visible(text, self.base.find_all_matches(text)), *self.overlay.find_all_matches(text)])
+
+    def iter_matches(self, text: str) -> Iterator[tuple[int, int, str]]:
+        """Yield every (start, end, value) match, ordered by end and then by start."""
+        return merge(
+            self._visible(text, self.base.iter_matches(text)),
+            self.overlay.iter_matches(text),
+            key=lambda match: (match[1], match[0]),
+        )
+
+    def iter_leftmost_longest(self, text: str) -> Iterator[tuple[int, int, str]]:
+        """Yield non-overlapping matches, preferring the leftmost start and then the longest key."""
+        return leftmost_longest(self.iter_matches(text), self.max_key_length, len(text))
+
+    def memory_usage(self) -> int:
+        """Bytes held by the overlay alone; the base matcher is shared."""
+        return self.overlay.memory_usage() + sys.getsizeof(self.shadowed)
+
+    def estimated_size(self) -> int:
+        return self.memory_usage()
@@ -0,0 +1,135 @@
+import json
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Protocol
+
+
+class DisambiguationBackend(Protocol):
+    """Source of the OpenAI-compatible clients improved mode sends its disambiguation prompts to.
+
+    Clients only need `chat.completions.create(**kwargs)` returning an object with
+    `choices[0].message.content`, which for the async client is a coroutine.
+    """
+
+    def client(self): ...
+
+    def async_client(self): ...
+
+
+class OpenAIBackend:
+    """The real OpenAI API."""
+
+    def __init__(self, openai_key: str | None = None):
+        self.openai_key = openai_key
+
+    def client(self):
+        # openai is slow to import, so only pay for it when a client is actually needed
+        from openai import OpenAI  # noqa: PLC0415
+
+        return OpenAI(api_key=self.openai_key) if self.openai_key else OpenAI()
+
+    def async_client(self):
+        from openai import AsyncOpenAI  # noqa: PLC0415 - slow to import, as above
+
+        return AsyncOpenAI(api_key=self.openai_key) if self.openai_key else AsyncOpenAI()
+
+
+class FakeRateLimitError(Exception):
+    """Raised by the fake backend's injected failures; retried like an HTTP 429 from the API."""
+
+    status_code = 429
+
+
+@dataclass
+class FakeBackendStats:
+    calls: int = 0
+    errors: int = 0
+    tokens_answered: int = 0
+    seconds_waited: float = 0.0
+
+
+class FakeBackend:
+    """Local stand-in for the OpenAI API, for benchmarking and load-testing improved mode offline.
+
+    Every request is answered with the first candidate for each ambiguous token, after sleeping `latency` seconds
+    plus up to `jitter` more. A fraction `error_rate` of requests fail with `FakeRateLimitError` instead. Sync and
+    async clients share one `stats` counter; `seed` makes the jitter and failures reproducible.
+    """
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0, seed: int | None = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.stats = FakeBackendStats()
+        self._random = random.Random(seed)  # noqa: S311
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict:
+        # Pool workers get their own copy (and counters); locks can't be pickled
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def client(self):
+        return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=self.create)))
+
+    def async_client(self):
+        return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=self.create_async)))
+
+    def reset_stats(self) -> None:
+        self.stats = FakeBackendStats()
+
+    def create(self, messages, **_kwargs):
+        delay, fail = self._next_call()
+        time.sleep(delay)
+        return self._respond(messages, fail)
+
+    async def create_async(self, messages, **_kwargs):
+        import asyncio  # noqa: PLC0415 - only loaded by async callers
+
+        delay, fail = self._next_call()
+        await asyncio.sleep(delay)
+        return self._respond(messages, fail)
+
+    def _next_call(self) -> tuple[float, bool]:
+        with self._lock:
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            fail = self._random.random() < self.error_rate
+            self.stats.calls += 1
+            self.stats.seconds_waited += delay
+            if fail:
+                self.stats.errors += 1
+            return delay, fail
+
+    def _respond(self, messages, fail: bool):
+        if fail:
+            msg = "Injected rate limit error"
+            raise FakeRateLimitError(msg)
+        content, answered = first_candidate_answer(messages[-1]["content"])
+        with self._lock:
+            self.stats.tokens_answered += answered
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def first_candidate_answer(user_content: str) -> tuple[str, int]:
+    """Answer a per-token or batched disambiguation prompt with the first candidate, and count the tokens answered."""
+    if user_content.startswith("{"):
+        request = json.loads(user_content)
+        replacements = [
+            {"index": entry["index"], "best_replacement_token": entry["options"][0]}
+            for entry in request["ambiguous_tokens"]
+        ]
+        return json.dumps({"replacements": replacements}, ensure_ascii=False), len(replacements)
+    # Per-token prompts end with "token: <char>; mapping_dictionary: {<char>: [<candidates>], ...}"
+    token = user_content.rsplit("; token: ", 1)[1][0]
+    match = re.search(rf"'{re.escape(token)}': \['([^']*)'", user_content)
+    answer = match.group(1) if match else token
+    return json.dumps({"best_replacement_token": answer}, ensure_ascii=False), 1
@@ -0,0 +1,322 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import unicodedata
+from collections import Counter
+from collections.abc import Callable
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+
+# Characters kept on each side of an ambiguous character when keying the cache on its local context
+CONTEXT_RADIUS = 8
+DEFAULT_TTL = 30 * 24 * 60 * 60
+DEFAULT_MAX_ENTRIES = 1_000_000
+DEFAULT_CACHE_PATH = Path.home() / ".cache" / "mandarin_tamer" / "disambiguation.sqlite3"
+# Lookups counted in memory before their hit and miss counters are written out, so reads stay read-only
+COUNTER_FLUSH_LOOKUPS = 256
+
+
+@dataclass
+class DisambiguationCacheStats:
+    """Lookup counters shared by every process using the same cache file."""
+
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+    entries: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def normalize_context(text: str) -> str:
+    """NFKC-normalize a context window and collapse runs of whitespace, so trivial variants share entries."""
+    return " ".join(unicodedata.normalize("NFKC", text).split())
+
+
+def position_context(sentence: str, position: int, radius: int = CONTEXT_RADIUS) -> str:
+    return normalize_context(sentence[max(position - radius, 0) : position + radius + 1])
+
+
+def token_context(sentence: str, token: str, radius: int = CONTEXT_RADIUS) -> str:
+    """Context windows around every occurrence of `token`, which a per-token request resolves with one answer."""
+    positions = [index for index, char in enumerate(sentence) if char == token]
+    return "\x00".join(position_context(sentence, position, radius) for position in positions)
+
+
+class DisambiguationCache:
+    """On-disk SQLite cache of improved-mode one-to-many answers, safe to share between processes.
+
+    Entries are keyed by the step, the ambiguous character, its normalized context, the candidates and the model.
+    Entries older than `ttl` seconds are ignored and purged, and once there are more than `max_entries` the oldest
+    are evicted. Each process (and thread) opens its own connection; the database runs in WAL mode so readers
+    don't block the writer.
+
+    Hit and miss counts are kept in memory and written out every `COUNTER_FLUSH_LOOKUPS` lookups, along with every
+    write, and by `stats` and `close`, so a process that exits without closing the cache can leave its last few
+    lookups uncounted.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike | None = None,
+        ttl: float | None = DEFAULT_TTL,
+        max_entries: int | None = DEFAULT_MAX_ENTRIES,
+    ):
+        self.path = Path(path or DEFAULT_CACHE_PATH)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._pending: Counter = Counter()
+        self._pending_lookups = 0
+        self._pending_lock = threading.Lock()
+        self._pending_pid = os.getpid()
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, DisambiguationCache) and self.__getstate__() == other.__getstate__()
+
+    def __hash__(self) -> int:
+        return hash(tuple(self.__getstate__().values()))
+
+    def __getstate__(self) -> dict:
+        # Connections can't cross process boundaries; workers open their own
+        return {"path": self.path, "ttl": self.ttl, "max_entries": self.max_entries}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(**state)
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is not None and self._local.pid == os.getpid():
+            return connection
+        # Imported here so sqlite3 is only loaded when a cache is actually used
+        import sqlite3  # noqa: PLC0415
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS answers (key TEXT PRIMARY KEY, answer TEXT NOT NULL, created REAL NOT NULL);
+            CREATE INDEX IF NOT EXISTS answers_created ON answers (created);
+            CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+            """
+        )
+        self._local.connection, self._local.pid = connection, os.getpid()
+        return connection
+
+    @staticmethod
+    def key(step: str, token: str, context: str, candidates, model: str) -> str:
+        payload = json.dumps([step, token, context, candidates, model], ensure_ascii=False, separators=(",", ":"))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: list[str]) -> dict[str, str]:
+        """Cached answers for whichever of `keys` are present and fresh."""
+        if not keys:
+            return {}
+        connection = self._connection()
+        oldest = time.time() - self.ttl if self.ttl is not None else float("-inf")
+        placeholders = ",".join("?" * len(keys))
+        rows = connection.execute(
+            f"SELECT key, answer FROM answers WHERE key IN ({placeholders}) AND created >= ?",  # noqa: S608
+            [*keys, oldest],
+        ).fetchall()
+        found = dict(rows)
+        with self._pending_lock:
+            self._reset_pending_after_fork()
+            self._pending.update(hits=len(found), misses=len(set(keys)) - len(found))
+            self._pending_lookups += 1
+            flush = self._pending_lookups >= COUNTER_FLUSH_LOOKUPS
+        if flush:
+            self.flush()
+        return found
+
+    def get(self, key: str) -> str | None:
+        return self.get_many([key]).get(key)
+
+    def set_many(self, answers: dict[str, str]) -> None:
+        if not answers:
+            return
+        connection = self._connection()
+        now = time.time()
+        with _transaction(connection):
+            connection.executemany(
+                "INSERT OR REPLACE INTO answers (key, answer, created) VALUES (?, ?, ?)",
+                [(key, answer, now) for key, answer in answers.items()],
+            )
+            evicted = self._evict(connection, now)
+            self._increment(connection, writes=len(answers), evictions=evicted, **self._take_pending())
+
+    def set(self, key: str, answer: str) -> None:
+        self.set_many({key: answer})
+
+    def _evict(self, connection, now: float) -> int:
+        evicted = 0
+        if self.ttl is not None:
+            evicted += connection.execute("DELETE FROM answers WHERE created < ?", (now - self.ttl,)).rowcount
+        if self.max_entries is not None:
+            excess = connection.execute("SELECT COUNT(*) FROM answers").fetchone()[0] - self.max_entries
+            if excess > 0:
+                evicted += connection.execute(
+                    "DELETE FROM answers WHERE key IN (SELECT key FROM answers ORDER BY created LIMIT ?)", (excess,)
+                ).rowcount
+        return evicted
+
+    def flush(self) -> None:
+        """Write out the hit and miss counts still held in memory."""
+        counts = self._take_pending()
+        if counts:
+            self._increment(self._connection(), **counts)
+
+    def _take_pending(self) -> dict[str, int]:
+        with self._pending_lock:
+            self._reset_pending_after_fork()
+            counts = dict(self._pending)
+            self._pending.clear()
+            self._pending_lookups = 0
+        return counts
+
+    def _reset_pending_after_fork(self) -> None:
+        # A forked worker starts with its parent's unwritten counts, which the parent still writes out itself
+        if self._pending_pid != os.getpid():
+            self._pending.clear()
+            self._pending_lookups = 0
+            self._pending_pid = os.getpid()
+
+    @staticmethod
+    def _increment(connection, **counts: int) -> None:
+        connection.executemany(
+            "INSERT INTO counters (name, value) VALUES (?, ?) ON CONFLICT (name) DO UPDATE SET value = value + ?",
+            [(name, count, count) for name, count in counts.items() if count],
+        )
+
+    def stats(self) -> DisambiguationCacheStats:
+        self.flush()
+        connection = self._connection()
+        counters = dict(connection.execute("SELECT name, value FROM counters").fetchall())
+        entries = connection.execute("SELECT COUNT(*) FROM answers").fetchone()[0]
+        return DisambiguationCacheStats(entries=entries, **counters)
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        self._take_pending()
+        connection = self._connection()
+        with _transaction(connection):
+            connection.execute("DELETE FROM answers")
+            connection.execute("DELETE FROM counters")
+
+    def close(self) -> None:
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            self.flush()
+            connection.close()
+            self._local.connection = None
+
+
+@contextmanager
+def _transaction(connection):
+    """BEGIN IMMEDIATE ... COMMIT on an autocommit connection, so concurrent writers queue on the lock."""
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        yield
+    except BaseException:
+        connection.execute("ROLLBACK")
+        raise
+    connection.execute("COMMIT")
+
+
+def as_disambiguation_cache(
+    cache: "DisambiguationCache | str | os.PathLike | None",
+) -> DisambiguationCache | None:
+    """Accept either a cache or the path of its database file."""
+    if cache is None or isinstance(cache, DisambiguationCache):
+        return cache
+    return DisambiguationCache(cache)
+
+
+def cached_token_func(cache: DisambiguationCache, openai_func: Callable, step: str, model: str) -> Callable:
+    """Wrap a per-token `openai_func(sentence, token, mapping_dict, client)` so it consults `cache` first."""
+
+    def lookup(sentence, token, mapping_dict, client):
+        key = cache.key(step, token, token_context(sentence, token), mapping_dict.get(token), model)
+        answer = cache.get(key)
+        if answer is None:
+            answer = openai_func(sentence, token, mapping_dict, client)
+            if answer:
+                cache.set(key, answer)
+        return answer
+
+    return lookup
+
+
+def cached_token_func_async(cache: DisambiguationCache, openai_func: Callable, step: str, model: str) -> Callable:
+    """`cached_token_func` for a coroutine `openai_func`.
+
+    The cache is read and written in a worker thread: a write waits up to 30 s for another process's lock, which
+    would otherwise stall every other request on the event loop.
+    """
+    import asyncio  # noqa: PLC0415 - only loaded by async callers
+
+    async def lookup(sentence, token, mapping_dict, client):
+        key = cache.key(step, token, token_context(sentence, token), mapping_dict.get(token), model)
+        answer = await asyncio.to_thread(cache.get, key)
+        if answer is None:
+            answer = await openai_func(sentence, token, mapping_dict, client)
+            if answer:
+                await asyncio.to_thread(cache.set, key, answer)
+        return answer
+
+    return lookup
+
+
+def cached_batch_func(cache: DisambiguationCache, batch_func: Callable, step: str, model: str) -> Callable:
+    """Wrap a batched `batch_func(sentence, ambiguous, client)` so only positions missing from `cache` are sent."""
+
+    def lookup(sentence, ambiguous, client):
+        keys, answers, missing = _split_cached(cache, sentence, ambiguous, step, model)
+        if missing:
+            fresh = batch_func(sentence, missing, client)
+            cache.set_many({keys[index]: token for index, token in fresh.items()})
+            answers |= fresh
+        return answers
+
+    return lookup
+
+
+def cached_batch_func_async(cache: DisambiguationCache, batch_func: Callable, step: str, model: str) -> Callable:
+    """`cached_batch_func` for a coroutine `batch_func`, with the cache read and written in a worker thread."""
+    import asyncio  # noqa: PLC0415 - only loaded by async callers
+
+    async def lookup(sentence, ambiguous, client):
+        keys, answers, missing = await asyncio.to_thread(_split_cached, cache, sentence, ambiguous, step, model)
+        if missing:
+            fresh = await batch_func(sentence, missing, client)
+            await asyncio.to_thread(cache.set_many, {keys[index]: token for index, token in fresh.items()})
+            answers |= fresh
+        return answers
+
+    return lookup
+
+
+def _split_cached(cache, sentence, ambiguous, step, model):
+    keys = {
+        index: cache.key(step, token, position_context(sentence, index), candidates, model)
+        for index, token, candidates in ambiguous
+    }
+    cached = cache.get_many(list(keys.values()))
+    # Per-token answers share these keys but were never checked against the candidates
+    answers = {
+        index: cached[keys[index]]
+        for index, _, candidates in ambiguous
+        if keys[index] in cached and cached[keys[index]] in candidates
+    }
+    missing = [entry for entry in ambiguous if entry[0] not in answers]
+    return keys, answers, missing
@@ -0,0 +1,117 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass
+class EngineCacheStats:
+    """Counters describing how well the engine cache is doing."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+    estimated_bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def fingerprint_payload(*payloads: Any) -> str:
+    """Content hash of include/exclude payloads, stable across calls with equal content."""
+    encoded = json.dumps(payloads, ensure_ascii=False, separators=(",", ":"), default=_encode_unknown)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _encode_unknown(value: Any) -> Any:
+    if isinstance(value, set | frozenset):
+        return sorted(value, key=str)
+    return str(value)
+
+
+class EngineCache:
+    """Process-wide LRU cache of compiled conversion engines.
+
+    Entries are evicted least-recently-used first once either `max_entries` or `max_bytes` is exceeded. The most
+    recently added engine is always kept, even if it alone is larger than `max_bytes`.
+    """
+
+    def __init__(self, max_entries: int | None = 16, max_bytes: int | None = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._engines: OrderedDict[tuple, Any] = OrderedDict()
+        self._sizes: dict[tuple, int] = {}
+        self._lock = threading.Lock()
+        self._stats = EngineCacheStats()
+
+    def get_or_create(self, key: tuple, factory: Callable[[], Any]) -> Any:
+        """Return the cached engine for `key`, building it with `factory` on a miss."""
+        with self._lock:
+            engine = self._engines.get(key)
+            if engine is not None:
+                self._engines.move_to_end(key)
+                self._stats.hits += 1
+                return engine
+            self._stats.misses += 1
+
+        # Build outside the lock so a cold tenant doesn't block hits for everybody else
+        engine = factory()
+
+        with self._lock:
+            existing = self._engines.get(key)
+            if existing is not None:
+                self._engines.move_to_end(key)
+                return existing
+            self._engines[key] = engine
+            self._sizes[key] = engine.estimated_size()
+            self._evict()
+        return engine
+
+    def configure(self, max_entries: int | None = None, max_bytes: int | None = None) -> None:
+        """Change the budgets and evict immediately if the cache is now over them."""
+        with self._lock:
+            self.max_entries = max_entries
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._engines.clear()
+            self._sizes.clear()
+
+    @property
+    def stats(self) -> EngineCacheStats:
+        with self._lock:
+            return EngineCacheStats(
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                evictions=self._stats.evictions,
+                entries=len(self._engines),
+                estimated_bytes=sum(self._sizes.values()),
+            )
+
+    def __len__(self) -> int:
+        return len(self._engines)
+
+    def __contains__(self, key: tuple) -> bool:
+        return key in self._engines
+
+    def _evict(self) -> None:
+        while len(self._engines) > 1 and self._over_budget():
+            key, _ = self._engines.popitem(last=False)
+            self._sizes.pop(key, None)
+            self._stats.evictions += 1
+
+    def _over_budget(self) -> bool:
+        if self.max_entries is not None and len(self._engines) > self.max_entries:
+            return True
+        return self.max_bytes is not None and sum(self._sizes.values()) > self.max_bytes
+
+
+engine_cache = EngineCache()
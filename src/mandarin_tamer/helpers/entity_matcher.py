@@ -0,0 +1,92 @@
+from collections.abc import Iterable, Iterator
+
+from .protected_spans import ProtectedSpans
+from .replacement_by_dictionary import ReplacementUtils
+from .trie import PhraseMatcher, create_trie
+
+
+# Unicode private-use code points, which no conversion dictionary maps
+PRIVATE_USE_RANGES = (range(0xE000, 0xF900), range(0xF0000, 0xFFFFE), range(0x100000, 0x10FFFE))
+
+
+class EntityMatcher:
+    """A named-entity list compiled once into an Aho-Corasick matcher that finds every entity in one pass.
+
+    Pass it wherever a `ner_list` is accepted to reuse the compiled matcher across calls, engines and worker
+    processes; a plain list is searched entity by entity with `str.find`, which gets slow for glossaries with
+    thousands of names. Spans are the same as `ReplacementUtils.get_ner_indexes` finds.
+
+    With `masking=True` each protected span is swapped for a private-use placeholder character before conversion
+    and put back afterwards, so the steps have no indexes to track. Phrases that overlap an entity can then no
+    longer match at all, so the output can differ slightly from index protection around entity boundaries.
+    """
+
+    def __init__(self, entities: Iterable[str], backend: str | None = None, masking: bool = False):
+        self.entities = tuple(dict.fromkeys(entity for entity in entities if entity))
+        self.backend = backend
+        self.masking = masking
+        self.max_length = max(map(len, self.entities), default=0)
+        self._trie: PhraseMatcher = create_trie(backend)
+        for index, entity in enumerate(self.entities):
+            self._trie.insert(entity, index)
+        self._trie.build()
+
+    def __reduce__(self):
+        # Rebuilding from the entity list is much cheaper than pickling the trie nodes
+        return type(self), (self.entities, self.backend, self.masking)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.entities)
+
+    def __len__(self) -> int:
+        return len(self.entities)
+
+    def find_spans(self, text: str) -> list[tuple[int, int]]:
+        """`(start, end)` of every entity occurrence, skipping occurrences that overlap one of the same entity."""
+        last_end: dict[int, int] = {}
+        spans = []
+        for start, end, index in self._trie.iter_matches(text):
+            if start >= last_end.get(index, 0):
+                spans.append((start, end))
+                last_end[index] = end
+        return spans
+
+    def protected_spans(self, text: str) -> ProtectedSpans:
+        return ProtectedSpans(self.find_spans(text))
+
+    def mask(self, text: str) -> tuple[str, dict[int, str]]:
+        """Replace each protected span with a placeholder character.
+
+        Returns the masked text and a `str.translate` table that puts the spans back.
+        """
+        spans = self.protected_spans(text)
+        if not spans:
+            return text, {}
+        free_codes = self._free_codes(text)
+        placeholders: dict[str, str] = {}
+        parts = []
+        position = 0
+        for start, end in spans:
+            original = text[start:end]
+            if original not in placeholders:
+                placeholders[original] = chr(next(free_codes))
+            parts.append(text[position:start])
+            parts.append(placeholders[original])
+            position = end
+        parts.append(text[position:])
+        return "".join(parts), {ord(placeholder): original for original, placeholder in placeholders.items()}
+
+    @staticmethod
+    def _free_codes(text: str) -> Iterator[int]:
+        used = set(map(ord, set(text)))
+        for code_points in PRIVATE_USE_RANGES:
+            yield from (code for code in code_points if code not in used)
+        msg = "Text has more distinct entities than there are private-use placeholders"
+        raise ValueError(msg)
+
+
+def entity_spans(text: str, ner_list: list | EntityMatcher | None) -> ProtectedSpans:
+    """Protected spans of the named entities in `text`, from a compiled `EntityMatcher` or a plain list."""
+    if isinstance(ner_list, EntityMatcher):
+        return ner_list.protected_spans(text)
+    return ProtectedSpans(ReplacementUtils.get_ner_indexes(text, ner_list) if ner_list else ())
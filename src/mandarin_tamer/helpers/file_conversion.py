@@ -1,4 +1,5 @@
 import json
+from collections.abc import Callable, Iterator
 from pathlib import Path
 
 
@@ -22,9 +23,13 @@ class FileConversion:
 
     @staticmethod
     def tsv_to_dict(file_path, split_func) -> dict:
-        with Path(file_path).open() as file:
-            return {
-                line.split("\t")[0]: split_func(line.split("\t")[1].strip())
-                for line in file
-                if "\t" in line and len(line.split("\t")) > 1
-            }
+        return dict(FileConversion.iter_tsv(file_path, split_func))
+
+    @staticmethod
+    def iter_tsv(file_path, split_func: Callable = lambda x: x) -> Iterator[tuple]:
+        """Yield `(key, split_func(value))` for each line with a tab, reading the file one line at a time."""
+        with Path(file_path).open(encoding="utf-8") as file:
+            for line in file:
+                fields = line.split("\t")
+                if len(fields) > 1:
+                    yield fields[0], split_func(fields[1].strip())
@@ -0,0 +1,133 @@
+from collections.abc import Callable
+from dataclasses import dataclass
+from time import perf_counter
+
+from .conversion_operations import ConversionOperation
+from .protected_spans import ProtectedSpans
+
+
+STAGES = ("load", "phrase", "one2many", "char", "step")
+
+
+@dataclass(frozen=True)
+class ConversionEvent:
+    """One timed piece of a conversion, as passed to an observer.
+
+    `stage` is "load" (loading a config's dictionaries), "phrase", "one2many" or "char" (the sub-stages of a step)
+    or "step" (a whole step, emitted after its sub-stages). `matches` counts phrase replacements, ambiguous characters
+    sent to disambiguation or characters the char stage changed, and is None where it doesn't apply.
+    `protected_spans` is the number of protected ranges after the stage.
+    """
+
+    stage: str
+    step: str
+    seconds: float
+    input_length: int
+    output_length: int
+    matches: int | None = None
+    protected_spans: int = 0
+
+
+Observer = Callable[[ConversionEvent], None]
+
+
+@dataclass
+class StageTotals:
+    """Sums over every event of one step and stage."""
+
+    calls: int = 0
+    seconds: float = 0.0
+    input_chars: int = 0
+    output_chars: int = 0
+    matches: int = 0
+    protected_spans: int = 0
+
+    @property
+    def chars_per_second(self) -> float:
+        return self.input_chars / self.seconds if self.seconds else 0.0
+
+
+class StepTimings:
+    """Observer adding up conversion events per step and stage across any number of conversions.
+
+    Pass one instance as the `observer` of many conversions, then read `totals` or print `report()`.
+    """
+
+    def __init__(self):
+        self.totals: dict[tuple[str, str], StageTotals] = {}
+
+    def __call__(self, event: ConversionEvent) -> None:
+        totals = self.totals.get((event.step, event.stage))
+        if totals is None:
+            totals = self.totals[event.step, event.stage] = StageTotals()
+        totals.calls += 1
+        totals.seconds += event.seconds
+        totals.input_chars += event.input_length
+        totals.output_chars += event.output_length
+        totals.matches += event.matches or 0
+        totals.protected_spans += event.protected_spans
+
+    def by_stage(self) -> dict[str, StageTotals]:
+        """Totals per stage, summed over every step."""
+        result: dict[str, StageTotals] = {}
+        for (_, stage), totals in self.totals.items():
+            combined = result.setdefault(stage, StageTotals())
+            combined.calls += totals.calls
+            combined.seconds += totals.seconds
+            combined.input_chars += totals.input_chars
+            combined.output_chars += totals.output_chars
+            combined.matches += totals.matches
+            combined.protected_spans += totals.protected_spans
+        return result
+
+    def reset(self) -> None:
+        self.totals.clear()
+
+    def report(self) -> str:
+        """Table of the totals, one line per step and stage, slowest steps first."""
+        step_seconds: dict[str, float] = {}
+        for (step, stage), totals in self.totals.items():
+            if stage == "step":
+                step_seconds[step] = totals.seconds
+        order = {stage: index for index, stage in enumerate(STAGES)}
+        keys = sorted(self.totals, key=lambda key: (-step_seconds.get(key[0], 0.0), key[0], order.get(key[1], 0)))
+        lines = [f"{'step':<22} {'stage':<9} {'calls':>7} {'seconds':>10} {'chars':>10} {'matches':>8}"]
+        for step, stage in keys:
+            totals = self.totals[step, stage]
+            lines.append(
+                f"{step:<22} {stage:<9} {totals.calls:7} {totals.seconds:10.4f} {totals.input_chars:10} "
+                f"{totals.matches:8}"
+            )
+        return "\n".join(lines)
+
+
+def emit(
+    observer: Observer,
+    stage: str,
+    step: str,
+    start: float,
+    before: str,
+    after: str,
+    protected: ProtectedSpans | None = None,
+    matches: int | None = None,
+) -> None:
+    """Send the event for a stage that started at `start` (a `perf_counter` reading) to `observer`."""
+    seconds = perf_counter() - start
+    observer(ConversionEvent(stage, step, seconds, len(before), len(after), matches, len(protected or ())))
+
+
+def emit_operation(
+    observer: Observer,
+    stage: str,
+    step: str,
+    start: float,
+    operation: ConversionOperation,
+    after: str,
+    protected: ProtectedSpans | None = None,
+) -> None:
+    """`emit` for a stage run by `operation`, counting the characters it changed when it didn't count matches."""
+    before = operation.sentence
+    matches = operation.matches
+    if matches is None and len(before) == len(after):
+        matches = sum(a != b for a, b in zip(before, after, strict=True))
+    emit(observer, stage, step, start, before, after, protected, matches)
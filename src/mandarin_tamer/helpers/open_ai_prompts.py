@@ -1,20 +1,42 @@
 import json
 
-from openai import OpenAI
+from .disambiguation_backends import DisambiguationBackend, OpenAIBackend
 
+OPENAI_MODEL = "gpt-4o-mini"
 
-def initialize_openai_client(openai_key: str | None, improved_one_to_many: bool):
-    """Initialize OpenAI client based on the presence of openai_key and improved_one_to_many flag."""
-    if openai_key:
-        return OpenAI(api_key=openai_key)
-    if improved_one_to_many:
-        return OpenAI()
-    return None
+# What each conversion step asks the model to do when choosing between one-to-many candidates
+S2T_INTENT = "replacing Simplified Mandarin with Traditional Taiwanese Mandarin"
+T2S_INTENT = "replacing Traditional Mandarin with Simplified Mandarin"
+MODERNIZE_SIMP_INTENT = "replacing outdated/archaic Simplified Mandarin with Modern Simplified Mandarin"
+NORMALIZE_SIMP_INTENT = "replacing uncommon words with more common equivalents in Simplified Mandarin"
+MODERNIZE_TRAD_INTENT = "replacing outdated/archaic Traditional Mandarin with Modern Traditional Mandarin"
+NORMALIZE_TRAD_INTENT = "replacing uncommon words with more common equivalents in Traditional Mandarin"
+TAIWANIZE_INTENT = "replacing Traditional Mandarin with Traditional Taiwanese Mandarin"
+DETAIWANIZE_INTENT = "replacing Traditional Taiwanese Mandarin with Traditional Hong Kong Mandarin"
+
+
+def initialize_openai_client(
+    openai_key: str | None, improved_one_to_many: bool, backend: DisambiguationBackend | None = None
+):
+    """Initialize OpenAI client based on the presence of openai_key and improved_one_to_many flag.
+
+    A `backend` (e.g. `FakeBackend` for offline benchmarks) supplies the client instead of the OpenAI API.
+    """
+    if backend is not None:
+        return backend.client()
+    if not openai_key and not improved_one_to_many:
+        return None
+    return OpenAIBackend(openai_key).client()
+
+
+def initialize_async_openai_client(openai_key: str | None, backend: DisambiguationBackend | None = None):
+    """Initialize the async OpenAI client used by the concurrent disambiguation path."""
+    return (backend or OpenAIBackend(openai_key)).async_client()
 
 
 def openai_s2t_one2many_mappings(sentence, token, mapping_dict, client):
     return _one2many_mapping(
-        "replacing Simplified Mandarin with Traditional Taiwanese Mandarin",
+        S2T_INTENT,
         "sentence",
         sentence,
         token,
@@ -25,7 +47,7 @@ def openai_s2t_one2many_mappings(sentence, token, mapping_dict, client):
 
 def openai_t2s_one2many_mappings(tokenized_sentence, token, mapping_dict, client):
     return _one2many_mapping(
-        "replacing Traditional Mandarin with Simplified Mandarin",
+        T2S_INTENT,
         "tokenized_sentence",
         tokenized_sentence,
         token,
@@ -36,7 +58,7 @@ def openai_t2s_one2many_mappings(tokenized_sentence, token, mapping_dict, client
 
 def openai_modernize_simp_one2many_mappings(tokenized_sentence, token, mapping_dict, client):
     return _one2many_mapping(
-        "replacing outdated/archaic Simplified Mandarin with Modern Simplified Mandarin",
+        MODERNIZE_SIMP_INTENT,
         "tokenized_sentence",
         tokenized_sentence,
         token,
@@ -47,7 +69,7 @@ def openai_modernize_simp_one2many_mappings(tokenized_sentence, token, mapping_d
 
 def openai_normalize_simp_one2many_mappings(tokenized_sentence, token, mapping_dict, client):
     return _one2many_mapping(
-        "replacing uncommon words with more common equivalents in Simplified Mandarin",
+        NORMALIZE_SIMP_INTENT,
         "tokenized_sentence",
         tokenized_sentence,
         token,
@@ -58,7 +80,7 @@ def openai_normalize_simp_one2many_mappings(tokenized_sentence, token, mapping_d
 
 def openai_modernize_trad_one2many_mappings(tokenized_sentence, token, mapping_dict, client):
     return _one2many_mapping(
-        "replacing outdated/archaic Traditional Mandarin with Modern Traditional Mandarin",
+        MODERNIZE_TRAD_INTENT,
         "tokenized_sentence",
         tokenized_sentence,
         token,
@@ -69,7 +91,7 @@ def openai_modernize_trad_one2many_mappings(tokenized_sentence, token, mapping_d
 
 def openai_normalize_trad_one2many_mappings(tokenized_sentence, token, mapping_dict, client):
     return _one2many_mapping(
-        "replacing uncommon words with more common equivalents in Traditional Mandarin",
+        NORMALIZE_TRAD_INTENT,
         "tokenized_sentence",
         tokenized_sentence,
         token,
@@ -80,7 +102,7 @@ def openai_normalize_trad_one2many_mappings(tokenized_sentence, token, mapping_d
 
 def openai_taiwanize_one2many_mappings(tokenized_sentence, token, mapping_dict, client):
     return _one2many_mapping(
-        "replacing Traditional Mandarin with Traditional Taiwanese Mandarin",
+        TAIWANIZE_INTENT,
         "tokenized_sentence",
         tokenized_sentence,
         token,
@@ -91,7 +113,7 @@ def openai_taiwanize_one2many_mappings(tokenized_sentence, token, mapping_dict,
 
 def openai_detaiwanize_one2many_mappings(tokenized_sentence, token, mapping_dict, client):
     return _one2many_mapping(
-        "replacing Traditional Taiwanese Mandarin with Traditional Hong Kong Mandarin",
+        DETAIWANIZE_INTENT,
         "tokenized_sentence",
         tokenized_sentence,
         token,
@@ -100,24 +122,125 @@ def openai_detaiwanize_one2many_mappings(tokenized_sentence, token, mapping_dict
     )
 
 
+ONE2MANY_PROMPT_INTENTS = {
+    openai_s2t_one2many_mappings: S2T_INTENT,
+    openai_t2s_one2many_mappings: T2S_INTENT,
+    openai_modernize_simp_one2many_mappings: MODERNIZE_SIMP_INTENT,
+    openai_normalize_simp_one2many_mappings: NORMALIZE_SIMP_INTENT,
+    openai_modernize_trad_one2many_mappings: MODERNIZE_TRAD_INTENT,
+    openai_normalize_trad_one2many_mappings: NORMALIZE_TRAD_INTENT,
+    openai_taiwanize_one2many_mappings: TAIWANIZE_INTENT,
+    openai_detaiwanize_one2many_mappings: DETAIWANIZE_INTENT,
+}
+
+
 def _one2many_mapping(prompt_intent, sentence_label, sentence, token, mapping_dict, client):
+    system_context, user_context = _one2many_prompt(prompt_intent, sentence_label, sentence, token, mapping_dict)
+    response = get_openai_response(
+        system_content=system_context,
+        user_content=user_context,
+        json_mode=True,
+        client=client,
+    )
+    return _best_replacement_token(response)
+
+
+async def openai_one2many_mapping_async(openai_func, sentence, token, mapping_dict, client):
+    """Async counterpart of a step's per-token `openai_func`, sending the same prompt through an async client."""
+    # Only the s2t prompt labels its input as a plain sentence
+    sentence_label = "sentence" if openai_func is openai_s2t_one2many_mappings else "tokenized_sentence"
+    system_context, user_context = _one2many_prompt(
+        ONE2MANY_PROMPT_INTENTS[openai_func], sentence_label, sentence, token, mapping_dict
+    )
+    response = await get_openai_response_async(
+        system_content=system_context,
+        user_content=user_context,
+        json_mode=True,
+        client=client,
+    )
+    return _best_replacement_token(response)
+
+
+def _one2many_prompt(prompt_intent, sentence_label, sentence, token, mapping_dict) -> tuple[str, str]:
     system_context = f"""
     Return as json the best_replacement_token for the token in the sentence based on the options in the mapping_dictionary for {prompt_intent}.
     """
     user_context = f"{sentence_label}: {sentence}; token: {token}; mapping_dictionary: {mapping_dict}"
-    response = (
-        get_openai_response(
-            system_content=system_context,
-            user_content=user_context,
-            json_mode=True,
-            client=client,
-        )
-        or '{"best_replacement_token": ""}'
-    )
-    json_response = json.loads(response)
+    return system_context, user_context
+
+
+def _best_replacement_token(response: str | None) -> str:
+    json_response = json.loads(response or '{"best_replacement_token": ""}')
     return json_response["best_replacement_token"]
 
 
+def openai_one2many_batch_mappings(
+    prompt_intent: str, sentence: str, ambiguous: list[tuple[int, str, list[str]]], client
+) -> dict[int, str]:
+    """Resolve every ambiguous position of a sentence with a single request.
+
+    `ambiguous` holds `(index, token, candidates)` for each position. Returns the valid answers by index; positions
+    missing from the response or answered with something that isn't one of their candidates are left out.
+    """
+    system_context, user_context = _batch_prompt(prompt_intent, sentence, ambiguous)
+    response = get_openai_response(
+        system_content=system_context,
+        user_content=user_context,
+        json_mode=True,
+        client=client,
+    )
+    return parse_batch_response(response, ambiguous)
+
+
+async def openai_one2many_batch_mappings_async(
+    prompt_intent: str, sentence: str, ambiguous: list[tuple[int, str, list[str]]], client
+) -> dict[int, str]:
+    """Async counterpart of `openai_one2many_batch_mappings`."""
+    system_context, user_context = _batch_prompt(prompt_intent, sentence, ambiguous)
+    response = await get_openai_response_async(
+        system_content=system_context,
+        user_content=user_context,
+        json_mode=True,
+        client=client,
+    )
+    return parse_batch_response(response, ambiguous)
+
+
+def _batch_prompt(prompt_intent: str, sentence: str, ambiguous: list[tuple[int, str, list[str]]]) -> tuple[str, str]:
+    system_context = f"""
+    For {prompt_intent}, choose the best_replacement_token for every entry in ambiguous_tokens, based on the sentence
+    and the entry's options. Return json of the form
+    {{"replacements": [{{"index": <index>, "best_replacement_token": <one of the options>}}, ...]}}.
+    """
+    user_context = json.dumps(
+        {
+            "sentence": sentence,
+            "ambiguous_tokens": [
+                {"index": index, "token": token, "options": candidates} for index, token, candidates in ambiguous
+            ],
+        },
+        ensure_ascii=False,
+    )
+    return system_context, user_context
+
+
+def parse_batch_response(response: str | None, ambiguous: list[tuple[int, str, list[str]]]) -> dict[int, str]:
+    """Pull the valid `index -> token` answers out of a batched response, ignoring anything malformed."""
+    candidates_by_index = {index: candidates for index, _, candidates in ambiguous}
+    try:
+        replacements = json.loads(response or "{}").get("replacements", [])
+    except (ValueError, AttributeError):
+        return {}
+    answers = {}
+    for replacement in replacements if isinstance(replacements, list) else []:
+        if not isinstance(replacement, dict):
+            continue
+        index, token = replacement.get("index"), replacement.get("best_replacement_token")
+        if isinstance(index, int) and token in candidates_by_index.get(index, ()):
+            answers[index] = token
+    return answers
+
+
 def get_openai_response(
     system_content=None,
     user_content=None,
@@ -127,6 +250,29 @@ def get_openai_response(
     temperature=0,
     client=None,
 ):
+    completion = client.chat.completions.create(
+        **_completion_request(system_content, user_content, assistant_content, json_mode, max_tokens, temperature)
+    )
+    return completion.choices[0].message.content
+
+
+async def get_openai_response_async(
+    system_content=None,
+    user_content=None,
+    assistant_content=None,
+    json_mode=False,
+    max_tokens=3500,
+    temperature=0,
+    client=None,
+):
+    """Same request as `get_openai_response`, awaited on an async client."""
+    completion = await client.chat.completions.create(
+        **_completion_request(system_content, user_content, assistant_content, json_mode, max_tokens, temperature)
+    )
+    return completion.choices[0].message.content
+
+
+def _completion_request(system_content, user_content, assistant_content, json_mode, max_tokens, temperature) -> dict:
     messages = []
     if system_content:
         messages.append({"role": "system", "content": system_content})
@@ -134,12 +280,10 @@ def get_openai_response(
         messages.append({"role": "user", "content": user_content})
     if assistant_content:
         messages.append({"role": "assistant", "content": assistant_content})
-
-    completion = client.chat.completions.create(
-        model="gpt-4o-mini",
-        response_format={"type": "json_object"} if json_mode else {"type": "text"},
-        messages=messages,
-        max_tokens=max_tokens,
-        temperature=temperature,
-    )
-    return completion.choices[0].message.content
+    return {
+        "model": OPENAI_MODEL,
+        "response_format": {"type": "json_object"} if json_mode else {"type": "text"},
+        "messages": messages,
+        "max_tokens": max_tokens,
+        "temperature": temperature,
+    }
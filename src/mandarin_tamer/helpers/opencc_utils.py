@@ -0,0 +1,63 @@
+from functools import cache
+
+
+# Longest key in OpenCC's phrase dictionaries, so a window this wide on each side holds every phrase over a position
+OPENCC_CONTEXT = 16
+# Longest stretch of text handed to OpenCC in one call when windows of neighbouring positions are merged
+MAX_OPENCC_SPAN = 256
+
+
+@cache
+def get_opencc(opencc_config: str):
+    """Return the process-wide OpenCC converter for a config, building it on first use."""
+    # opencc is only imported when a one-to-many fallback actually runs
+    from opencc import OpenCC  # noqa: PLC0415
+
+    return OpenCC(opencc_config)
+
+
+def find_ambiguous_positions(sentence: str, mapping_dict: dict) -> list[int]:
+    """Indexes of every character in `sentence` that has one-to-many mappings, found in a single pass."""
+    return [index for index, char in enumerate(sentence) if char in mapping_dict]
+
+
+def convert_positions(
+    sentence: str, positions: list[int], opencc_config: str, context: int = OPENCC_CONTEXT
+) -> dict[int, str]:
+    """Convert only the characters at `positions`, running OpenCC on small windows of context around them.
+
+    Positions whose windows overlap share one OpenCC call, up to `MAX_OPENCC_SPAN` characters. Returns a mapping of
+    position to converted character.
+    """
+    cc = get_opencc(opencc_config)
+    spans: list[list] = []
+    for position in positions:
+        start, end = max(position - context, 0), min(position + context + 1, len(sentence))
+        if spans and start <= spans[-1][1] and end - spans[-1][0] <= MAX_OPENCC_SPAN:
+            spans[-1][1] = end
+            spans[-1][2].append(position)
+        else:
+            spans.append([start, end, [position]])
+
+    converted = {}
+    for start, end, span_positions in spans:
+        window = sentence[start:end]
+        window_converted = cc.convert(window)
+        for position in span_positions:
+            if len(window_converted) == len(window):
+                converted[position] = window_converted[position - start]
+            else:
+                converted[position] = _convert_misaligned(cc, sentence, position, context)
+    return converted
+
+
+def _convert_misaligned(cc, sentence: str, position: int, context: int) -> str:
+    # OpenCC swapped a phrase for one of a different length, so shrink the window until positions line up again
+    while context:
+        context //= 2
+        start = max(position - context, 0)
+        window = sentence[start : position + context + 1]
+        window_converted = cc.convert(window)
+        if len(window_converted) == len(window):
+            return window_converted[position - start]
+    return sentence[position]
@@ -0,0 +1,89 @@
+from bisect import bisect_right
+from collections.abc import Iterable, Iterator
+
+
+class ProtectedSpans:
+    """Sorted, merged `(start, end)` ranges that later conversion stages must leave unchanged.
+
+    Overlapping and touching ranges are merged, and empty ones dropped, as they are added, so membership is a
+    bisect over the starts and restoring the ranges is one pass over the text. Every use of protected indexes only
+    asks whether a position is covered, so the merged ranges behave exactly like the original list of tuples.
+    Instances are never changed in place; `union` returns a new one.
+    """
+
+    __slots__ = ("ends", "starts")
+
+    def __init__(self, spans: Iterable[tuple[int, int]] = ()):
+        self.starts: list[int] = []
+        self.ends: list[int] = []
+        for start, end in sorted(span for span in spans if span[0] < span[1]):
+            if self.ends and start <= self.ends[-1]:
+                self.ends[-1] = max(self.ends[-1], end)
+            else:
+                self.starts.append(start)
+                self.ends.append(end)
+
+    @classmethod
+    def of(cls, spans: "ProtectedSpans | Iterable[tuple[int, int]] | None") -> "ProtectedSpans":
+        """Return `spans` unchanged when it already is a `ProtectedSpans`, otherwise build one from the tuples."""
+        return spans if isinstance(spans, ProtectedSpans) else cls(spans or ())
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        return zip(self.starts, self.ends, strict=True)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ProtectedSpans):
+            return NotImplemented
+        return self.starts == other.starts and self.ends == other.ends
+
+    def __hash__(self) -> int:
+        return hash((tuple(self.starts), tuple(self.ends)))
+
+    def __repr__(self) -> str:
+        return f"ProtectedSpans({list(self)!r})"
+
+    def contains(self, position: int) -> bool:
+        """Whether `position` lies inside one of the ranges."""
+        index = bisect_right(self.starts, position) - 1
+        return index >= 0 and position < self.ends[index]
+
+    def union(self, spans: "ProtectedSpans | Iterable[tuple[int, int]]") -> "ProtectedSpans":
+        """Ranges covered by either this or `spans`, merging the two sorted lists in one pass."""
+        other = ProtectedSpans.of(spans)
+        if not other:
+            return self
+        if not self:
+            return other
+        merged = ProtectedSpans()
+        starts, ends = merged.starts, merged.ends
+        mine, theirs = iter(self), iter(other)
+        next_mine, next_theirs = next(mine, None), next(theirs, None)
+        while next_mine or next_theirs:
+            if next_theirs is None or (next_mine is not None and next_mine <= next_theirs):
+                start, end = next_mine
+                next_mine = next(mine, None)
+            else:
+                start, end = next_theirs
+                next_theirs = next(theirs, None)
+            if ends and start <= ends[-1]:
+                ends[-1] = max(ends[-1], end)
+            else:
+                starts.append(start)
+                ends.append(end)
+        return merged
+
+    def restore(self, original: str, converted: str) -> str:
+        """Copy the protected ranges of `original` back over `converted` in a single pass."""
+        if not self:
+            return converted
+        parts = []
+        position = 0
+        for start, end in self:
+            parts.append(converted[position:start])
+            parts.append(original[start:end])
+            position = end
+        parts.append(converted[position:])
+        return "".join(parts)
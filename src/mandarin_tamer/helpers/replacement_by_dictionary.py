@@ -1,7 +1,8 @@
 import re
 
+from .protected_spans import ProtectedSpans
 from .punctuation_utils import punctuation_pattern
-from .trie import Trie
+from .trie import PhraseMatcher, create_trie
 
 
 class ReplacementUtils:
@@ -21,10 +22,10 @@ class ReplacementUtils:
         )
 
     @staticmethod
-    def get_phrases_to_skip(sentence: str, dictionary: dict) -> list[str]:
+    def get_phrases_to_skip(sentence: str, dictionary: dict, leftmost_longest: bool = False) -> list[str]:
         # Build trie once and cache it
         trie = ReplacementUtils.build_trie_from_dict(dictionary)
-        matches = trie.find_all_matches(sentence)
+        matches = trie.iter_leftmost_longest(sentence) if leftmost_longest else trie.iter_matches(sentence)
         return list({match[2] for match in matches})  # Using set for unique values
 
     @staticmethod
@@ -103,8 +104,19 @@ class ReplacementUtils:
         return sentence.translate(trans_table)
 
     @staticmethod
-    def word_replace_over_string(sentence: str, dictionary: dict) -> str:
+    def word_replace_over_string(sentence: str, dictionary: dict, leftmost_longest: bool = False) -> str:
         trie = ReplacementUtils.build_trie_from_dict(dictionary)
+        if leftmost_longest:
+            # Matches don't overlap, so the result can be stitched together in a single pass
+            parts = []
+            position = 0
+            for start, end, replacement in trie.iter_leftmost_longest(sentence):
+                parts.append(sentence[position:start])
+                parts.append(replacement)
+                position = end
+            parts.append(sentence[position:])
+            return "".join(parts)
+
         matches = sorted(trie.find_all_matches(sentence), reverse=True)
 
         # Apply replacements from end to start to avoid index issues
@@ -115,14 +127,15 @@ class ReplacementUtils:
         return "".join(result)
 
     @staticmethod
-    def revert_protected_indexes(sentence: str, new_sentence: str, indexes_to_protect: list[tuple[int, int]]) -> str:
-        for start, end in indexes_to_protect:
-            new_sentence = new_sentence[:start] + sentence[start:end] + new_sentence[end:]
-        return new_sentence
+    def revert_protected_indexes(
+        sentence: str, new_sentence: str, indexes_to_protect: ProtectedSpans | list[tuple[int, int]]
+    ) -> str:
+        return ProtectedSpans.of(indexes_to_protect).restore(sentence, new_sentence)
 
     @staticmethod
-    def build_trie_from_dict(dictionary: dict) -> Trie:
-        trie = Trie()
+    def build_trie_from_dict(dictionary: dict, backend: str | None = None) -> PhraseMatcher:
+        trie = create_trie(backend)
         for key, value in dictionary.items():
             trie.insert(key, value)
+        trie.build()
         return trie
@@ -0,0 +1,105 @@
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+
+from .entity_matcher import EntityMatcher
+
+
+DEFAULT_MAX_CHARACTERS = 1_000_000
+DEFAULT_MAX_TEXT_LENGTH = 200
+
+
+@dataclass
+class ResultCacheStats:
+    """Counters describing how well a result cache is doing."""
+
+    hits: int = 0
+    misses: int = 0
+    # Lookups for texts above `max_text_length`, converted without touching the cache
+    skipped: int = 0
+    evictions: int = 0
+    entries: int = 0
+    characters: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def ner_key(ner_list: list | EntityMatcher | None) -> Hashable:
+    """Hashable stand-in for a `ner_list`, equal for lists or matchers protecting the same entities the same way."""
+    if isinstance(ner_list, EntityMatcher):
+        return ner_list.entities, ner_list.masking
+    # A list protects the same spans as an unmasked matcher of the same entities
+    return (tuple(ner_list), False) if ner_list else None
+
+
+class ResultCache:
+    """In-process LRU cache of conversion results, for traffic that converts the same short texts again and again.
+
+    Entries are keyed by the text and a key for the conversion options (see `engine_key` and `ner_key`) and evicted
+    least-recently-used first once the cached texts and results together exceed `max_characters`. Texts longer than
+    `max_text_length` are rarely repeated and would crowd out many short ones, so they are converted without being
+    cached. Safe to share between threads.
+    """
+
+    def __init__(self, max_characters: int = DEFAULT_MAX_CHARACTERS, max_text_length: int = DEFAULT_MAX_TEXT_LENGTH):
+        self.max_characters = max_characters
+        self.max_text_length = max_text_length
+        self._results: OrderedDict[tuple[str, Hashable], str] = OrderedDict()
+        self._characters = 0
+        self._lock = threading.Lock()
+        self._stats = ResultCacheStats()
+
+    def get_or_convert(self, text: str, key: Hashable, convert: Callable[[str], str]) -> str:
+        """Return the cached result of `convert(text)` for the options `key`, converting and caching it on a miss."""
+        if len(text) > self.max_text_length:
+            with self._lock:
+                self._stats.skipped += 1
+            return convert(text)
+        entry_key = (text, key)
+        with self._lock:
+            result = self._results.get(entry_key)
+            if result is not None:
+                self._results.move_to_end(entry_key)
+                self._stats.hits += 1
+                return result
+            self._stats.misses += 1
+
+        # Convert outside the lock so a miss doesn't hold up hits in other threads
+        result = convert(text)
+
+        with self._lock:
+            if entry_key not in self._results:
+                self._results[entry_key] = result
+                self._characters += len(text) + len(result)
+                self._evict()
+        return result
+
+    def clear(self) -> None:
+        with self._lock:
+            self._results.clear()
+            self._characters = 0
+
+    @property
+    def stats(self) -> ResultCacheStats:
+        with self._lock:
+            return ResultCacheStats(
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                skipped=self._stats.skipped,
+                evictions=self._stats.evictions,
+                entries=len(self._results),
+                characters=self._characters,
+            )
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def _evict(self) -> None:
+        while self._results and self._characters > self.max_characters:
+            (text, _), result = self._results.popitem(last=False)
+            self._characters -= len(text) + len(result)
+            self._stats.evictions += 1
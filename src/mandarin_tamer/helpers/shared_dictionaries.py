@@ -0,0 +1,59 @@
+import atexit
+import shutil
+import tempfile
+import threading
+from collections.abc import Iterable
+from pathlib import Path
+
+from .conversion_config import CONVERSION_CONFIGS
+from .dictionary_compiler import compile_dictionary, is_artifact_fresh
+
+
+BUNDLED_ROOT = Path(__file__).parent.parent / "conversion_dictionaries"
+
+# Per-process directory of linked JSON files and their compiled artifacts, created on first use
+_shared_root: Path | None = None
+_shared_lock = threading.Lock()
+
+
+def dictionary_paths(config_names: Iterable[str], root: Path = BUNDLED_ROOT) -> list[Path]:
+    """The JSON dictionaries a `DictionaryLoader` rooted at `root` reads for these conversion configs."""
+    paths = set()
+    for name in config_names:
+        config = CONVERSION_CONFIGS[name]
+        files = [config.char_file, config.phrase_file]
+        if config.openai_func or config.opencc_config:
+            files.append(config.one2many_file)
+        paths.update(root / config.sub_dir / file if config.sub_dir else root / file for file in files)
+    return sorted(paths)
+
+
+def shared_dictionary_root(config_names: Iterable[str]) -> Path:
+    """A dictionary root where every dictionary these configs need has a fresh memory-mappable artifact.
+
+    A `DictionaryLoader` on this root loads `MappedDictionary` artifacts, whose pages (phrase automaton included)
+    are shared by every process mapping them, instead of parsing the JSON and building tables per process. When the
+    bundled dictionaries were compiled in place (`python -m mandarin_tamer.helpers.dictionary_compiler`) that is the
+    bundled directory; otherwise the missing artifacts are compiled once into a temporary directory, next to links
+    to the JSON files, which is removed when the process exits.
+    """
+    global _shared_root  # noqa: PLW0603
+    paths = dictionary_paths(config_names)
+    if all(is_artifact_fresh(path) for path in paths):
+        return BUNDLED_ROOT
+    with _shared_lock:
+        if _shared_root is None:
+            _shared_root = Path(tempfile.mkdtemp(prefix="mandarin_tamer_dictionaries_"))
+            atexit.register(shutil.rmtree, _shared_root, True)
+        for path in paths:
+            target = _shared_root / path.relative_to(BUNDLED_ROOT)
+            if target.exists() and is_artifact_fresh(target):
+                continue
+            target.parent.mkdir(parents=True, exist_ok=True)
+            if not target.exists():
+                try:
+                    target.symlink_to(path.resolve())
+                except OSError:  # No symlink permission (e.g. Windows)
+                    shutil.copy2(path, target)
+            compile_dictionary(target)
+        return _shared_root
@@ -0,0 +1,174 @@
+import codecs
+import os
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from itertools import islice
+from pathlib import Path
+from typing import IO
+
+from .conversion_engine import ConversionEngine, get_engine
+from .entity_matcher import EntityMatcher
+from .opencc_utils import OPENCC_CONTEXT
+
+
+DEFAULT_CHUNK_SIZE = 4096
+
+StreamSource = str | os.PathLike | IO | Iterable[str] | Iterable[bytes]
+
+
+def context_radius(engine: ConversionEngine, ner_list: list | EntityMatcher | None = None) -> int:
+    """Number of characters on either side of a position that can affect how the engine converts it.
+
+    Each step can only look as far as its longest phrase key (or the OpenCC context for one-to-many steps), and the
+    steps run one after another, so the reaches add up.
+    """
+    radius = max(map(len, ner_list or [""]))
+    for step in engine.steps:
+        if step.has_phrases:
+            radius += step.phrase_trie.max_key_length
+        if step.one2many_dict and (step.config.openai_func or step.config.opencc_config):
+            radius += OPENCC_CONTEXT
+    return radius
+
+
+def read_chunks(source: StreamSource, chunk_size: int, encoding: str = "utf-8") -> Iterator[str]:
+    """Yield the text of a path, stream or chunk iterable as `str` chunks, decoding bytes incrementally."""
+    if isinstance(source, str | os.PathLike):
+        # newline="" keeps \r\n intact so the output mirrors the input byte for byte
+        with Path(source).open(encoding=encoding, newline="") as file:
+            yield from read_chunks(file, chunk_size, encoding)
+        return
+    chunks = iter(lambda: source.read(chunk_size), source.read(0)) if hasattr(source, "read") else source
+    decoder = codecs.getincrementaldecoder(encoding)()
+    for chunk in chunks:
+        yield decoder.decode(chunk) if isinstance(chunk, bytes | bytearray) else chunk
+    yield decoder.decode(b"", final=True)
+
+
+def convert_stream(
+    source: StreamSource,
+    target_script: str = "zh_cn",
+    ner_list: list | EntityMatcher | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    encoding: str = "utf-8",
+    engine: ConversionEngine | None = None,
+    **engine_options,
+) -> Iterator[str]:
+    """Convert a file path, text/binary stream or iterable of chunks, yielding converted text as it goes.
+
+    Text is converted in windows of about `chunk_size` characters that overlap by the engine's `context_radius` on
+    both sides, and only the middle of each window is emitted, so phrases spanning a chunk boundary convert as they
+    would in the full string while memory stays bounded by the window size. `engine_options` are passed to
+    `get_engine` when no `engine` is given.
+
+    The engine is checked with `check_engine` when this is called, before any input is read, so engines that can't
+    be streamed raise `ValueError` up front rather than after part of the output was produced.
+
+    Every window converts on its own, which keeps memory bounded but makes chained char replacements window-local:
+    one whose output is itself a later key (e.g. 寧 -> 宁 -> 㝉 for zh_cn) takes its second step only when that later
+    key occurs in the same window, i.e. in the window's kept span or within `context_radius` of it, rather than
+    anywhere in the text.
+    """
+    engine = engine or get_engine(target_script=target_script, **engine_options)
+    check_engine(engine)
+    windows = iter_windows(read_chunks(source, chunk_size, encoding), chunk_size, context_radius(engine, ner_list))
+    return convert_windows(windows, lambda texts: [engine.convert(text, ner_list) for text in texts])
+
+
+def convert_windows(
+    windows: Iterable[tuple[str, int, int]], convert: Callable[[list[str]], list[str]], batch_size: int = 1
+) -> Iterator[str]:
+    """Convert the `(window, start, end)` triples of `iter_windows` and yield the kept span of each, in order.
+
+    `convert` turns a list of up to `batch_size` windows into their conversions, e.g. on a worker pool. Each window
+    converts on its own, so the result doesn't depend on how they are batched.
+    """
+    windows = iter(windows)
+    while batch := list(islice(windows, batch_size)):
+        for (_, start, end), converted in zip(batch, convert([window for window, _, _ in batch]), strict=True):
+            yield converted[start:end]
+
+
+def check_engine(engine: ConversionEngine) -> None:
+    """Raise `ValueError` unless every conversion of the engine keeps the length of the text.
+
+    Windows are stitched back together position by position, which only works when conversion never changes the
+    length of the text. The bundled dictionaries all keep it, custom `include_dicts` may not, and neither may the
+    free-form per-token answers of improved mode (batched answers are checked against the candidates). Each step's
+    dictionaries are only walked on first use, see `CompiledStep.length_changing_entry`.
+    """
+    for step in engine.steps:
+        if step.length_changing_entry is not None:
+            key, value = step.length_changing_entry
+            msg = (
+                "Streaming conversion needs dictionaries whose replacements keep the length of the text they "
+                f"replace, but {step.config.name} replaces {key!r} with {value!r}"
+            )
+            raise ValueError(msg)
+        per_token = step.config.openai_func and engine.batch_func(step.config) is None
+        if engine.improved_one_to_many and step.one2many_dict and per_token:
+            msg = (
+                f"Streaming conversion can't check the length of per-token answers for {step.config.name} in "
+                "improved mode; pass batch_one_to_many=True"
+            )
+            raise ValueError(msg)
+
+
+def iter_windows(chunks: Iterable[str], chunk_size: int, radius: int) -> Iterator[tuple[str, int, int]]:
+    """Cut a chunk stream into overlapping windows, yielding `(window, start, end)`.
+
+    Converting each window and keeping `[start:end]` of the result reproduces the whole text, with `radius`
+    characters of context on both sides of every kept span.
+    """
+    # buffer[:emitted] has already been handed out and is only kept as left context
+    buffer = ""
+    emitted = 0
+    for chunk in chunks:
+        buffer += chunk
+        while len(buffer) - emitted >= chunk_size + radius:
+            yield buffer[: emitted + chunk_size + radius], emitted, emitted + chunk_size
+            keep_from = max(emitted + chunk_size - radius, 0)
+            buffer = buffer[keep_from:]
+            emitted = emitted + chunk_size - keep_from
+    if len(buffer) > emitted:
+        yield buffer, emitted, len(buffer)
+
+
+def convert_file(
+    input_path: str | os.PathLike,
+    output_path: str | os.PathLike,
+    target_script: str = "zh_cn",
+    ner_list: list | EntityMatcher | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    encoding: str = "utf-8",
+    **engine_options,
+) -> int:
+    """Stream `input_path` through the converter into `output_path` and return the number of characters written.
+
+    The output goes to a temporary file next to `output_path` that replaces it only once the whole input converted,
+    so a failure never leaves a truncated file behind.
+    """
+    converted_chunks = convert_stream(input_path, target_script, ner_list, chunk_size, encoding, **engine_options)
+    written = 0
+    with replacing_file(output_path, encoding) as output:
+        for converted in converted_chunks:
+            output.write(converted)
+            written += len(converted)
+    return written
+
+
+@contextmanager
+def replacing_file(path: str | os.PathLike, encoding: str = "utf-8") -> Iterator[IO[str]]:
+    """Open a temporary file next to `path` for writing, which replaces `path` only once the block completes.
+
+    The file is opened with `newline=""`, so line endings are written as given. If the block raises, the temporary
+    file is removed and `path` is left as it was.
+    """
+    path = Path(path)
+    temporary = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with temporary.open("w", encoding=encoding, newline="") as file:
+            yield file
+        temporary.replace(path)
+    finally:
+        temporary.unlink(missing_ok=True)
@@ -1,3 +1,10 @@
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import deque
+from collections.abc import Iterable, Iterator, Sequence
+
+
 class TrieNode:
     def __init__(self):
         self.children = {}
@@ -6,14 +13,18 @@ class TrieNode:
 
 
 class Trie:
+    node_class = TrieNode
+
     def __init__(self):
-        self.root = TrieNode()
+        self.root = self.node_class()
+        self.node_count = 1
 
     def insert(self, word: str, value: str):
         node = self.root
         for char in word:
             if char not in node.children:
-                node.children[char] = TrieNode()
+                node.children[char] = self.node_class()
+                self.node_count += 1
             node = node.children[char]
         node.is_end = True
         node.value = value
@@ -30,3 +41,356 @@ class Trie:
                     matches.append((i, j + 1, node.value))
                 j += 1
         return matches
+
+    def estimated_size(self) -> int:
+        """Rough number of bytes held by the trie nodes, used for cache budgeting."""
+        node = self.node_class()
+        per_node = sys.getsizeof(node) + sys.getsizeof(node.__dict__) + sys.getsizeof(node.children)
+        return self.node_count * per_node
+
+    def memory_usage(self) -> int:
+        """Bytes held by every node, its attribute and children dicts, and the distinct values."""
+        total = 0
+        seen_values = set()
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            total += sys.getsizeof(node) + sys.getsizeof(node.__dict__) + sys.getsizeof(node.children)
+            if node.is_end and id(node.value) not in seen_values:
+                seen_values.add(id(node.value))
+                total += sys.getsizeof(node.value)
+            stack.extend(node.children.values())
+        return total
+
+
+def leftmost_longest(
+    matches: Iterable[tuple[int, int, str]], max_key_length: int, text_length: int
+) -> Iterator[tuple[int, int, str]]:
+    """Reduce matches ordered by end position to non-overlapping leftmost-longest matches.
+
+    A start position is settled once the matches have moved `max_key_length` characters past it, so settled
+    starts are emitted in order without sorting the overlapping matches.
+    """
+    longest: dict[int, tuple[int, str]] = {}
+    next_free = 0  # End of the last emitted match
+    settled = 0  # Every start before this has been decided
+
+    def settle(limit: int) -> Iterator[tuple[int, int, str]]:
+        nonlocal next_free, settled
+        for start in range(settled, limit):
+            candidate = longest.pop(start, None)
+            if candidate and start >= next_free:
+                next_free = candidate[0]
+                yield start, candidate[0], candidate[1]
+        settled = max(settled, limit)
+
+    for start, end, value in matches:
+        current = longest.get(start)
+        if current is None or end > current[0]:
+            longest[start] = (end, value)
+        if end - max_key_length > settled:
+            yield from settle(end - max_key_length)
+    yield from settle(text_length)
+
+
+class AhoCorasickNode(TrieNode):
+    def __init__(self):
+        super().__init__()
+        self.depth = 0
+        self.fail = None
+        self.output = None  # Nearest node on the failure chain that ends a word
+
+
+class AhoCorasick(Trie):
+    """Trie with failure links, so all matches are found in one left-to-right pass over the text.
+
+    Keeps the `insert`/`find_all_matches` interface of `Trie`. Failure links are (re)built lazily on the first
+    search after an insert.
+    """
+
+    node_class = AhoCorasickNode
+
+    def __init__(self):
+        super().__init__()
+        self.max_key_length = 0
+        self._built = False
+
+    def insert(self, word: str, value: str):
+        super().insert(word, value)
+        self.max_key_length = max(self.max_key_length, len(word))
+        self._built = False
+
+    def build(self) -> None:
+        """Compute depths, failure links and output links breadth-first."""
+        root = self.root
+        root.fail = root
+        queue = deque()
+        for child in root.children.values():
+            child.depth = 1
+            child.fail = root
+            child.output = None
+            queue.append(child)
+        while queue:
+            node = queue.popleft()
+            for char, child in node.children.items():
+                fail = node.fail
+                while fail is not root and char not in fail.children:
+                    fail = fail.fail
+                child.fail = fail.children.get(char, root)
+                child.depth = node.depth + 1
+                child.output = child.fail if child.fail.is_end else child.fail.output
+                queue.append(child)
+        self._built = True
+
+    def iter_matches(self, text: str) -> Iterator[tuple[int, int, str]]:
+        """Yield every (start, end, value) match, ordered by end and then by start."""
+        if not self._built:
+            self.build()
+        root = self.root
+        node = root
+        for index, char in enumerate(text):
+            while node is not root and char not in node.children:
+                node = node.fail
+            node = node.children.get(char, root)
+            match = node if node.is_end else node.output
+            while match is not None:
+                yield index + 1 - match.depth, index + 1, match.value
+                match = match.output
+
+    def find_all_matches(self, text: str) -> list[tuple[int, int, str]]:
+        """Returns list of (start_idx, end_idx, replacement_value), in the same order as `Trie`."""
+        return sorted(self.iter_matches(text))
+
+    def iter_leftmost_longest(self, text: str) -> Iterator[tuple[int, int, str]]:
+        """Yield non-overlapping matches, preferring the leftmost start and then the longest key."""
+        return leftmost_longest(self.iter_matches(text), self.max_key_length, len(text))
+
+
+class CompactTrie:
+    """Aho-Corasick automaton stored in flat arrays instead of one Python object per node.
+
+    Nodes are numbered breadth-first with siblings sorted by code point, so the children of node `i` are the
+    contiguous edges `first_child[i]:first_child[i + 1]` and edge `k` leads to node `k + 1`. Values are interned
+    in a single list and referenced by index, and `key_nodes` remembers insertion order for `items`. The arrays
+    are compiled lazily on the first search after an insert.
+    """
+
+    def __init__(self):
+        self.max_key_length = 0
+        self._pending: dict[str, str] = {}
+        self._compiled = False
+        self.first_child = array("I", [0, 0])
+        self.edge_chars = array("I")
+        self.value_index = array("i", [-1])
+        self.fail = array("I", [0])
+        self.output = array("I", [0])
+        self.depth = array("H", [0])
+        self.key_nodes = array("I")
+        self.values: Sequence = []
+
+    @classmethod
+    def from_arrays(
+        cls,
+        first_child: Sequence[int],
+        edge_chars: Sequence[int],
+        value_index: Sequence[int],
+        fail: Sequence[int],
+        output: Sequence[int],
+        depth: Sequence[int],
+        key_nodes: Sequence[int],
+        values: Sequence,
+        max_key_length: int,
+    ) -> "CompactTrie":
+        """Wrap already compiled arrays, e.g. memoryviews over a memory-mapped dictionary artifact."""
+        trie = cls()
+        trie.first_child, trie.edge_chars, trie.value_index = first_child, edge_chars, value_index
+        trie.fail, trie.output, trie.depth, trie.key_nodes = fail, output, depth, key_nodes
+        trie.values = values
+        trie.max_key_length = max_key_length
+        trie._compiled = True
+        return trie
+
+    @property
+    def node_count(self) -> int:
+        if not self._compiled:
+            self.build()
+        return len(self.value_index)
+
+    def insert(self, word: str, value: str):
+        if self._compiled and not self._pending:
+            self._pending = dict(self.items())
+        self._pending[word] = value
+        self.max_key_length = max(self.max_key_length, len(word))
+        self._compiled = False
+
+    def items(self) -> Iterator[tuple[str, str]]:
+        """Yield every (key, value) pair in insertion order."""
+        if not self._compiled:
+            self.build()
+        for node in self.key_nodes:
+            yield self.key_of(node), self.values[self.value_index[node]]
+
+    def key_of(self, node: int) -> str:
+        """Rebuild the key spelled by the path from the root to `node`."""
+        chars = []
+        while node:
+            chars.append(chr(self.edge_chars[node - 1]))
+            # The parent owns the edge range that contains this node's incoming edge
+            node = bisect_right(self.first_child, node - 1) - 1
+        return "".join(reversed(chars))
+
+    def build(self) -> None:
+        """Compile the pending keys into the flat arrays and compute the failure links."""
+        keys = [key for key in self._pending if key]
+        levels = [[""]]
+        levels.extend(
+            sorted({key[:depth] for key in keys if len(key) >= depth})
+            for depth in range(1, max(map(len, keys), default=0) + 1)
+        )
+        order = [prefix for level in levels for prefix in level]
+        ids = {prefix: node for node, prefix in enumerate(order)}
+        parents = [ids[prefix[:-1]] for prefix in order[1:]]
+
+        child_counts = [0] * len(order)
+        for parent in parents:
+            child_counts[parent] += 1
+        first_child = array("I", [0]) * (len(order) + 1)
+        for node, count in enumerate(child_counts):
+            first_child[node + 1] = first_child[node] + count
+        self.first_child = first_child
+        self.edge_chars = array("I", (ord(prefix[-1]) for prefix in order[1:]))
+        self.depth = array("H", (len(prefix) for prefix in order))
+
+        interned: dict = {}
+        self.values = []
+        self.value_index = array("i", [-1]) * len(order)
+        for key in keys:
+            value = self._pending[key]
+            try:
+                index = interned.setdefault(value, len(self.values))
+            except TypeError:  # Unhashable values (e.g. one2many lists) are stored without interning
+                index = len(self.values)
+            if index == len(self.values):
+                self.values.append(value)
+            self.value_index[ids[key]] = index
+        self.key_nodes = array("I", (ids[key] for key in keys))
+
+        self._build_links(parents)
+        self._pending = {}
+        self._compiled = True
+
+    def _build_links(self, parents: list[int]) -> None:
+        # Breadth-first numbering means every parent and shorter suffix is linked before its children
+        node_total = len(self.value_index)
+        self.fail = array("I", [0]) * node_total
+        self.output = array("I", [0]) * node_total
+        for node in range(1, node_total):
+            parent = parents[node - 1]
+            if parent:
+                code = self.edge_chars[node - 1]
+                state = self.fail[parent]
+                while True:
+                    child = self._child(state, code)
+                    if child or not state:
+                        break
+                    state = self.fail[state]
+                self.fail[node] = child
+            fail = self.fail[node]
+            self.output[node] = fail if self.value_index[fail] >= 0 else self.output[fail]
+
+    def find_node(self, key: str) -> int:
+        """Return the node reached by walking `key` from the root, or 0 when the walk falls off the trie."""
+        if not self._compiled:
+            self.build()
+        node = 0
+        for char in key:
+            node = self._child(node, ord(char))
+            if not node:
+                return 0
+        return node
+
+    def get(self, key: str, default=None):
+        """Return the value stored for exactly `key`."""
+        node = self.find_node(key)
+        if not node or self.value_index[node] < 0:
+            return default
+        return self.values[self.value_index[node]]
+
+    def _child(self, node: int, code: int) -> int:
+        lo = self.first_child[node]
+        hi = self.first_child[node + 1]
+        position = bisect_left(self.edge_chars, code, lo, hi)
+        if position < hi and self.edge_chars[position] == code:
+            return position + 1
+        return 0
+
+    def iter_matches(self, text: str) -> Iterator[tuple[int, int, str]]:
+        """Yield every (start, end, value) match, ordered by end and then by start."""
+        if not self._compiled:
+            self.build()
+        first_child, edge_chars, fail, output = self.first_child, self.edge_chars, self.fail, self.output
+        depth, value_index, values = self.depth, self.value_index, self.values
+        node = 0
+        for index, char in enumerate(text):
+            code = ord(char)
+            while True:
+                lo = first_child[node]
+                hi = first_child[node + 1]
+                position = bisect_left(edge_chars, code, lo, hi)
+                if position < hi and edge_chars[position] == code:
+                    node = position + 1
+                    break
+                if not node:
+                    break
+                node = fail[node]
+            match = node if value_index[node] >= 0 else output[node]
+            while match:
+                yield index + 1 - depth[match], index + 1, values[value_index[match]]
+                match = output[match]
+
+    def find_all_matches(self, text: str) -> list[tuple[int, int, str]]:
+        """Returns list of (start_idx, end_idx, replacement_value), in the same order as `Trie`."""
+        return sorted(self.iter_matches(text))
+
+    def iter_leftmost_longest(self, text: str) -> Iterator[tuple[int, int, str]]:
+        """Yield non-overlapping matches, preferring the leftmost start and then the longest key."""
+        return leftmost_longest(self.iter_matches(text), self.max_key_length, len(text))
+
+    def memory_usage(self) -> int:
+        """Bytes held by the arrays, the interned value list and the distinct values."""
+        if not self._compiled:
+            self.build()
+        arrays = (
+            self.first_child,
+            self.edge_chars,
+            self.value_index,
+            self.fail,
+            self.output,
+            self.depth,
+            self.key_nodes,
+        )
+        total = sum(sys.getsizeof(values) for values in arrays)
+        total += sys.getsizeof(self.values) + sum(sys.getsizeof(value) for value in self.values)
+        return total
+
+    def estimated_size(self) -> int:
+        return self.memory_usage()
+
+
+TRIE_BACKENDS: dict[str, type] = {
+    "trie": Trie,
+    "aho_corasick": AhoCorasick,
+    "compact": CompactTrie,
+}
+DEFAULT_TRIE_BACKEND = "aho_corasick"
+
+PhraseMatcher = AhoCorasick | CompactTrie
+
+
+def create_trie(backend: str | None = None) -> PhraseMatcher:
+    """Create an empty matcher for one of the `TRIE_BACKENDS` that support Aho-Corasick searches."""
+    backend = backend or DEFAULT_TRIE_BACKEND
+    if backend not in TRIE_BACKENDS or backend == "trie":
+        msg = f"Unknown trie backend {backend!r}; expected 'aho_corasick' or 'compact'"
+        raise ValueError(msg)
+    return TRIE_BACKENDS[backend]()
@@ -0,0 +1,121 @@
+import re
+from collections import Counter
+from dataclasses import dataclass
+
+from mandarin_tamer.helpers.trie import create_trie
+
+
+MAX_PHRASE_LENGTH = 5
+
+
+class PhraseReplacer:
+    """A phrase dictionary compiled for `phrase_conversion`, converting a sentence in time linear in its length.
+
+    The original step tried every substring of up to five characters, longest first and then in string order, and
+    called `str.replace` on the whole sentence for each one in the dictionary (once per occurrence). Replacements
+    cascade: output can form new matches for later phrases, and a phrase overlapping an earlier replacement still
+    applies wherever its characters survived.
+
+    This replays exactly those replacements, but only for phrases the automaton finds, and only inside the runs of
+    characters that appear in some key. Characters outside every key are never part of a match, so each run can be
+    rewritten on its own and the work stays proportional to the sentence rather than to sentence x matches.
+    """
+
+    def __init__(self, phrase_dictionary: dict, max_phrase_length: int = MAX_PHRASE_LENGTH):
+        self.phrase_dictionary = phrase_dictionary
+        # Rank = position in the order the original step tried phrases: longest first, then in string order
+        self.keys = sorted(
+            (key for key in phrase_dictionary if 0 < len(key) <= max_phrase_length), key=lambda x: (-len(x), x)
+        )
+        self.values = [phrase_dictionary[key] for key in self.keys]
+        self.matcher = create_trie()
+        for rank, key in enumerate(self.keys):
+            self.matcher.insert(key, rank)
+        alphabet = sorted(set("".join(self.keys)))
+        self.runs = re.compile(f"[{''.join(map(re.escape, alphabet))}]+") if alphabet else None
+
+    def convert(self, sentence: str) -> str:
+        if self.runs is None:
+            return sentence
+        # Each phrase is replaced as many times as it occurred anywhere in the original sentence
+        counts: Counter = Counter()
+        runs = []
+        for run in self.runs.finditer(sentence):
+            ranks = [rank for _, _, rank in self.matcher.iter_matches(run.group())]
+            if ranks:
+                counts.update(ranks)
+                runs.append((run, set(ranks)))
+        parts = []
+        last = 0
+        for run, present in runs:
+            parts.append(sentence[last : run.start()])
+            parts.append(self._rewrite(run.group(), present, counts))
+            last = run.end()
+        parts.append(sentence[last:])
+        return "".join(parts)
+
+    def _rewrite(self, text: str, present: set[int], counts: Counter) -> str:
+        """Replay the replacements on one run, in rank order, finding the next applicable phrase after each."""
+        done = -1
+        while True:
+            rank = min((rank for rank in present if rank > done and rank in counts), default=None)
+            if rank is None:
+                return text
+            key, value = self.keys[rank], self.values[rank]
+            for _ in range(counts[rank]):
+                if key not in text:
+                    break
+                text = text.replace(key, value)
+            done = rank
+            present = {rank for _, _, rank in self.matcher.iter_matches(text)}
+
+
+class CharReplacer:
+    """A one-to-one dictionary compiled into `str.translate` tables for `character_conversion`.
+
+    The original step called `str.replace` for every character of the sentence in turn, so a character whose
+    replacement contains other keys is rewritten again by each of those keys that occurs later in the sentence (and
+    by itself, if it occurs again). All copies of a character go through the same replacements, so each character
+    maps to one final string. For keys whose values contain no key that is just the value; the few "chained" keys
+    are resolved per sentence in one pass from the end, tracking what each key they lead to becomes from there on.
+    """
+
+    def __init__(self, one_to_one_dictionary: dict):
+        self.one_to_one_dictionary = one_to_one_dictionary
+        # Iterating over a sentence only ever yields single characters, so longer keys never applied
+        keys = {key: value for key, value in one_to_one_dictionary.items() if len(key) == 1}
+        self.keys = keys
+        self.chained = [key for key, value in keys.items() if any(char in keys for char in value)]
+        self.table = {ord(key): value for key, value in keys.items() if not any(char in keys for char in value)}
+        # Keys a chained key can lead to, the only ones whose occurrences matter when resolving it
+        reachable, pending = set(self.chained), list(self.chained)
+        while pending:
+            for char in keys[pending.pop()]:
+                if char in keys and char not in reachable:
+                    reachable.add(char)
+                    pending.append(char)
+        self.reachable = re.compile(f"[{''.join(map(re.escape, sorted(reachable)))}]") if reachable else None
+
+    def convert(self, sentence: str) -> str:
+        sentence_chained = [key for key in self.chained if key in sentence]
+        # Plain keys' values contain no keys, so after this only the chained keys' own characters are left to map
+        result = sentence.translate(self.table)
+        if not sentence_chained:
+            return result
+        # final[char] is what `char` becomes through the replacements made for the positions after the current one
+        final: dict[str, str] = {}
+        for char in reversed(self.reachable.findall(sentence)):
+            final[char] = "".join(final.get(next_char, next_char) for next_char in self.keys[char])
+        return result.translate({ord(key): final[key] for key in sentence_chained})
+
+
+@dataclass(frozen=True)
+class CompiledDictionaries:
+    """Phrase and char replacers for one conversion step's dictionaries, built once and reused for every sentence."""
+
+    phrases: PhraseReplacer
+    chars: CharReplacer
+
+
+def compile_dictionaries(dictionaries: dict) -> CompiledDictionaries:
+    return CompiledDictionaries(PhraseReplacer(dictionaries["phrases"]), CharReplacer(dictionaries["chars"]))
@@ -1,30 +1,44 @@
 import time
 
+from .compiled_dictionaries import compile_dictionaries
 from .micro_conversion_steps import (
     character_conversion,
     one_to_many_conversion,
+    one_to_many_conversion_async,
     phrase_conversion,
 )
 
 
-def convert_text(sentence, dictionaries, opencc_config, openai_function=None, client=None, debug=False):
+def convert_text(sentence, dictionaries, opencc_config, openai_function=None, client=None, debug=False, compiled=None):
+    compiled = compiled or compile_dictionaries(dictionaries)
     if not debug:
-        sentence = phrase_conversion(sentence, dictionaries["phrases"])
+        sentence = phrase_conversion(sentence, dictionaries["phrases"], compiled.phrases)
         sentence = one_to_many_conversion(sentence, dictionaries["one2many"], opencc_config, openai_function, client)
-        return character_conversion(sentence, dictionaries["chars"])
+        return character_conversion(sentence, dictionaries["chars"], compiled.chars)
     timings = {}
     s1 = time.perf_counter()
-    sentence1 = phrase_conversion(sentence, dictionaries["phrases"])
+    sentence1 = phrase_conversion(sentence, dictionaries["phrases"], compiled.phrases)
     timings["phrase_conversion"] = time.perf_counter() - s1
     s2 = time.perf_counter()
     sentence2 = one_to_many_conversion(sentence1, dictionaries["one2many"], opencc_config, openai_function, client)
     timings["one_to_many_conversion"] = time.perf_counter() - s2
     s3 = time.perf_counter()
-    sentence3 = character_conversion(sentence2, dictionaries["chars"])
+    sentence3 = character_conversion(sentence2, dictionaries["chars"], compiled.chars)
     timings["character_conversion"] = time.perf_counter() - s3
     return sentence3, timings
 
 
+async def convert_text_async(
+    sentence, dictionaries, opencc_config, openai_function=None, client=None, cache=None, compiled=None
+):
+    compiled = compiled or compile_dictionaries(dictionaries)
+    sentence = phrase_conversion(sentence, dictionaries["phrases"], compiled.phrases)
+    sentence = await one_to_many_conversion_async(
+        sentence, dictionaries["one2many"], opencc_config, openai_function, client, cache
+    )
+    return character_conversion(sentence, dictionaries["chars"], compiled.chars)
+
+
 def apply_conversion_chain(sentence, conversion_functions, debug=False):
     if not debug:
         for major_step in conversion_functions:
@@ -1,7 +1,8 @@
 import json
 from pathlib import Path
 
-from ..conversion_dictionaries import DICT_ROOT
+from mandarin_tamer.conversion_dictionaries import DICT_ROOT
+from mandarin_tamer.helpers.dictionary_compiler import load_fresh_artifact
 
 
 def json_to_dict(file_path):
@@ -11,8 +12,11 @@ def json_to_dict(file_path):
 
 
 def load_dictionary(subpath, filename):
-    """Load a dictionary from the specified subpath and filename"""
+    """Load a dictionary from the specified subpath and filename, preferring a fresh precompiled artifact"""
     path = Path(DICT_ROOT) / subpath / filename
+    artifact = load_fresh_artifact(path)
+    if artifact is not None:
+        return artifact
     return json_to_dict(path)
 
 
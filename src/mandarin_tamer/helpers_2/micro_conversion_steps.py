@@ -1,26 +1,14 @@
-from opencc import OpenCC
+from functools import partial
 
+from mandarin_tamer.helpers.disambiguation_cache import cached_token_func_async
+from mandarin_tamer.helpers.opencc_utils import convert_positions, find_ambiguous_positions
+from .compiled_dictionaries import CharReplacer, PhraseReplacer
+from .open_ai_prompts import OPENAI_MODEL, one2many_mapping_async
 
-def get_possible_sentence_phrases(sentence, max_phrase_length, sentence_length):
-    return sorted(
-        [
-            sentence[i : i + length]
-            for i in range(sentence_length)
-            for length in range(1, max_phrase_length + 1)
-            if i + length <= sentence_length
-        ],
-        key=lambda x: (-len(x), x),
-    )
 
-
-def phrase_conversion(sentence: str, phrase_dictionary: dict) -> str:
-    max_phrase_length = 5
-    sentence_length = len(sentence)
-    possible_sentence_phrases = get_possible_sentence_phrases(sentence, max_phrase_length, sentence_length)
-    for phrase in possible_sentence_phrases:
-        if phrase in phrase_dictionary:
-            sentence = sentence.replace(phrase, phrase_dictionary[phrase])
-    return sentence
+def phrase_conversion(sentence: str, phrase_dictionary: dict, replacer: PhraseReplacer | None = None) -> str:
+    """Replace dictionary phrases of up to five characters, reusing `replacer` when it was compiled ahead of time."""
+    return (replacer or PhraseReplacer(phrase_dictionary)).convert(sentence)
 
 
 def one_to_many_conversion(sentence, mapping_dict, opencc_config, openai_function=None, client=None):
@@ -30,27 +18,48 @@ def one_to_many_conversion(sentence, mapping_dict, opencc_config, openai_functio
     if not mapping_dict:
         return sentence
 
-    cc = OpenCC(opencc_config)
-    cc_converted_sentence = cc.convert(sentence)
+    positions = find_ambiguous_positions(sentence, mapping_dict)
+    if not positions:
+        return sentence
 
     # Create a new string to build the result
     result = list(sentence)
 
-    # Track characters that need conversion
-    for i, char in enumerate(sentence):
-        if char in mapping_dict:
-            if client and openai_function:
-                replacement = openai_function(sentence, char, mapping_dict, client)
-                result[i] = replacement
-            else:
-                # Use the corresponding character from OpenCC's conversion at the same position
-                result[i] = cc_converted_sentence[i]
+    if client and openai_function:
+        for i in positions:
+            result[i] = openai_function(sentence, sentence[i], mapping_dict, client)
+    else:
+        # OpenCC converts small windows around each ambiguous character instead of the whole sentence
+        for i, replacement in convert_positions(sentence, positions, opencc_config).items():
+            result[i] = replacement
+
+    return "".join(result)
+
 
+async def one_to_many_conversion_async(
+    sentence, mapping_dict, opencc_config, openai_function=None, client=None, cache=None
+):
+    """
+    `one_to_many_conversion` with an async client: the OpenAI requests for all ambiguous characters are sent
+    concurrently, each seeing the unchanged sentence just as in the serial version. A `DisambiguationCache` is
+    consulted before each request.
+    """
+    if not (client and openai_function):
+        return one_to_many_conversion(sentence, mapping_dict, opencc_config)
+
+    import asyncio  # noqa: PLC0415 - only loaded by async callers
+
+    request = partial(one2many_mapping_async, openai_function)
+    if cache is not None:
+        request = cached_token_func_async(cache, request, openai_function.__name__, OPENAI_MODEL)
+    positions = find_ambiguous_positions(sentence, mapping_dict or {})
+    replacements = await asyncio.gather(*(request(sentence, sentence[i], mapping_dict, client) for i in positions))
+    result = list(sentence)
+    for i, replacement in zip(positions, replacements, strict=True):
+        result[i] = replacement
     return "".join(result)
 
 
-def character_conversion(sentence: str, one_to_one_dictionary: dict) -> str:
-    for char in sentence:
-        if char in one_to_one_dictionary:
-            sentence = sentence.replace(char, one_to_one_dictionary[char])
-    return sentence
+def character_conversion(sentence: str, one_to_one_dictionary: dict, replacer: CharReplacer | None = None) -> str:
+    """Replace single characters, reusing `replacer` when it was compiled ahead of time."""
+    return (replacer or CharReplacer(one_to_one_dictionary)).convert(sentence)
@@ -1,18 +1,41 @@
 import json
 
-from openai import OpenAI
+from mandarin_tamer.helpers.disambiguation_backends import OpenAIBackend
 
+OPENAI_MODEL = "gpt-4o-mini"
 
-def initialize_openai_client(openai_key: str | None):
-    """Initialize OpenAI client if an API key is provided."""
+# What each conversion step asks the model to do when choosing between one-to-many candidates
+S2T_INTENT = "replacing Simplified Mandarin with Traditional Taiwanese Mandarin"
+T2S_INTENT = "replacing Traditional Mandarin with Simplified Mandarin"
+MODERNIZE_SIMP_INTENT = "replacing outdated/archaic Simplified Mandarin with Modern Simplified Mandarin"
+NORMALIZE_SIMP_INTENT = "replacing uncommon words with more common equivalents in Simplified Mandarin"
+MODERNIZE_TRAD_INTENT = "replacing outdated/archaic Traditional Mandarin with Modern Traditional Mandarin"
+NORMALIZE_TRAD_INTENT = "replacing uncommon words with more common equivalents in Traditional Mandarin"
+TAIWANIZE_INTENT = "replacing Traditional Mandarin with Traditional Taiwanese Mandarin"
+DETAIWANIZE_INTENT = "replacing Traditional Taiwanese Mandarin with Traditional Hong Kong Mandarin"
+
+
+def initialize_openai_client(openai_key: str | None, backend=None):
+    """Initialize OpenAI client if an API key is provided, or take it from a `DisambiguationBackend`."""
+    if backend is not None:
+        return backend.client()
     if openai_key:
-        return OpenAI(api_key=openai_key)
+        return OpenAIBackend(openai_key).client()
+    return None
+
+
+def initialize_async_openai_client(openai_key: str | None, backend=None):
+    """Initialize the async OpenAI client used by `MandarinConverter.convert_script_async`."""
+    if backend is not None:
+        return backend.async_client()
+    if openai_key:
+        return OpenAIBackend(openai_key).async_client()
     return None
 
 
 def openai_s2t_one2many_mappings(sentence, token, mapping_dict, client):
     return _one2many_mapping(
-        "replacing Simplified Mandarin with Traditional Taiwanese Mandarin",
+        S2T_INTENT,
         "sentence",
         sentence,
         token,
@@ -23,7 +46,7 @@ def openai_s2t_one2many_mappings(sentence, token, mapping_dict, client):
 
 def openai_t2s_one2many_mappings(tokenized_sentence, token, mapping_dict, client):
     return _one2many_mapping(
-        "replacing Traditional Mandarin with Simplified Mandarin",
+        T2S_INTENT,
         "tokenized_sentence",
         tokenized_sentence,
         token,
@@ -34,7 +57,7 @@ def openai_t2s_one2many_mappings(tokenized_sentence, token, mapping_dict, client
 
 def openai_modernize_simp_one2many_mappings(tokenized_sentence, token, mapping_dict, client):
     return _one2many_mapping(
-        "replacing outdated/archaic Simplified Mandarin with Modern Simplified Mandarin",
+        MODERNIZE_SIMP_INTENT,
         "tokenized_sentence",
         tokenized_sentence,
         token,
@@ -45,7 +68,7 @@ def openai_modernize_simp_one2many_mappings(tokenized_sentence, token, mapping_d
 
 def openai_normalize_simp_one2many_mappings(tokenized_sentence, token, mapping_dict, client):
     return _one2many_mapping(
-        "replacing uncommon words with more common equivalents in Simplified Mandarin",
+        NORMALIZE_SIMP_INTENT,
         "tokenized_sentence",
         tokenized_sentence,
         token,
@@ -56,7 +79,7 @@ def openai_normalize_simp_one2many_mappings(tokenized_sentence, token, mapping_d
 
 def openai_modernize_trad_one2many_mappings(tokenized_sentence, token, mapping_dict, client):
     return _one2many_mapping(
-        "replacing outdated/archaic Traditional Mandarin with Modern Traditional Mandarin",
+        MODERNIZE_TRAD_INTENT,
         "tokenized_sentence",
         tokenized_sentence,
         token,
@@ -67,7 +90,7 @@ def openai_modernize_trad_one2many_mappings(tokenized_sentence, token, mapping_d
 
 def openai_normalize_trad_one2many_mappings(tokenized_sentence, token, mapping_dict, client):
     return _one2many_mapping(
-        "replacing uncommon words with more common equivalents in Traditional Mandarin",
+        NORMALIZE_TRAD_INTENT,
         "tokenized_sentence",
         tokenized_sentence,
         token,
@@ -78,7 +101,7 @@ def openai_normalize_trad_one2many_mappings(tokenized_sentence, token, mapping_d
 
 def openai_taiwanize_one2many_mappings(tokenized_sentence, token, mapping_dict, client):
     return _one2many_mapping(
-        "replacing Traditional Mandarin with Traditional Taiwanese Mandarin",
+        TAIWANIZE_INTENT,
         "tokenized_sentence",
         tokenized_sentence,
         token,
@@ -89,7 +112,7 @@ def openai_taiwanize_one2many_mappings(tokenized_sentence, token, mapping_dict,
 
 def openai_detaiwanize_one2many_mappings(tokenized_sentence, token, mapping_dict, client):
     return _one2many_mapping(
-        "replacing Traditional Taiwanese Mandarin with Traditional Hong Kong Mandarin",
+        DETAIWANIZE_INTENT,
         "tokenized_sentence",
         tokenized_sentence,
         token,
@@ -98,21 +121,52 @@ def openai_detaiwanize_one2many_mappings(tokenized_sentence, token, mapping_dict
     )
 
 
+ONE2MANY_PROMPTS = {
+    openai_s2t_one2many_mappings: (S2T_INTENT, "sentence"),
+    openai_t2s_one2many_mappings: (T2S_INTENT, "tokenized_sentence"),
+    openai_modernize_simp_one2many_mappings: (MODERNIZE_SIMP_INTENT, "tokenized_sentence"),
+    openai_normalize_simp_one2many_mappings: (NORMALIZE_SIMP_INTENT, "tokenized_sentence"),
+    openai_modernize_trad_one2many_mappings: (MODERNIZE_TRAD_INTENT, "tokenized_sentence"),
+    openai_normalize_trad_one2many_mappings: (NORMALIZE_TRAD_INTENT, "tokenized_sentence"),
+    openai_taiwanize_one2many_mappings: (TAIWANIZE_INTENT, "tokenized_sentence"),
+    openai_detaiwanize_one2many_mappings: (DETAIWANIZE_INTENT, "tokenized_sentence"),
+}
+
+
 def _one2many_mapping(prompt_intent, sentence_label, sentence, token, mapping_dict, client):
+    system_context, user_context = _one2many_prompt(prompt_intent, sentence_label, sentence, token, mapping_dict)
+    response = get_openai_response(
+        system_content=system_context,
+        user_content=user_context,
+        json_mode=True,
+        client=client,
+    )
+    return _best_replacement_token(response)
+
+
+async def one2many_mapping_async(openai_function, sentence, token, mapping_dict, client):
+    """Async counterpart of one of the `openai_*_one2many_mappings` functions, sending the same prompt."""
+    prompt_intent, sentence_label = ONE2MANY_PROMPTS[openai_function]
+    system_context, user_context = _one2many_prompt(prompt_intent, sentence_label, sentence, token, mapping_dict)
+    response = await get_openai_response_async(
+        system_content=system_context,
+        user_content=user_context,
+        json_mode=True,
+        client=client,
+    )
+    return _best_replacement_token(response)
+
+
+def _one2many_prompt(prompt_intent, sentence_label, sentence, token, mapping_dict):
     system_context = f"""
     Return as json the best_replacement_token for the token in the sentence based on the options in the mapping_dictionary for {prompt_intent}.
     """  # noqa: E501
     user_context = f"{sentence_label}: {sentence}; token: {token}; mapping_dictionary: {mapping_dict}"
-    response = (
-        get_openai_response(
-            system_content=system_context,
-            user_content=user_context,
-            json_mode=True,
-            client=client,
-        )
-        or '{"best_replacement_token": ""}'
-    )
-    json_response = json.loads(response)
+    return system_context, user_context
+
+
+def _best_replacement_token(response):
+    json_response = json.loads(response or '{"best_replacement_token": ""}')
     return json_response["best_replacement_token"]
 
 
@@ -125,6 +179,28 @@ def get_openai_response(
     temperature=0,
     client=None,
 ):
+    completion = client.chat.completions.create(
+        **_completion_request(system_content, user_content, assistant_content, json_mode, max_tokens, temperature)
+    )
+    return completion.choices[0].message.content
+
+
+async def get_openai_response_async(
+    system_content=None,
+    user_content=None,
+    assistant_content=None,
+    json_mode=False,
+    max_tokens=3500,
+    temperature=0,
+    client=None,
+):
+    completion = await client.chat.completions.create(
+        **_completion_request(system_content, user_content, assistant_content, json_mode, max_tokens, temperature)
+    )
+    return completion.choices[0].message.content
+
+
+def _completion_request(system_content, user_content, assistant_content, json_mode, max_tokens, temperature):
     messages = []
     if system_content:
         messages.append({"role": "system", "content": system_content})
@@ -132,12 +208,10 @@ def get_openai_response(
         messages.append({"role": "user", "content": user_content})
     if assistant_content:
         messages.append({"role": "assistant", "content": assistant_content})
-
-    completion = client.chat.completions.create(
-        model="gpt-4o-mini",
-        response_format={"type": "json_object"} if json_mode else {"type": "text"},
-        messages=messages,
-        max_tokens=max_tokens,
-        temperature=temperature,
-    )
-    return completion.choices[0].message.content
+    return {
+        "model": OPENAI_MODEL,
+        "response_format": {"type": "json_object"} if json_mode else {"type": "text"},
+        "messages": messages,
+        "max_tokens": max_tokens,
+        "temperature": temperature,
+    }
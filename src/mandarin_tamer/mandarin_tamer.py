@@ -1,5 +1,7 @@
 """src/mandarin_tamer/mandarin_tamer.py - Core script conversion functionality"""
 
+from time import perf_counter
+
 from .helpers import initialize_openai_client
 from .helpers.conversion_config import (
     CONVERSION_CONFIGS,
@@ -7,8 +9,12 @@ from .helpers.conversion_config import (
     ConversionConfig,
     get_conversion_steps,
 )
+from .helpers.conversion_engine import engine_key, get_engine
 from .helpers.conversion_operations import ConversionOperation, DictionaryLoader
-from .helpers.replacement_by_dictionary import ReplacementUtils
+from .helpers.entity_matcher import EntityMatcher, entity_spans
+from .helpers.instrumentation import Observer, emit, emit_operation
+from .helpers.protected_spans import ProtectedSpans
+from .helpers.result_cache import ResultCache, ner_key
 
 
 def convert_mandarin_script(
@@ -18,29 +24,53 @@ def convert_mandarin_script(
     normalize: bool = True,
     taiwanize: bool = True,
     improved_one_to_many: bool = False,
-    ner_list: list | None = None,
+    ner_list: list | EntityMatcher | None = None,
     include_dicts: dict | None = None,
     exclude_lists: dict | None = None,
     openai_key: str | None = None,
+    **options,
 ) -> str:
-    """Convert text between different Chinese scripts."""
-    converter = ScriptConverter(
-        sentence=sentence,
-        target_script=target_script,
-        modernize=modernize,
-        normalize=normalize,
-        taiwanize=taiwanize,
-        improved_one_to_many=improved_one_to_many,
-        ner_list=ner_list,
-        include_dicts=include_dicts,
-        exclude_lists=exclude_lists,
-        openai_key=openai_key,
+    """Convert text between different Chinese scripts.
+
+    Thin wrapper over a shared `ConversionEngine`, so dictionaries and tries are only compiled the first time a
+    combination of options is used. Further keyword `options` are an `observer`, a `result_cache` and the other
+    `EngineOptions` fields, such as `batch_one_to_many`, `disambiguation_cache` and `openai_backend`.
+    `disambiguation_cache` (a `DisambiguationCache` or the path of its database) lets improved mode reuse earlier
+    answers for the same character in the same context instead of asking OpenAI. `openai_backend` replaces the OpenAI
+    API, e.g. with a `FakeBackend` for offline benchmarks. Compile large `ner_list`s into an `EntityMatcher` once and
+    pass that instead. `observer` is called with a `ConversionEvent` for every step and sub-stage, e.g. a
+    `StepTimings` collecting timings over many calls. With a `result_cache`, a text already converted with the same
+    options is answered from the cache without running the pipeline (or calling `observer`).
+    """
+    observer: Observer | None = options.pop("observer", None)
+    result_cache: ResultCache | None = options.pop("result_cache", None)
+    engine_options = {
+        "target_script": target_script,
+        "modernize": modernize,
+        "normalize": normalize,
+        "taiwanize": taiwanize,
+        "improved_one_to_many": improved_one_to_many,
+        "include_dicts": include_dicts,
+        "exclude_lists": exclude_lists,
+        "openai_key": openai_key,
+        **options,
+    }
+    if result_cache is None:
+        return get_engine(**engine_options).convert(sentence, ner_list, observer)
+    return result_cache.get_or_convert(
+        sentence,
+        (engine_key(**engine_options), ner_key(ner_list)),
+        lambda text: get_engine(**engine_options).convert(text, ner_list, observer),
     )
-    return converter.convert()
 
 
 class ScriptConverter:
-    """Base class for script conversion operations."""
+    """Base class for script conversion operations.
+
+    An `observer` keyword option, when given, is called with a `ConversionEvent` for each dictionary load, step and
+    sub-stage. A converter holds the state of the one sentence it was created for; to convert from several threads,
+    share a `ConversionEngine` instead.
+    """
 
     def __init__(
         self,
@@ -50,22 +80,32 @@ class ScriptConverter:
         normalize: bool = True,
         taiwanize: bool = True,
         improved_one_to_many: bool = False,
-        ner_list: list | None = None,
+        ner_list: list | EntityMatcher | None = None,
         include_dicts: dict | None = None,
         exclude_lists: dict | None = None,
         openai_key: str | None = None,
+        **options,
     ):
+        self.observer: Observer | None = options.pop("observer", None)
+        if options:
+            msg = f"Unexpected keyword arguments: {', '.join(options)}"
+            raise TypeError(msg)
         self.loader = DictionaryLoader()
         self.include_dicts = include_dicts or {}
         self.exclude_lists = exclude_lists or {}
         self.dicts: dict[str, dict] = {}
         self.improved_one_to_many = improved_one_to_many
+        # Placeholders standing in for masked named entities, restored after conversion
+        self.placeholders: dict[int, str] = {}
+        if getattr(ner_list, "masking", False):
+            sentence, self.placeholders = ner_list.mask(sentence)
+            ner_list = None
         self.sentence = sentence
 
         self.openai_client = initialize_openai_client(openai_key, improved_one_to_many)
 
         # Get NER indexes if list provided
-        self.ner_indexes = ReplacementUtils.get_ner_indexes(sentence, ner_list) if ner_list else []
+        self.ner_indexes = entity_spans(sentence, ner_list)
 
         # Get conversion sequence based on flags
         self.conversion_sequence = get_conversion_steps(
@@ -85,25 +125,27 @@ class ScriptConverter:
             sentence, current_indexes = self.apply_conversion(
                 sentence,
                 CONVERSION_CONFIGS[config_name],
-                current_indexes,  # current_indexes is already a list from __init__
+                current_indexes,
             )
-        return sentence
+        return sentence.translate(self.placeholders)
 
     def apply_conversion(
         self,
         sentence: str,
         config: ConversionConfig,
-        current_indexes: list[tuple[int, int]] | None = None,
-    ) -> tuple[str, list[tuple[int, int]] | None]:
+        current_indexes: ProtectedSpans | None = None,
+    ) -> tuple[str, ProtectedSpans]:
         """Apply a conversion configuration to a sentence."""
         if config.name not in self.dicts:
             self.load_config(config)
 
+        observer, name = self.observer, config.name
+        step_start = perf_counter() if observer else 0.0
         dicts = self.dicts[config.name]
         new_sentence = sentence
 
         # Always include NER indexes in current_indexes
-        current_indexes = list(set(current_indexes or []) | set(self.ner_indexes))
+        current_indexes = ProtectedSpans.of(current_indexes).union(self.ner_indexes)
 
         # Determine if we should reset indexes for script conversion steps
         should_reset_indexes = config.name in SCRIPT_RESET_STEPS and dicts["phrase"] and any(dicts["phrase"].values())
@@ -111,28 +153,43 @@ class ScriptConverter:
 
         # Apply phrase conversion if dictionary is not empty
         if dicts["phrase"] and any(dicts["phrase"].values()):
+            start = perf_counter() if observer else 0.0
             operation = ConversionOperation(new_sentence, phrase_indexes)
             new_sentence, phrase_indexes = operation.apply_phrase_conversion(dicts["phrase"])
+            if observer:
+                emit_operation(observer, "phrase", name, start, operation, new_sentence, phrase_indexes)
 
         # Apply one-to-many conversion if available
         if dicts["one2many"] and (config.openai_func or config.opencc_config):
+            start = perf_counter() if observer else 0.0
             operation = ConversionOperation(new_sentence, phrase_indexes)
             new_sentence = operation.apply_one_to_many_conversion(
                 dicts["one2many"],
                 self.improved_one_to_many,
                 config.openai_func if self.improved_one_to_many else None,
-                config.opencc_config if not self.improved_one_to_many else None,
+                # Also the fallback for steps without a prompt, as in `ConversionEngine`
+                config.opencc_config,
                 self.openai_client if self.improved_one_to_many else None,
             )
+            if observer:
+                emit_operation(observer, "one2many", name, start, operation, new_sentence, phrase_indexes)
 
         # Apply character conversion
+        start = perf_counter() if observer else 0.0
         operation = ConversionOperation(new_sentence, phrase_indexes)
-        return operation.apply_char_conversion(dicts["char"])
+        result = operation.apply_char_conversion(dicts["char"])
+        if observer:
+            emit_operation(observer, "char", name, start, operation, result[0], phrase_indexes)
+            emit(observer, "step", name, step_start, sentence, result[0], phrase_indexes)
+        return result
 
     def load_config(self, config: ConversionConfig) -> None:
         """Load dictionaries for a conversion configuration."""
+        start = perf_counter() if self.observer else 0.0
         self.dicts[config.name] = self.loader.load_conversion_config(
             config,
             self.include_dicts,
             self.exclude_lists,
         )
+        if self.observer:
+            emit(self.observer, "load", config.name, start, "", "")
@@ -1,104 +1,212 @@
-from .helpers_2.conversion_helpers import apply_conversion_chain, convert_text
-from .helpers_2.dictionary_loader import load_conversion_dictionaries
-from .helpers_2.open_ai_prompts import (
-    initialize_openai_client,
-    openai_detaiwanize_one2many_mappings,
-    openai_modernize_simp_one2many_mappings,
-    openai_modernize_trad_one2many_mappings,
-    openai_normalize_simp_one2many_mappings,
-    openai_normalize_trad_one2many_mappings,
-    openai_s2t_one2many_mappings,
-    openai_t2s_one2many_mappings,
-    openai_taiwanize_one2many_mappings,
-)
-
-# Load dictionaries for each conversion type
-simp2simp_modernize = load_conversion_dictionaries("simp2simp", "modern_simp")
-trad2trad_modernize = load_conversion_dictionaries("trad2trad", "modern_trad")
-simp2simp_normalize = load_conversion_dictionaries("simp2simp", "norm_simp")
-trad2trad_normalize = load_conversion_dictionaries("trad2trad", "norm_trad")
-simp2trad = load_conversion_dictionaries("simp2trad", "s2t")
-trad2simp = load_conversion_dictionaries("trad2simp", "t2s")
-trad2tw = load_conversion_dictionaries("tw", "t2tw")
-tw2trad = load_conversion_dictionaries("tw", "tw2t")
-
-
-class MandarinConverter:
-    def __init__(self, openai_key=None, debug=False):
-        self.client = initialize_openai_client(openai_key)
-        self.debug = debug
-
-    def modernize_simplified(self, sentence):
-        return convert_text(
-            sentence, simp2simp_modernize, "s2t", openai_modernize_simp_one2many_mappings, self.client, self.debug
-        )
-
-    def modernize_traditional(self, sentence):
-        return convert_text(
-            sentence, trad2trad_modernize, "t2s", openai_modernize_trad_one2many_mappings, self.client, self.debug
-        )
-
-    def normalize_simplified(self, sentence):
-        return convert_text(
-            sentence, simp2simp_normalize, "s2t", openai_normalize_simp_one2many_mappings, self.client, self.debug
-        )
-
-    def normalize_traditional(self, sentence):
-        return convert_text(
-            sentence, trad2trad_normalize, "t2s", openai_normalize_trad_one2many_mappings, self.client, self.debug
-        )
-
-    def traditionalize(self, sentence):
-        return convert_text(sentence, simp2trad, "s2twp", openai_s2t_one2many_mappings, self.client, self.debug)
-
-    def simplify(self, sentence):
-        return convert_text(sentence, trad2simp, "tw2sp", openai_t2s_one2many_mappings, self.client, self.debug)
-
-    def taiwanize(self, sentence):
-        return convert_text(sentence, trad2tw, "t2tw", openai_taiwanize_one2many_mappings, self.client, self.debug)
-
-    def detaiwanize(self, sentence):
-        return convert_text(sentence, tw2trad, "tw2s", openai_detaiwanize_one2many_mappings, self.client, self.debug)
-
-    def convert_to_tw_trad(self, sentence, debug=False):
-        """Complete conversion pipeline to Taiwan traditional Chinese"""
-        major_steps = [
-            self.modernize_simplified,
-            self.normalize_simplified,
-            self.traditionalize,
-            self.modernize_traditional,
-            self.normalize_traditional,
-            self.taiwanize,
-        ]
-        if debug:
-            result, timings = apply_conversion_chain(sentence, major_steps, True)
-            return {"result": result, "timings": timings}
-        return apply_conversion_chain(sentence, major_steps, False)
-
-    def convert_to_simp(self, sentence, debug=False):
-        """Complete conversion pipeline to simplified Chinese"""
-        major_steps = [
-            self.modernize_traditional,
-            self.normalize_traditional,
-            self.detaiwanize,
-            self.simplify,
-            self.modernize_simplified,
-            self.normalize_simplified,
-        ]
-        if debug:
-            result, timings = apply_conversion_chain(sentence, major_steps, True)
-            return {"result": result, "timings": timings}
-        return apply_conversion_chain(sentence, major_steps, False)
-
-    def convert_script(self, sentence, target_script="", debug=None):
-        """High-level conversion method based on target script"""
-        # Use passed debug parameter if provided, otherwise fall back to instance-level debug
-        use_debug = self.debug if debug is None else debug
-
-        if use_debug:
-            if target_script == "to_tw_trad":
-                return self.convert_to_tw_trad(sentence, True)
-            return self.convert_to_simp(sentence, True)
-        if target_script == "to_tw_trad":
-            return self.convert_to_tw_trad(sentence)
-        return self.convert_to_simp(sentence)
+from functools import cache
+
+from .helpers.disambiguation_cache import as_disambiguation_cache, cached_token_func
+from .helpers_2.compiled_dictionaries import compile_dictionaries
+from .helpers_2.conversion_helpers import apply_conversion_chain, convert_text, convert_text_async
+from .helpers_2.dictionary_loader import load_conversion_dictionaries
+from .helpers_2.open_ai_prompts import (
+    OPENAI_MODEL,
+    initialize_async_openai_client,
+    initialize_openai_client,
+    openai_detaiwanize_one2many_mappings,
+    openai_modernize_simp_one2many_mappings,
+    openai_modernize_trad_one2many_mappings,
+    openai_normalize_simp_one2many_mappings,
+    openai_normalize_trad_one2many_mappings,
+    openai_s2t_one2many_mappings,
+    openai_t2s_one2many_mappings,
+    openai_taiwanize_one2many_mappings,
+)
+
+# Dictionaries for each conversion type, loaded on first access through the module `__getattr__` below
+_DICTIONARY_SOURCES = {
+    "simp2simp_modernize": ("simp2simp", "modern_simp"),
+    "trad2trad_modernize": ("trad2trad", "modern_trad"),
+    "simp2simp_normalize": ("simp2simp", "norm_simp"),
+    "trad2trad_normalize": ("trad2trad", "norm_trad"),
+    "simp2trad": ("simp2trad", "s2t"),
+    "trad2simp": ("trad2simp", "t2s"),
+    "trad2tw": ("tw", "t2tw"),
+    "tw2trad": ("tw", "tw2t"),
+}
+
+
+def __getattr__(name: str):
+    if name in _DICTIONARY_SOURCES:
+        dictionaries = load_conversion_dictionaries(*_DICTIONARY_SOURCES[name])
+        # Cache as a real module attribute so later lookups skip this hook
+        globals()[name] = dictionaries
+        return dictionaries
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
+
+
+def _dictionaries(name: str) -> dict:
+    return globals().get(name) or __getattr__(name)
+
+
+@cache
+def _compiled(name: str):
+    """Phrase matcher and translation tables for a set of dictionaries, compiled on first use."""
+    return compile_dictionaries(_dictionaries(name))
+
+
+# Dictionaries, OpenCC config and OpenAI prompt used by each conversion step
+_STEP_OPTIONS = {
+    "modernize_simplified": ("simp2simp_modernize", "s2t", openai_modernize_simp_one2many_mappings),
+    "modernize_traditional": ("trad2trad_modernize", "t2s", openai_modernize_trad_one2many_mappings),
+    "normalize_simplified": ("simp2simp_normalize", "s2t", openai_normalize_simp_one2many_mappings),
+    "normalize_traditional": ("trad2trad_normalize", "t2s", openai_normalize_trad_one2many_mappings),
+    "traditionalize": ("simp2trad", "s2twp", openai_s2t_one2many_mappings),
+    "simplify": ("trad2simp", "tw2sp", openai_t2s_one2many_mappings),
+    "taiwanize": ("trad2tw", "t2tw", openai_taiwanize_one2many_mappings),
+    "detaiwanize": ("tw2trad", "tw2s", openai_detaiwanize_one2many_mappings),
+}
+TW_TRAD_STEPS = (
+    "modernize_simplified",
+    "normalize_simplified",
+    "traditionalize",
+    "modernize_traditional",
+    "normalize_traditional",
+    "taiwanize",
+)
+SIMP_STEPS = (
+    "modernize_traditional",
+    "normalize_traditional",
+    "detaiwanize",
+    "simplify",
+    "modernize_simplified",
+    "normalize_simplified",
+)
+
+
+class MandarinConverter:
+    def __init__(
+        self,
+        openai_key=None,
+        debug=False,
+        concurrency=8,
+        max_retries=5,
+        disambiguation_cache=None,
+        openai_backend=None,
+    ):
+        self.client = initialize_openai_client(openai_key, openai_backend)
+        self.openai_backend = openai_backend
+        self.disambiguation_cache = as_disambiguation_cache(disambiguation_cache)
+        self.debug = debug
+        self.openai_key = openai_key
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self._async_client = None
+
+    def _convert_step(self, step, sentence):
+        dictionaries_name, opencc_config, openai_function = _STEP_OPTIONS[step]
+        if self.disambiguation_cache is not None:
+            openai_function = cached_token_func(
+                self.disambiguation_cache, openai_function, openai_function.__name__, OPENAI_MODEL
+            )
+        return convert_text(
+            sentence,
+            _dictionaries(dictionaries_name),
+            opencc_config,
+            openai_function,
+            self.client,
+            self.debug,
+            _compiled(dictionaries_name),
+        )
+
+    def modernize_simplified(self, sentence):
+        return self._convert_step("modernize_simplified", sentence)
+
+    def modernize_traditional(self, sentence):
+        return self._convert_step("modernize_traditional", sentence)
+
+    def normalize_simplified(self, sentence):
+        return self._convert_step("normalize_simplified", sentence)
+
+    def normalize_traditional(self, sentence):
+        return self._convert_step("normalize_traditional", sentence)
+
+    def traditionalize(self, sentence):
+        return self._convert_step("traditionalize", sentence)
+
+    def simplify(self, sentence):
+        return self._convert_step("simplify", sentence)
+
+    def taiwanize(self, sentence):
+        return self._convert_step("taiwanize", sentence)
+
+    def detaiwanize(self, sentence):
+        return self._convert_step("detaiwanize", sentence)
+
+    def convert_to_tw_trad(self, sentence, debug=False):
+        """Complete conversion pipeline to Taiwan traditional Chinese"""
+        major_steps = [getattr(self, step) for step in TW_TRAD_STEPS]
+        if debug:
+            result, timings = apply_conversion_chain(sentence, major_steps, True)
+            return {"result": result, "timings": timings}
+        return apply_conversion_chain(sentence, major_steps, False)
+
+    def convert_to_simp(self, sentence, debug=False):
+        """Complete conversion pipeline to simplified Chinese"""
+        major_steps = [getattr(self, step) for step in SIMP_STEPS]
+        if debug:
+            result, timings = apply_conversion_chain(sentence, major_steps, True)
+            return {"result": result, "timings": timings}
+        return apply_conversion_chain(sentence, major_steps, False)
+
+    def convert_script(self, sentence, target_script="", debug=None):
+        """High-level conversion method based on target script"""
+        # Use passed debug parameter if provided, otherwise fall back to instance-level debug
+        use_debug = self.debug if debug is None else debug
+
+        if use_debug:
+            if target_script == "to_tw_trad":
+                return self.convert_to_tw_trad(sentence, True)
+            return self.convert_to_simp(sentence, True)
+        if target_script == "to_tw_trad":
+            return self.convert_to_tw_trad(sentence)
+        return self.convert_to_simp(sentence)
+
+    @property
+    def async_client(self):
+        """Concurrency-limited async OpenAI client for the async methods, created on first use."""
+        if self._async_client is None and (self.openai_key or self.openai_backend):
+            from .helpers.async_client import LimitedAsyncClient  # noqa: PLC0415 - loads asyncio
+
+            self._async_client = LimitedAsyncClient(
+                initialize_async_openai_client(self.openai_key, self.openai_backend), self.concurrency, self.max_retries
+            )
+        return self._async_client
+
+    @async_client.setter
+    def async_client(self, client):
+        self._async_client = client
+
+    async def convert_script_async(self, sentence, target_script=""):
+        """Coroutine version of `convert_script` without debug timings.
+
+        The OpenAI requests for the ambiguous characters of each step are sent concurrently, at most `concurrency`
+        at a time, and the result is the same as the serial `convert_script`.
+        """
+        steps = TW_TRAD_STEPS if target_script == "to_tw_trad" else SIMP_STEPS
+        for step in steps:
+            dictionaries_name, opencc_config, openai_function = _STEP_OPTIONS[step]
+            sentence = await convert_text_async(
+                sentence,
+                _dictionaries(dictionaries_name),
+                opencc_config,
+                openai_function,
+                self.async_client,
+                self.disambiguation_cache,
+                _compiled(dictionaries_name),
+            )
+        return sentence
+
+    async def convert_many_async(self, sentences, target_script=""):
+        """Convert several sentences concurrently with `convert_script_async`, returning results in input order."""
+        import asyncio  # noqa: PLC0415 - only loaded by async callers
+
+        return list(
+            await asyncio.gather(*(self.convert_script_async(sentence, target_script) for sentence in sentences))
+        )
@@ -0,0 +1,389 @@
+"""src/mandarin_tamer/server.py - `mandarin-tamer-serve` local conversion microservice"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from http import HTTPStatus
+
+from .helpers.conversion_engine import get_engine
+
+
+DEFAULT_PORT = 8765
+DEFAULT_MAX_BATCH_SIZE = 64
+DEFAULT_MAX_BATCH_DELAY = 0.005
+# Request bodies above this are refused with 413, so one client can't make the server buffer arbitrary amounts
+MAX_BODY_BYTES = 16 * 2**20
+# Latencies of this many recent requests are kept for the percentiles on /stats
+LATENCY_WINDOW = 10_000
+TARGET_SCRIPTS = ("zh_cn", "zh_tw")
+STEP_FLAGS = ("modernize", "normalize", "taiwanize")
+
+
+class RequestError(Exception):
+    """A client error, answered with `status` and the message."""
+
+    def __init__(self, message: str, status: HTTPStatus = HTTPStatus.BAD_REQUEST):
+        super().__init__(message)
+        self.status = status
+
+
+def request_options(request: dict) -> tuple[dict, list | None]:
+    """The engine options and `ner_list` of a /convert request, raising `RequestError` for invalid values."""
+    engine_options = {"target_script": request.get("target_script", "zh_cn")}
+    if engine_options["target_script"] not in TARGET_SCRIPTS:
+        msg = f"target_script must be one of {', '.join(TARGET_SCRIPTS)}"
+        raise RequestError(msg)
+    for flag in STEP_FLAGS:
+        value = request.get(flag, True)
+        # Strings like "false" would otherwise count as true
+        if not isinstance(value, bool):
+            msg = f"{flag} must be true or false"
+            raise RequestError(msg)
+        engine_options[flag] = value
+    ner_list = request.get("ner_list") or None
+    if ner_list is not None and not (isinstance(ner_list, list) and all(isinstance(n, str) for n in ner_list)):
+        msg = "ner_list must be a list of strings"
+        raise RequestError(msg)
+    return engine_options, ner_list
+
+
+def convert_batch(engine_options: dict, ner_list: list | None, texts: list[str]) -> list[str]:
+    """Convert one micro-batch in a pool worker, converting identical texts once.
+
+    Engines come from the worker's `engine_cache`, so they stay warm between batches.
+    """
+    engine = get_engine(**engine_options)
+    by_text = {text: engine.convert(text, ner_list) for text in dict.fromkeys(texts)}
+    return [by_text[text] for text in texts]
+
+
+# Has one-to-many characters in both scripts, so warming up also loads the OpenCC converters
+WARM_UP_TEXT = "后面的头发後面的頭髮"
+
+
+def warm_engines(option_sets: list[dict]) -> None:
+    """Pool initializer building the engines expected to be used, so the first requests don't pay for loading."""
+    for engine_options in option_sets:
+        get_engine(**engine_options).convert(WARM_UP_TEXT)
+
+
+class MicroBatcher:
+    """Coalesces concurrent requests into batches handed to `run_batch` together.
+
+    A batch is sent as soon as it holds `max_batch_size` texts, or `max_batch_delay` seconds after its first request
+    arrived, whichever comes first. Each request gets back the results for its own texts, in order; a request with
+    more texts than `max_batch_size` is sent on its own.
+    """
+
+    def __init__(
+        self,
+        run_batch: Callable[[list[str]], Awaitable[list[str]]],
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_batch_delay: float = DEFAULT_MAX_BATCH_DELAY,
+    ):
+        self.run_batch = run_batch
+        self.max_batch_size = max_batch_size
+        self.max_batch_delay = max_batch_delay
+        self._pending: list[tuple[list[str], asyncio.Future]] = []
+        self._pending_texts = 0
+        self._timer: asyncio.TimerHandle | None = None
+        # Strong references, as the event loop only keeps weak ones to running tasks
+        self._tasks: set[asyncio.Task] = set()
+
+    async def submit(self, texts: list[str]) -> list[str]:
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((texts, future))
+        self._pending_texts += len(texts)
+        if self._pending_texts >= self.max_batch_size:
+            self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.max_batch_delay, self.flush)
+        return await future
+
+    def flush(self) -> None:
+        """Send whatever is pending now."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, self._pending, self._pending_texts = self._pending, [], 0
+        task = asyncio.get_running_loop().create_task(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: list[tuple[list[str], asyncio.Future]]) -> None:
+        try:
+            results = await self.run_batch([text for texts, _ in batch for text in texts])
+        except Exception as error:  # noqa: BLE001 - handed to every waiting request instead
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        position = 0
+        for texts, future in batch:
+            if not future.done():
+                future.set_result(results[position : position + len(texts)])
+            position += len(texts)
+
+
+@dataclass
+class ServerStats:
+    """Request, batch and latency counters since the server started, reported by `/stats`."""
+
+    started: float = field(default_factory=time.perf_counter)
+    requests: int = 0
+    errors: int = 0
+    texts: int = 0
+    characters: int = 0
+    batches: int = 0
+    batch_texts: int = 0
+    convert_seconds: float = 0.0
+    latencies: deque = field(default_factory=lambda: deque(maxlen=LATENCY_WINDOW))
+
+    def add_batch(self, texts: list[str], seconds: float) -> None:
+        self.batches += 1
+        self.batch_texts += len(texts)
+        self.convert_seconds += seconds
+
+    def add_request(self, texts: list[str], seconds: float) -> None:
+        self.requests += 1
+        self.texts += len(texts)
+        self.characters += sum(map(len, texts))
+        self.latencies.append(seconds)
+
+    def snapshot(self) -> dict:
+        uptime = time.perf_counter() - self.started
+        latencies = sorted(self.latencies)
+
+        def percentile(fraction: float) -> float:
+            return latencies[min(int(fraction * len(latencies)), len(latencies) - 1)] * 1000 if latencies else 0.0
+
+        return {
+            "uptime_seconds": uptime,
+            "requests": self.requests,
+            "errors": self.errors,
+            "texts": self.texts,
+            "characters": self.characters,
+            "batches": self.batches,
+            "mean_batch_size": self.batch_texts / self.batches if self.batches else 0.0,
+            "requests_per_second": self.requests / uptime if uptime else 0.0,
+            "chars_per_second": self.characters / uptime if uptime else 0.0,
+            "convert_seconds": self.convert_seconds,
+            "latency_ms": {
+                "mean": sum(latencies) / len(latencies) * 1000 if latencies else 0.0,
+                "p50": percentile(0.5),
+                "p95": percentile(0.95),
+                "p99": percentile(0.99),
+                "max": latencies[-1] * 1000 if latencies else 0.0,
+            },
+        }
+
+
+class ConversionServer:
+    """HTTP/1.1 conversion service that keeps engines warm and converts concurrent requests in micro-batches.
+
+    `POST /convert` takes a JSON object with `text` (a string) or `texts` (a list of strings) and optionally
+    `target_script`, `modernize`, `normalize`, `taiwanize` and `ner_list`, and answers with `text` or `texts`.
+    Requests with the same options share a `MicroBatcher`; batches run on `executor` (a thread pool by default,
+    since engines are safe to share between threads). `GET /stats` reports the `ServerStats` and `GET /health`
+    answers once the server is up. One-to-many characters are resolved with OpenCC, so the service never needs
+    network access.
+    """
+
+    def __init__(
+        self,
+        executor: Executor | None = None,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_batch_delay: float = DEFAULT_MAX_BATCH_DELAY,
+    ):
+        self.executor = executor or ThreadPoolExecutor(os.cpu_count() or 1)
+        self.max_batch_size = max_batch_size
+        self.max_batch_delay = max_batch_delay
+        self.stats = ServerStats()
+        self._batchers: dict[tuple, MicroBatcher] = {}
+        self._server: asyncio.Server | None = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT) -> int:
+        """Start listening and return the bound port (useful with `port=0`)."""
+        self._server = await asyncio.start_server(self.handle_connection, host, port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        # Wait for the workers off the event loop, or a process pool can be torn down under its management thread
+        await asyncio.to_thread(self.executor.shutdown, wait=True, cancel_futures=True)
+
+    def batcher(self, engine_options: dict, ner_list: list | None) -> MicroBatcher:
+        key = (tuple(sorted(engine_options.items())), tuple(ner_list) if ner_list else None)
+        batcher = self._batchers.get(key)
+        if batcher is None:
+
+            async def run_batch(texts: list[str]) -> list[str]:
+                start = time.perf_counter()
+                loop = asyncio.get_running_loop()
+                results = await loop.run_in_executor(self.executor, convert_batch, engine_options, ner_list, texts)
+                self.stats.add_batch(texts, time.perf_counter() - start)
+                return results
+
+            batcher = self._batchers[key] = MicroBatcher(run_batch, self.max_batch_size, self.max_batch_delay)
+        return batcher
+
+    async def convert(self, body: bytes) -> dict:
+        start = time.perf_counter()
+        try:
+            request = json.loads(body)
+        except (UnicodeDecodeError, json.JSONDecodeError) as error:
+            msg = f"Invalid JSON: {error}"
+            raise RequestError(msg) from error
+        if not isinstance(request, dict):
+            msg = "Expected a JSON object"
+            raise RequestError(msg)
+        single = "text" in request
+        texts = [request["text"]] if single else request.get("texts")
+        if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+            msg = "Expected 'text' (a string) or 'texts' (a list of strings)"
+            raise RequestError(msg)
+        engine_options, ner_list = request_options(request)
+        results = await self.batcher(engine_options, ner_list).submit(texts) if texts else []
+        self.stats.add_request(texts, time.perf_counter() - start)
+        return {"text": results[0]} if single else {"texts": results}
+
+    async def dispatch(self, method: str, path: str, body: bytes) -> tuple[HTTPStatus, dict]:
+        routes = {"/convert": "POST", "/stats": "GET", "/health": "GET"}
+        if path not in routes:
+            return HTTPStatus.NOT_FOUND, {"error": f"No route {path}"}
+        if method != routes[path]:
+            return HTTPStatus.METHOD_NOT_ALLOWED, {"error": f"Use {routes[path]} for {path}"}
+        if path == "/convert":
+            return await self.handle_convert(body)
+        if path == "/stats":
+            return HTTPStatus.OK, self.stats.snapshot()
+        return HTTPStatus.OK, {"status": "ok"}
+
+    async def handle_convert(self, body: bytes) -> tuple[HTTPStatus, dict]:
+        try:
+            return HTTPStatus.OK, await self.convert(body)
+        except RequestError as error:
+            self.stats.errors += 1
+            return error.status, {"error": str(error)}
+        except Exception as error:  # noqa: BLE001 - reported to the client rather than dropping the connection
+            self.stats.errors += 1
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": repr(error)}
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve requests on one connection, keeping it open between requests unless the client asks otherwise."""
+        try:
+            while request_line := await reader.readline():
+                method, path, version = request_line.decode("latin-1").split(maxsplit=2)
+                headers = {}
+                while (line := await reader.readline()) not in {b"\r\n", b"\n", b""}:
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                if length > MAX_BODY_BYTES:
+                    await self.respond(writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "Body too large"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+                status, payload = await self.dispatch(method, path.split("?", 1)[0], body)
+                keep_alive = version.strip() == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                await self.respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            # Malformed request line or headers, or the client went away mid-request
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def respond(writer: asyncio.StreamWriter, status: HTTPStatus, payload: dict, keep_alive: bool) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode()
+        head = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="mandarin-tamer-serve",
+        description="Serve Mandarin script conversion over HTTP, batching concurrent requests.",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument(
+        "-w", "--workers", type=int, default=None, help="Worker processes or threads (default: one per CPU)"
+    )
+    parser.add_argument(
+        "--threads",
+        action="store_true",
+        help="Convert on a thread pool sharing one set of engines instead of worker processes (best on free-threaded "
+        "builds or a single CPU)",
+    )
+    parser.add_argument("--max-batch-size", type=int, default=DEFAULT_MAX_BATCH_SIZE, help="Texts per micro-batch")
+    parser.add_argument(
+        "--max-batch-delay",
+        type=float,
+        default=DEFAULT_MAX_BATCH_DELAY * 1000,
+        help="Milliseconds to wait for more requests before sending a batch",
+    )
+    parser.add_argument(
+        "--warm",
+        nargs="*",
+        choices=TARGET_SCRIPTS,
+        default=list(TARGET_SCRIPTS),
+        help="Target scripts whose default engines are built at startup",
+    )
+    return parser
+
+
+async def serve(args: argparse.Namespace) -> None:
+    warm = [{"target_script": target_script} for target_script in args.warm]
+    workers = args.workers or os.cpu_count() or 1
+    if args.threads:
+        warm_engines(warm)
+        executor: Executor = ThreadPoolExecutor(workers)
+    else:
+        # Imported here like in BatchConverter, only when worker processes are actually used
+        from concurrent.futures import ProcessPoolExecutor  # noqa: PLC0415
+
+        executor = ProcessPoolExecutor(workers, initializer=warm_engines, initargs=(warm,))
+        # Workers are only started on demand, so start them all (and build their engines) before taking requests
+        await asyncio.gather(*(asyncio.wrap_future(executor.submit(warm_engines, [])) for _ in range(workers)))
+    server = ConversionServer(executor, args.max_batch_size, args.max_batch_delay / 1000)
+    port = await server.start(args.host, args.port)
+    print(f"Serving on http://{args.host}:{port} with {workers} {'threads' if args.threads else 'processes'}")
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = build_parser().parse_args(argv)
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        print("Stopped", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+# tests/async_disambiguation_test.py
+import asyncio
+import json
+import re
+from types import SimpleNamespace
+import pytest
+
+from mandarin_tamer import ConversionEngine, convert_many_async
+from mandarin_tamer.helpers.async_client import LimitedAsyncClient
+from mandarin_tamer.mandarin_tamer_2 import MandarinConverter
+
+
+TEXTS = [
+    "我了解他的头发很干净，里面后台",
+    "也许我会马上放弃然后去打盹。",
+    "我了解他的头发很干净，里面后台",
+    "这只猫的头发干了以后又发了。",
+]
+
+
+def answer(content: str) -> str:
+    """Answer that depends on the sentence sent, so results reassembled out of order would show."""
+    if content.startswith("{"):
+        request = json.loads(content)
+        replacements = [
+            {"index": entry["index"], "best_replacement_token": entry["options"][len(request["sentence"]) % 2]}
+            for entry in request["ambiguous_tokens"]
+            if len(entry["options"]) > 1
+        ]
+        return json.dumps({"replacements": replacements}, ensure_ascii=False)
+    sentence, token = re.match(r"\w+: (.*); token: (.); mapping_dictionary", content, re.DOTALL).groups()
+    return json.dumps({"best_replacement_token": token if len(sentence) % 2 else "〇"}, ensure_ascii=False)
+
+
+def completion(content: str):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=answer(content)))])
+
+
+class FakeClient:
+    def __init__(self):
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, messages, **_kwargs):
+        return completion(messages[-1]["content"])
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+class FakeAsyncClient:
+    """Async stand-in that tracks how many requests overlap and can fail the first `rate_limited` calls."""
+
+    def __init__(self, rate_limited: int = 0, error: Exception | None = None):
+        self.rate_limited = rate_limited
+        self.error = error
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, messages, **_kwargs):
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            # Vary response times so requests finish out of order
+            await asyncio.sleep(0.001 * (self.calls % 3))
+            if self.error:
+                raise self.error
+            if self.rate_limited:
+                self.rate_limited -= 1
+                raise RateLimitError
+            return completion(messages[-1]["content"])
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.mark.parametrize("batch_one_to_many", [False, True])
+def test_convert_many_async_matches_serial_conversion(batch_one_to_many):
+    engine = ConversionEngine(
+        target_script="zh_tw", improved_one_to_many=True, openai_key="test", batch_one_to_many=batch_one_to_many
+    )
+    engine.openai_client = FakeClient()
+    expected = [engine.convert(text) for text in TEXTS]
+
+    client = FakeAsyncClient()
+    results = asyncio.run(
+        convert_many_async(
+            TEXTS,
+            target_script="zh_tw",
+            improved_one_to_many=True,
+            openai_key="test",
+            batch_one_to_many=batch_one_to_many,
+            concurrency=2,
+            client=client,
+        )
+    )
+    assert results == expected
+    assert client.max_in_flight == 2
+
+
+def test_limited_client_retries_rate_limits_only():
+    request = {"messages": [{"role": "user", "content": '{"sentence": "", "ambiguous_tokens": []}'}]}
+
+    client = LimitedAsyncClient(FakeAsyncClient(rate_limited=2), max_retries=2, base_delay=0)
+    asyncio.run(client.chat.completions.create(**request))
+    assert (client.client.calls, client.retries) == (3, 2)
+
+    client = LimitedAsyncClient(FakeAsyncClient(rate_limited=3), max_retries=2, base_delay=0)
+    with pytest.raises(RateLimitError):
+        asyncio.run(client.chat.completions.create(**request))
+
+    client = LimitedAsyncClient(FakeAsyncClient(error=ValueError("bad request")), base_delay=0)
+    with pytest.raises(ValueError, match="bad request"):
+        asyncio.run(client.chat.completions.create(**request))
+    assert client.client.calls == 1
+
+
+def test_mandarin_converter_async_matches_serial_conversion():
+    converter = MandarinConverter(openai_key="test", concurrency=3)
+    converter.client = FakeClient()
+    expected = [converter.convert_script(text, "to_tw_trad") for text in TEXTS]
+
+    fake = FakeAsyncClient()
+    converter.async_client = LimitedAsyncClient(fake, concurrency=3)
+    assert asyncio.run(converter.convert_many_async(TEXTS, "to_tw_trad")) == expected
+    assert fake.max_in_flight == 3
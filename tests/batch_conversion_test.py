@@ -0,0 +1,56 @@
+# tests/batch_conversion_test.py
+from mandarin_tamer import BatchStats, ConversionEngine, convert_mandarin_script, convert_many
+from mandarin_tamer.helpers.conversion_config import CONVERSION_CONFIGS
+from mandarin_tamer.helpers.conversion_operations import DictionaryLoader
+from mandarin_tamer.helpers.dictionary_compiler import MappedDictionary, is_artifact_fresh
+from mandarin_tamer.helpers.shared_dictionaries import dictionary_paths, shared_dictionary_root
+
+
+TEXTS = [
+    "今天是６月１８号，也是Muiriel的生日！",
+    "也许我会马上放弃然后去打盹。",
+    "今天是６月１８号，也是Muiriel的生日！",
+    "简体字",
+    "也许我会马上放弃然后去打盹。",
+]
+
+
+def test_convert_many_matches_single_conversions_in_order():
+    expected = [convert_mandarin_script(text, target_script="zh_tw") for text in TEXTS]
+    assert convert_many(TEXTS, target_script="zh_tw") == expected
+
+
+def test_convert_many_process_pool_and_stats():
+    expected = [convert_mandarin_script(text, target_script="zh_tw", ner_list=["简体"]) for text in TEXTS]
+    results, stats = convert_many(
+        TEXTS, target_script="zh_tw", ner_list=["简体"], workers=2, chunksize=1, return_stats=True
+    )
+    assert results == expected
+    assert isinstance(stats, BatchStats)
+    assert (stats.texts, stats.unique_texts, stats.workers) == (5, 3, 2)
+    assert stats.duplicate_rate == 0.4
+    assert stats.texts_per_second > 0
+
+
+def test_convert_many_empty_input():
+    assert convert_many([], workers=4) == []
+
+
+def test_process_pool_workers_share_mapped_dictionaries():
+    texts = [f"{text}{index}" for index in range(20) for text in TEXTS[:2]]
+    expected = convert_many(texts, target_script="zh_tw")
+    results, stats = convert_many(texts, target_script="zh_tw", workers=2, chunksize=8, return_stats=True)
+    assert results == expected
+    assert convert_many(texts, target_script="zh_tw", workers=2, shared_dictionaries=False) == expected
+    assert sum(worker.texts for worker in stats.worker_stats) == stats.unique_texts == 40
+    assert sum(worker.chunks for worker in stats.worker_stats) == 5
+    assert all(worker.chars_per_second > 0 for worker in stats.worker_stats)
+    assert stats.rss_bytes > 0
+
+
+def test_shared_dictionary_root_has_fresh_artifacts_for_every_config():
+    root = shared_dictionary_root(CONVERSION_CONFIGS)
+    assert all(is_artifact_fresh(path) for path in dictionary_paths(CONVERSION_CONFIGS, root))
+    engine = ConversionEngine(target_script="zh_cn", loader=DictionaryLoader(root))
+    assert all(isinstance(step.phrase_dict, MappedDictionary) for step in engine.steps)
+    assert [engine.convert(text) for text in TEXTS] == [convert_mandarin_script(text) for text in TEXTS]
@@ -0,0 +1,125 @@
+# tests/batched_disambiguation_test.py
+import json
+import re
+from types import SimpleNamespace
+
+from mandarin_tamer import ConversionEngine
+from mandarin_tamer.helpers.conversion_operations import ConversionOperation
+from mandarin_tamer.helpers.open_ai_prompts import (
+    S2T_INTENT,
+    openai_one2many_batch_mappings,
+    parse_batch_response,
+)
+from mandarin_tamer.helpers.opencc_utils import get_opencc
+from mandarin_tamer.mandarin_tamer import ScriptConverter
+
+
+class FakeClient:
+    """Stands in for the OpenAI client, answering batched requests with `answer(request)`."""
+
+    def __init__(self, answer):
+        self.answer = answer
+        self.requests = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, messages, **_kwargs):
+        request = json.loads(messages[-1]["content"])
+        self.requests.append(request)
+        content = self.answer(request)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def last_option_answer(request):
+    replacements = [
+        {"index": entry["index"], "best_replacement_token": entry["options"][-1]}
+        for entry in request["ambiguous_tokens"]
+    ]
+    return json.dumps({"replacements": replacements}, ensure_ascii=False)
+
+
+MAPPING = {"发": ["發", "髮"], "干": ["乾", "幹"], "后": ["後", "后"]}
+
+
+def batch_func(sentence, ambiguous, client):
+    return openai_one2many_batch_mappings(S2T_INTENT, sentence, ambiguous, client)
+
+
+def test_one_request_resolves_every_position():
+    client = FakeClient(last_option_answer)
+    operation = ConversionOperation("头发很干，后来又发了")
+    result = operation.apply_one_to_many_conversion(MAPPING, True, None, "s2twp", client, batch_func)
+    assert result == "头髮很幹，后来又髮了"
+    assert len(client.requests) == 1
+    assert [entry["index"] for entry in client.requests[0]["ambiguous_tokens"]] == [1, 3, 5, 8]
+
+
+def test_partial_and_malformed_answers_fall_back_to_opencc():
+    sentence = "头发很干，后来又发了"
+    opencc = get_opencc("s2twp").convert(sentence)
+
+    partial = FakeClient(
+        lambda _: json.dumps(
+            {
+                "replacements": [
+                    {"index": 1, "best_replacement_token": "髮"},
+                    {"index": 3, "best_replacement_token": "X"},
+                ]
+            }
+        )
+    )
+    result = ConversionOperation(sentence).apply_one_to_many_conversion(
+        MAPPING, True, None, "s2twp", partial, batch_func
+    )
+    assert result[1] == "髮"
+    assert [result[i] for i in (3, 5, 8)] == [opencc[i] for i in (3, 5, 8)]
+
+    broken = FakeClient(lambda _: "not json")
+    result = ConversionOperation(sentence).apply_one_to_many_conversion(
+        MAPPING, True, None, "s2twp", broken, batch_func
+    )
+    assert [result[i] for i in (1, 3, 5, 8)] == [opencc[i] for i in (1, 3, 5, 8)]
+
+
+def test_parse_batch_response_ignores_bad_entries():
+    ambiguous = [(0, "发", ["發", "髮"]), (2, "干", ["乾", "幹"])]
+    response = json.dumps(
+        {
+            "replacements": [
+                {"index": 0, "best_replacement_token": "髮"},
+                {"index": "2"},
+                "junk",
+                {"index": 9, "best_replacement_token": "發"},
+            ]
+        }
+    )
+    assert parse_batch_response(response, ambiguous) == {0: "髮"}
+    assert parse_batch_response('["not", "an", "object"]', ambiguous) == {}
+    assert parse_batch_response(None, ambiguous) == {}
+
+
+def test_engine_sends_at_most_one_request_per_step():
+    engine = ConversionEngine(
+        target_script="zh_tw", improved_one_to_many=True, openai_key="test", batch_one_to_many=True
+    )
+    engine.openai_client = FakeClient(last_option_answer)
+    engine.convert("我了解他的头发很干净，里面后台")
+    steps_with_prompts = sum(1 for step in engine.steps if step.config.openai_func and step.one2many_dict)
+    assert 1 <= len(engine.openai_client.requests) <= steps_with_prompts
+
+
+def keep_token(messages, **_):
+    """Answers a per-token request with the token itself."""
+    token = re.search(r"; token: (.+?); ", messages[-1]["content"]).group(1)
+    content = json.dumps({"best_replacement_token": token})
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def test_script_converter_falls_back_to_opencc_for_steps_without_a_prompt():
+    # The taiwanize step has a one-to-many table (舖) but no prompt
+    text = "这家舖子的头发"
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=keep_token)))
+    converter = ScriptConverter(text, "zh_tw", improved_one_to_many=True, openai_key="test")
+    converter.openai_client = client
+    engine = ConversionEngine(target_script="zh_tw", improved_one_to_many=True, openai_key="test")
+    engine.openai_client = client
+    assert converter.convert() == engine.convert(text)
@@ -0,0 +1,55 @@
+# tests/char_table_test.py
+import random
+
+from mandarin_tamer import ConversionEngine
+from mandarin_tamer.helpers.char_table import CharTable
+
+
+def sequential_replace(sentence: str, char_dict: dict) -> str:
+    """The char stage as it was before translation tables."""
+    for char in [char for char in char_dict if char in sentence]:
+        sentence = sentence.replace(char, char_dict[char])
+    return sentence
+
+
+def test_chains_follow_dictionary_order_and_original_sentence():
+    char_dict = {"a": "b", "b": "c", "c": "a", "x": "yz", "y": "Y"}
+    table = CharTable(char_dict)
+    assert set(table.chains) == {"a", "b", "x"}
+    # "b" is only rewritten when it was in the original sentence; "c" -> "a" is never revisited
+    for sentence in ["a", "ab", "abc", "ca", "xy", "x", "axbyc"]:
+        assert table.translate(sentence) == sequential_replace(sentence, char_dict), sentence
+
+
+def test_matches_sequential_replace_on_random_chained_dictionaries():
+    rng = random.Random(7)
+    alphabet = "abcdefghij"
+    for _ in range(300):
+        keys = rng.sample(alphabet, rng.randint(1, len(alphabet)))
+        char_dict = {key: "".join(rng.choices(alphabet, k=rng.randint(0, 3))) for key in keys}
+        table = CharTable(char_dict)
+        for _ in range(10):
+            sentence = "".join(rng.choices(alphabet + "XYZ", k=rng.randint(0, 12)))
+            assert table.translate(sentence) == sequential_replace(sentence, char_dict), (char_dict, sentence)
+
+
+def test_multi_character_keys_fall_back_to_sequential_replace():
+    char_dict = {"ab": "x", "x": "y"}
+    assert CharTable(char_dict).sequential
+    assert CharTable(char_dict).translate("abx") == sequential_replace("abx", char_dict) == "yy"
+
+
+def test_bundled_char_dictionaries_match_sequential_replace():
+    for target_script in ("zh_tw", "zh_cn"):
+        for step in ConversionEngine(target_script=target_script).steps:
+            chained = "".join(step.char_table.chains)
+            sentence = chained + "".join(step.char_dict[key] for key in step.char_table.chains) + "今天天气很好"
+            assert step.char_table.translate(sentence) == sequential_replace(sentence, step.char_dict)
+
+
+def test_long_texts_take_the_scanning_route_with_the_same_output():
+    char_dict = {"a": "b", "b": "c", "x": "yz"}
+    table = CharTable(char_dict)
+    assert table.scan_threshold < 100
+    sentence = "abxy" * 100
+    assert table.translate(sentence) == sequential_replace(sentence, char_dict)
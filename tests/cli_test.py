@@ -0,0 +1,123 @@
+# tests/cli_test.py
+import json
+import pytest
+
+from mandarin_tamer import convert_mandarin_script, convert_stream
+from mandarin_tamer.cli import main
+
+
+SENTENCES = ["也许我会马上放弃然后去打盹。", "简体字", "今天是６月１８号，也是Muiriel的生日！"]
+
+
+def to_tw(text: str) -> str:
+    return convert_mandarin_script(text, target_script="zh_tw")
+
+
+def test_cli_converts_selected_csv_and_tsv_columns(tmp_path):
+    csv_path = tmp_path / "rows.csv"
+    csv_path.write_text("id,sentence\n" + "".join(f'{i},"{s}"\n' for i, s in enumerate(SENTENCES)), encoding="utf-8")
+    tsv_path = tmp_path / "rows.tsv"
+    tsv_path.write_text("".join(f"{s}\t{i}\n" for i, s in enumerate(SENTENCES)), encoding="utf-8")
+
+    main([str(csv_path), "-o", str(tmp_path / "out"), "-t", "zh_tw", "-c", "sentence", "--batch-size", "2", "-q"])
+    main([str(tsv_path), "-o", str(tmp_path / "out"), "-t", "zh_tw", "--no-header", "-w", "2", "-q"])
+
+    csv_lines = (tmp_path / "out" / "rows_zh_tw.csv").read_text(encoding="utf-8").splitlines()
+    assert csv_lines == ["id,sentence"] + [f"{i},{to_tw(s)}" for i, s in enumerate(SENTENCES)]
+    tsv_lines = (tmp_path / "out" / "rows_zh_tw.tsv").read_text(encoding="utf-8").splitlines()
+    assert tsv_lines == [f"{to_tw(s)}\t{i}" for i, s in enumerate(SENTENCES)]
+
+
+def test_cli_converts_jsonl_fields_and_text_files(tmp_path):
+    jsonl_path = tmp_path / "records.jsonl"
+    jsonl_path.write_text(
+        "".join(json.dumps({"text": s, "n": i}, ensure_ascii=False) + "\n" for i, s in enumerate(SENTENCES)),
+        encoding="utf-8",
+    )
+    text_path = tmp_path / "book.txt"
+    text = "\n".join(SENTENCES * 20)
+    text_path.write_text(text, encoding="utf-8")
+
+    main([str(jsonl_path), str(text_path), "-o", str(tmp_path / "out"), "-t", "zh_tw", "--chunk-size", "30", "-q"])
+
+    records = [json.loads(line) for line in (tmp_path / "out" / "records_zh_tw.jsonl").open(encoding="utf-8")]
+    assert records == [{"text": to_tw(s), "n": i} for i, s in enumerate(SENTENCES)]
+    assert (tmp_path / "out" / "book_zh_tw.txt").read_text(encoding="utf-8") == to_tw(text)
+
+
+def test_cli_reads_named_entities_from_a_file(tmp_path):
+    text_path = tmp_path / "names.txt"
+    text_path.write_text("\n".join(SENTENCES), encoding="utf-8")
+    ner_path = tmp_path / "ner.txt"
+    ner_path.write_text("马上\n简体\n", encoding="utf-8")
+
+    for flags in ([], ["--mask-entities"]):
+        main([str(text_path), "-o", str(tmp_path / "out"), "-t", "zh_tw", "--ner-file", str(ner_path), *flags, "-q"])
+        converted = (tmp_path / "out" / "names_zh_tw.txt").read_text(encoding="utf-8")
+        assert converted == convert_mandarin_script(
+            "\n".join(SENTENCES), target_script="zh_tw", ner_list=["马上", "简体"]
+        )
+
+
+def test_cli_keeps_line_endings_and_non_object_records(tmp_path):
+    for name, content in [
+        ("lf.csv", "sentence\n简体字\n"),
+        ("crlf.csv", "sentence\r\n简体字\r\n"),
+        ("crlf.tsv", "sentence\tn\r\n简体字\t1\r\n后面\t2\r\n"),
+    ]:
+        (tmp_path / name).write_bytes(content.encode("utf-8"))
+    jsonl_path = tmp_path / "mixed.jsonl"
+    jsonl_path.write_text('["简体字"]\n{"text": "简体字"}\n"简体字"\n', encoding="utf-8")
+
+    inputs = [str(tmp_path / name) for name in ("lf.csv", "crlf.csv", "crlf.tsv", "mixed.jsonl")]
+    main([*inputs, "-o", str(tmp_path / "out"), "-t", "zh_tw", "-q"])
+
+    out = tmp_path / "out"
+    assert (out / "lf_zh_tw.csv").read_bytes().decode("utf-8") == f"sentence\n{to_tw('简体字')}\n"
+    assert (out / "crlf_zh_tw.csv").read_bytes().decode("utf-8") == f"sentence\r\n{to_tw('简体字')}\r\n"
+    tsv = (out / "crlf_zh_tw.tsv").read_bytes().decode("utf-8")
+    assert tsv == f"sentence\tn\r\n{to_tw('简体字')}\t1\r\n{to_tw('后面')}\t2\r\n"
+    records = [json.loads(line) for line in (out / "mixed_zh_tw.jsonl").open(encoding="utf-8")]
+    assert records == [["简体字"], {"text": to_tw("简体字")}, "简体字"]
+
+
+def test_cli_writes_unconverted_jsonl_lines_verbatim(tmp_path):
+    lines = [
+        '{"text":  "简体字", "n": 1}\r\n',
+        "\r\n",
+        '{"text": "\\u7e41\\u9ad4", "n":2}\r\n',
+        "[1, 2]\n",
+        '{"other": "简体字"}',
+    ]
+    jsonl_path = tmp_path / "records.jsonl"
+    jsonl_path.write_bytes("".join(lines).encode("utf-8"))
+
+    main([str(jsonl_path), "-o", str(tmp_path / "out"), "-t", "zh_tw", "-q"])
+
+    converted = json.dumps({"text": to_tw("简体字"), "n": 1}, ensure_ascii=False) + "\r\n"
+    assert to_tw("繁體") == "繁體"
+    assert (tmp_path / "out" / "records_zh_tw.jsonl").read_bytes().decode("utf-8") == converted + "".join(lines[1:])
+
+
+def test_cli_text_output_matches_convert_stream(tmp_path):
+    text_path = tmp_path / "chained.txt"
+    text_path.write_text("寧願" + "".join(SENTENCES) * 10 + "宁", encoding="utf-8")
+
+    main([str(text_path), "-o", str(tmp_path / "out"), "--chunk-size", "40", "-w", "2", "-q"])
+
+    expected = "".join(convert_stream(text_path, target_script="zh_cn", chunk_size=40))
+    assert (tmp_path / "out" / "chained_zh_cn.txt").read_text(encoding="utf-8") == expected
+
+
+def test_cli_failure_leaves_previous_output_in_place(tmp_path):
+    csv_path = tmp_path / "rows.csv"
+    csv_path.write_text("id,sentence\n1,简体字\n", encoding="utf-8")
+    output_path = tmp_path / "out" / "rows_zh_tw.csv"
+    output_path.parent.mkdir()
+    output_path.write_text("previous", encoding="utf-8")
+
+    with pytest.raises(SystemExit, match="missing"):
+        main([str(csv_path), "-o", str(tmp_path / "out"), "-t", "zh_tw", "-c", "missing", "-q"])
+
+    assert output_path.read_text(encoding="utf-8") == "previous"
+    assert [path.name for path in output_path.parent.iterdir()] == ["rows_zh_tw.csv"]
@@ -0,0 +1,84 @@
+# tests/compiled_dictionaries_test.py
+import csv
+import random
+from pathlib import Path
+
+from mandarin_tamer import mandarin_tamer_2
+from mandarin_tamer.helpers_2.compiled_dictionaries import CharReplacer, PhraseReplacer, compile_dictionaries
+from mandarin_tamer.mandarin_tamer_2 import MandarinConverter
+
+
+SENTENCE_CSV = Path(__file__).parent / "sentence_csvs" / "simp_tatoeba_sentences.csv"
+
+
+def substring_replace(sentence: str, phrase_dictionary: dict) -> str:
+    """The v2 phrase step as it was before compiled matchers."""
+    sentence_length = len(sentence)
+    phrases = sorted(
+        [
+            sentence[i : i + length]
+            for i in range(sentence_length)
+            for length in range(1, 6)
+            if i + length <= sentence_length
+        ],
+        key=lambda x: (-len(x), x),
+    )
+    for phrase in phrases:
+        if phrase in phrase_dictionary:
+            sentence = sentence.replace(phrase, phrase_dictionary[phrase])
+    return sentence
+
+
+def per_char_replace(sentence: str, one_to_one_dictionary: dict) -> str:
+    """The v2 char step as it was before translation tables."""
+    for char in sentence:
+        if char in one_to_one_dictionary:
+            sentence = sentence.replace(char, one_to_one_dictionary[char])
+    return sentence
+
+
+def test_phrase_replacer_replays_cascading_replacements():
+    # "bc" overlaps the earlier "ab" replacement but its "b" survives; "xc" only exists after it
+    phrase_dictionary = {"ab": "xb", "bc": "y", "xy": "z", "cd": "cdcd", "abcdef": "unused"}
+    for sentence in ["abc", "abcd", "cdcd", "ab,bc", "abcdef"]:
+        expected = substring_replace(sentence, phrase_dictionary)
+        assert PhraseReplacer(phrase_dictionary).convert(sentence) == expected, sentence
+
+
+def test_replacers_match_the_original_steps_on_random_dictionaries():
+    rng = random.Random(3)
+    alphabet = "abcde"
+    for _ in range(500):
+        phrases = {
+            "".join(rng.choices(alphabet, k=rng.randint(1, 4))): "".join(
+                rng.choices(alphabet + "xy", k=rng.randint(0, 4))
+            )
+            for _ in range(rng.randint(1, 8))
+        }
+        chars = {rng.choice(alphabet): "".join(rng.choices(alphabet + "y", k=rng.randint(0, 3))) for _ in range(4)}
+        phrase_replacer, char_replacer = PhraseReplacer(phrases), CharReplacer(chars)
+        for _ in range(5):
+            sentence = "".join(rng.choices(alphabet + "x,", k=rng.randint(0, 25)))
+            assert phrase_replacer.convert(sentence) == substring_replace(sentence, phrases), (phrases, sentence)
+            assert char_replacer.convert(sentence) == per_char_replace(sentence, chars), (chars, sentence)
+
+
+def test_bundled_dictionaries_match_the_original_steps():
+    with SENTENCE_CSV.open(encoding="utf-8") as file:
+        sentences = [row[0] for row in list(csv.reader(file))[1:201]]
+    for name in ("simp2trad", "trad2simp", "simp2simp_normalize", "trad2trad_normalize"):
+        dictionaries = getattr(mandarin_tamer_2, name)
+        compiled = compile_dictionaries(dictionaries)
+        chained = "".join(compiled.chars.chained)
+        for sentence in [*sentences, chained + chained[::-1], "".join(sentences[:50])]:
+            assert compiled.phrases.convert(sentence) == substring_replace(sentence, dictionaries["phrases"])
+            assert compiled.chars.convert(sentence) == per_char_replace(sentence, dictionaries["chars"])
+
+
+def test_long_texts_repeating_chained_keys_convert_like_the_original_step():
+    # Every later occurrence of a self-mapped key like 污 or 虫 is another replacement the chained keys go through
+    chars = mandarin_tamer_2.trad2simp["chars"]
+    replacer = CharReplacer(chars)
+    for sentence in ["污水和泄漏。" * 2000, "那隻虫很小。" * 3000, "這個棱角。" * 2000]:
+        assert replacer.convert(sentence) == per_char_replace(sentence, chars)
+    assert MandarinConverter().convert_script("污水和泄漏。" * 2000, "to_simp") == "污水和泄漏。" * 2000
@@ -0,0 +1,65 @@
+# tests/conversion_engine_test.py
+import pytest
+
+from mandarin_tamer import (
+    ConversionEngine,
+    EngineOptions,
+    convert_mandarin_script,
+    convert_many,
+    convert_many_threaded,
+    get_engine,
+)
+from mandarin_tamer.helpers import engine_key
+from mandarin_tamer.mandarin_tamer import ScriptConverter
+
+
+SENTENCES = [
+    "今天是６月１８号，也是Muiriel的生日！",
+    "也许我会马上放弃然后去打盹。",
+    "你應該去睡覺了吧。",
+    "剛才我的麥克風沒起作用，不知道為什麼。",
+]
+
+
+def test_engine_matches_script_converter():
+    for target_script in ("zh_tw", "zh_cn"):
+        engine = ConversionEngine(target_script=target_script)
+        for sentence in SENTENCES:
+            expected = ScriptConverter(sentence=sentence, target_script=target_script).convert()
+            assert engine.convert(sentence) == expected
+
+
+def test_engine_protects_ner_list():
+    engine = ConversionEngine(target_script="zh_tw")
+    assert engine.convert("简体字", ner_list=["简体"]) == "简体字"
+
+
+def test_default_engine_is_shared():
+    assert get_engine(target_script="zh_tw") is get_engine(target_script="zh_tw")
+    assert get_engine(target_script="zh_tw") is not get_engine(target_script="zh_cn")
+    assert convert_mandarin_script("简体字", target_script="zh_tw") == "簡體字"
+
+
+def test_compact_trie_backend_matches_default():
+    default = get_engine(target_script="zh_tw")
+    compact = get_engine(target_script="zh_tw", trie_backend="compact")
+    assert compact is not default
+    for sentence in SENTENCES:
+        assert compact.convert(sentence) == default.convert(sentence)
+
+
+def test_engine_options_are_validated_and_forwarded():
+    with pytest.raises(TypeError, match="taiwanise"):
+        get_engine(target_script="zh_tw", taiwanise=False)
+    with pytest.raises(TypeError, match="taiwanise"):
+        convert_many(["简体字"], target_script="zh_tw", taiwanise=False)
+    with pytest.raises(TypeError, match="taiwanise"):
+        ScriptConverter("简体字", "zh_tw", taiwanise=False)
+
+    engine = get_engine(target_script="zh_tw", taiwanize=False)
+    assert engine.options == EngineOptions(target_script="zh_tw", taiwanize=False)
+    assert engine_key(target_script="zh_tw", taiwanize=False) == engine.options.key()
+    expected = [engine.convert(sentence) for sentence in SENTENCES]
+    assert convert_many(SENTENCES, target_script="zh_tw", taiwanize=False) == expected
+    assert convert_many_threaded(SENTENCES, target_script="zh_tw", taiwanize=False, threads=2) == expected
+    assert [convert_mandarin_script(s, target_script="zh_tw", taiwanize=False) for s in SENTENCES] == expected
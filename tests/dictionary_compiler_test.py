@@ -0,0 +1,56 @@
+# tests/dictionary_compiler_test.py
+import json
+
+from mandarin_tamer.helpers.conversion_operations import DictionaryLoader
+from mandarin_tamer.helpers.dictionary_compiler import (
+    MappedDictionary,
+    artifact_path_for,
+    compile_dictionary,
+    is_artifact_fresh,
+    load_fresh_artifact,
+)
+
+
+def write_json(path, dictionary):
+    path.write_text(json.dumps(dictionary, ensure_ascii=False), encoding="utf-8")
+
+
+def test_artifact_round_trip_keeps_order_and_matcher(tmp_path):
+    phrases = {"马克思主义": "馬克思主義", "马克": "馬克", "学习": "學習"}
+    json_path = tmp_path / "s2t_phrases.json"
+    write_json(json_path, phrases)
+    compile_dictionary(json_path)
+
+    mapped = load_fresh_artifact(json_path)
+    assert isinstance(mapped, MappedDictionary)
+    assert list(mapped.items()) == list(phrases.items())
+    assert mapped["学习"] == "學習"
+    assert "学" not in mapped
+    assert mapped.trie.find_all_matches("马克思主义学习") == [(0, 2, "馬克"), (0, 5, "馬克思主義"), (5, 7, "學習")]
+
+
+def test_list_values_and_stale_artifacts(tmp_path):
+    one2many = {"了": ["了", "瞭"], "里": ["裡", "里"]}
+    json_path = tmp_path / "s2t_one2many.json"
+    write_json(json_path, one2many)
+    compile_dictionary(json_path)
+    assert is_artifact_fresh(json_path)
+    assert dict(load_fresh_artifact(json_path)) == one2many
+
+    write_json(json_path, {"了": ["了"]})
+    assert not is_artifact_fresh(json_path)
+    assert load_fresh_artifact(json_path) is None
+
+
+def test_loader_prefers_fresh_artifact(tmp_path):
+    (tmp_path / "tw").mkdir()
+    json_path = tmp_path / "tw" / "t2tw_chars.json"
+    write_json(json_path, {"裏": "裡"})
+    loader = DictionaryLoader(base_path=tmp_path)
+    assert isinstance(loader.load_dict("tw", "t2tw_chars.json"), dict)
+
+    compile_dictionary(json_path)
+    assert artifact_path_for(json_path).exists()
+    assert isinstance(loader.load_dict("tw", "t2tw_chars.json"), MappedDictionary)
+    json_loader = DictionaryLoader(base_path=tmp_path, use_artifacts=False)
+    assert isinstance(json_loader.load_dict("tw", "t2tw_chars.json"), dict)
@@ -0,0 +1,76 @@
+# tests/dictionary_overlay_test.py
+import random
+import pytest
+
+from mandarin_tamer import ConversionEngine
+from mandarin_tamer.helpers.char_table import CharTable
+from mandarin_tamer.helpers.conversion_operations import DictionaryLoader
+from mandarin_tamer.helpers.dictionary_overlay import OverlayDict, OverlayMatcher
+from mandarin_tamer.helpers.replacement_by_dictionary import ReplacementUtils
+from mandarin_tamer.mandarin_tamer import ScriptConverter
+
+
+def random_customization(rng: random.Random, alphabet: str, key_length: int = 1) -> tuple[dict, dict, list]:
+    def key() -> str:
+        return "".join(rng.choices(alphabet, k=rng.randint(1, key_length)))
+
+    base = {key(): "".join(rng.choices(alphabet, k=rng.randint(0, 2))) for _ in range(rng.randint(0, 8))}
+    include = {key(): "".join(rng.choices(alphabet, k=rng.randint(0, 2))) for _ in range(rng.randint(0, 3))}
+    exclude = [key() for _ in range(rng.randint(0, 3))]
+    return base, include, exclude
+
+
+def test_overlay_dict_behaves_like_the_merged_copy():
+    rng = random.Random(11)
+    for _ in range(300):
+        base, include, exclude = random_customization(rng, "abcdef", key_length=2)
+        merged = DictionaryLoader.merge_dicts(base, include, exclude)
+        overlay = OverlayDict(base, include, exclude)
+        assert list(overlay.items()) == list(merged.items())
+        assert len(overlay) == len(merged)
+        assert repr(overlay) == repr(merged)
+        for key in [*base, *include, *exclude]:
+            assert (key in overlay) == (key in merged)
+            assert overlay.get(key) == merged.get(key)
+
+
+def test_char_table_overlay_matches_compiling_the_merged_dictionary():
+    rng = random.Random(12)
+    for _ in range(500):
+        base, include, exclude = random_customization(rng, "abcdefgh")
+        merged = DictionaryLoader.merge_dicts(base, include, exclude)
+        overlay, fresh = CharTable(base).overlay(include, exclude), CharTable(merged)
+        assert (overlay.table, overlay.chains, overlay.char_dict) == (fresh.table, fresh.chains, fresh.char_dict)
+        sentence = "".join(rng.choices("abcdefghXY", k=10))
+        assert overlay.translate(sentence) == fresh.translate(sentence)
+
+
+@pytest.mark.parametrize("backend", ["aho_corasick", "compact"])
+def test_overlay_matcher_finds_the_merged_dictionary_matches(backend):
+    rng = random.Random(13)
+    for _ in range(300):
+        base, include, exclude = random_customization(rng, "abcd", key_length=3)
+        merged = ReplacementUtils.build_trie_from_dict(DictionaryLoader.merge_dicts(base, include, exclude), backend)
+        overlay = OverlayMatcher(ReplacementUtils.build_trie_from_dict(base, backend), include, exclude, backend)
+        text = "".join(rng.choices("abcde", k=15))
+        assert overlay.find_all_matches(text) == merged.find_all_matches(text)
+        assert list(overlay.iter_matches(text)) == list(merged.iter_matches(text))
+        assert list(overlay.iter_leftmost_longest(text)) == list(merged.iter_leftmost_longest(text))
+
+
+def test_customized_engines_share_the_base_steps():
+    include_dicts = {"traditionalize": {"台湾": "臺灣", "后": "後", "头发": "頭髮"}}
+    exclude_lists = {"traditionalize": ["发", "干净"]}
+    default = ConversionEngine(target_script="zh_tw")
+    customized = ConversionEngine(target_script="zh_tw", include_dicts=include_dicts, exclude_lists=exclude_lists)
+
+    s2t = next(index for index, step in enumerate(default.steps) if step.config.name == "s2t")
+    assert customized.steps[s2t].phrase_trie.base is default.steps[s2t].phrase_trie
+    assert customized.steps[s2t].phrase_dict.base is default.steps[s2t].phrase_dict
+    shared = [index for index, step in enumerate(customized.steps) if step is default.steps[index]]
+    assert shared == [index for index in range(len(default.steps)) if index != s2t]
+    for sentence in ["台湾的头发很干净，后来又发了。", "我了解他的头发很干净"]:
+        expected = ScriptConverter(
+            sentence, "zh_tw", include_dicts=include_dicts, exclude_lists=exclude_lists
+        ).convert()
+        assert customized.convert(sentence) == expected
@@ -0,0 +1,150 @@
+# tests/disambiguation_cache_test.py
+import asyncio
+import json
+import pickle
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+import pytest
+
+from mandarin_tamer import ConversionEngine, DisambiguationCache
+from mandarin_tamer.helpers.disambiguation_cache import (
+    cached_batch_func_async,
+    cached_token_func_async,
+    position_context,
+    token_context,
+)
+
+
+class CountingClient:
+    """Fake OpenAI client that always picks the last candidate it is offered and counts requests."""
+
+    def __init__(self):
+        self.requests = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, messages, **_kwargs):
+        self.requests += 1
+        content = messages[-1]["content"]
+        if content.startswith("{"):
+            entries = json.loads(content)["ambiguous_tokens"]
+            answer = {
+                "replacements": [{"index": e["index"], "best_replacement_token": e["options"][-1]} for e in entries]
+            }
+        else:
+            answer = {"best_replacement_token": content.split("; token: ")[1][0]}
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps(answer)))])
+
+
+TEXTS = ["我了解他的头发很干净，里面后台", "这只猫的头发干了以后又发了。"]
+
+
+@pytest.mark.parametrize("batch_one_to_many", [False, True])
+def test_engine_reuses_cached_answers_across_engines(tmp_path, batch_one_to_many):
+    cache_path = tmp_path / "cache.sqlite3"
+    results = []
+    clients = []
+    for _ in range(2):
+        engine = ConversionEngine(
+            target_script="zh_tw",
+            improved_one_to_many=True,
+            openai_key="test",
+            batch_one_to_many=batch_one_to_many,
+            disambiguation_cache=cache_path,
+        )
+        engine.openai_client = CountingClient()
+        results.append([engine.convert(text) for text in TEXTS])
+        clients.append(engine.openai_client)
+        engine.disambiguation_cache.close()
+
+    assert results[0] == results[1]
+    assert clients[0].requests > 0
+    assert clients[1].requests == 0
+    stats = DisambiguationCache(cache_path).stats()
+    assert stats.hits == stats.misses == stats.writes
+    assert stats.hit_rate == 0.5
+
+
+def test_ttl_and_max_entries(tmp_path):
+    cache = DisambiguationCache(tmp_path / "cache.sqlite3", max_entries=2)
+    for char in "甲乙丙":
+        cache.set(cache.key("step", char, char, ["a", "b"], "model"), char)
+    assert cache.stats().entries == 2
+    assert cache.stats().evictions == 1
+    assert cache.get(cache.key("step", "甲", "甲", ["a", "b"], "model")) is None
+    assert cache.get(cache.key("step", "丙", "丙", ["a", "b"], "model")) == "丙"
+
+    expired = DisambiguationCache(tmp_path / "cache.sqlite3", ttl=0)
+    assert expired.get(cache.key("step", "丙", "丙", ["a", "b"], "model")) is None
+
+
+def test_lookups_are_counted_in_memory_until_flushed(tmp_path):
+    cache = DisambiguationCache(tmp_path / "cache.sqlite3")
+    key = cache.key("step", "后", "后", ["後", "后"], "model")
+    cache.set(key, "後")
+    for _ in range(3):
+        cache.get(key)
+    cache.get("missing")
+    assert DisambiguationCache(cache.path).stats().hits == 0
+
+    cache.close()
+    stats = DisambiguationCache(cache.path).stats()
+    assert (stats.hits, stats.misses, stats.writes) == (3, 1, 1)
+
+
+async def answer_token(_sentence, _token, _mapping_dict, _client):
+    return "後"
+
+
+async def answer_batch(_sentence, ambiguous, _client):
+    return {index: "後" for index, _, _ in ambiguous}
+
+
+@pytest.mark.parametrize(
+    ("wrap", "func", "args", "expected"),
+    [
+        (cached_token_func_async, answer_token, ("后来", "后", {"后": ["後", "后"]}, None), "後"),
+        (cached_batch_func_async, answer_batch, ("后来", [(0, "后", ["後", "后"])], None), {0: "後"}),
+    ],
+)
+def test_async_lookups_keep_the_event_loop_running_while_the_database_is_locked(tmp_path, wrap, func, args, expected):
+    cache = DisambiguationCache(tmp_path / "cache.sqlite3")
+    cache.stats()
+    # Another process holding the write lock
+    blocker = sqlite3.connect(cache.path, isolation_level=None)
+    blocker.execute("BEGIN IMMEDIATE")
+    lookup = wrap(cache, func, "step", "model")
+
+    async def run():
+        task = asyncio.create_task(lookup(*args))
+        ticks = 0
+        while not task.done() and ticks < 5:
+            await asyncio.sleep(0.01)
+            ticks += 1
+        blocker.execute("COMMIT")
+        return ticks, await task
+
+    assert asyncio.run(run()) == (5, expected)
+    assert cache.stats().writes == 1
+
+
+def test_context_is_local_and_normalized():
+    assert position_context("一二三四五六七八九十后十九八七六五四三二一", 10, radius=2) == "九十后十九"
+    assert token_context("ＡＢ 后  Ｃ", "后", radius=3) == token_context("AB 后 C", "后", radius=3)
+    assert token_context("后来后面", "后", radius=1) == "后来\x00来后面"
+
+
+def write_answers(cache: DisambiguationCache, worker: int) -> None:
+    for i in range(50):
+        cache.set(cache.key("step", "后", f"{worker}-{i}", ["後", "后"], "model"), "後")
+        cache.get(cache.key("step", "后", f"{worker}-{i}", ["後", "后"], "model"))
+    cache.close()
+
+
+def test_cache_is_shared_between_processes(tmp_path):
+    cache = DisambiguationCache(tmp_path / "cache.sqlite3")
+    assert pickle.loads(pickle.dumps(cache)) == cache
+    with ProcessPoolExecutor(3) as pool:
+        list(pool.map(write_answers, [cache] * 3, range(3)))
+    stats = cache.stats()
+    assert (stats.entries, stats.writes, stats.hits) == (150, 150, 150)
@@ -0,0 +1,42 @@
+# tests/engine_cache_test.py
+from mandarin_tamer.helpers.engine_cache import EngineCache, fingerprint_payload
+
+
+class FakeEngine:
+    def __init__(self, size: int = 100):
+        self.size = size
+
+    def estimated_size(self) -> int:
+        return self.size
+
+
+def test_hits_misses_and_lru_eviction():
+    cache = EngineCache(max_entries=2)
+    first = cache.get_or_create(("a",), FakeEngine)
+    assert cache.get_or_create(("a",), FakeEngine) is first
+    cache.get_or_create(("b",), FakeEngine)
+    cache.get_or_create(("a",), FakeEngine)  # "a" is now most recently used
+    cache.get_or_create(("c",), FakeEngine)
+
+    assert ("a",) in cache
+    assert ("b",) not in cache
+    stats = cache.stats
+    assert (stats.hits, stats.misses, stats.evictions, stats.entries) == (2, 3, 1, 2)
+
+
+def test_byte_budget_keeps_newest_entry():
+    cache = EngineCache(max_entries=None, max_bytes=250)
+    cache.get_or_create(("a",), lambda: FakeEngine(100))
+    cache.get_or_create(("b",), lambda: FakeEngine(100))
+    cache.get_or_create(("c",), lambda: FakeEngine(100))
+    assert len(cache) == 2
+    assert cache.stats.estimated_bytes == 200
+
+    cache.get_or_create(("huge",), lambda: FakeEngine(1000))
+    assert len(cache) == 1
+    assert ("huge",) in cache
+
+
+def test_fingerprint_depends_on_content_not_identity():
+    assert fingerprint_payload({"simplify": {"著": "着"}}, {}) == fingerprint_payload({"simplify": {"著": "着"}}, {})
+    assert fingerprint_payload({"simplify": {"著": "着"}}, {}) != fingerprint_payload({}, {"simplify": ["著"]})
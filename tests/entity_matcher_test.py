@@ -0,0 +1,51 @@
+# tests/entity_matcher_test.py
+import pickle
+import random
+import pytest
+
+from mandarin_tamer import ConversionEngine, EntityMatcher, convert_mandarin_script, convert_many
+from mandarin_tamer.helpers.protected_spans import ProtectedSpans
+from mandarin_tamer.helpers.replacement_by_dictionary import ReplacementUtils
+
+
+TEXT = "我们在中国的头发很干净，中国头发干了。"
+
+
+@pytest.mark.parametrize("backend", ["aho_corasick", "compact"])
+def test_finds_the_same_spans_as_the_find_loop(backend):
+    rng = random.Random(5)
+    for _ in range(300):
+        entities = ["".join(rng.choices("abc", k=rng.randint(1, 3))) for _ in range(rng.randint(1, 6))]
+        text = "".join(rng.choices("abcd", k=20))
+        expected = ProtectedSpans(ReplacementUtils.get_ner_indexes(text, entities))
+        assert EntityMatcher(entities, backend).protected_spans(text) == expected, (entities, text)
+    # Occurrences of one entity don't overlap, just like repeated str.find calls
+    assert EntityMatcher(["aa"]).find_spans("aaa") == [(0, 2)]
+
+
+def test_matcher_protects_like_the_list_it_was_built_from():
+    entities = ["中国", "头发", "干净"]
+    matcher = EntityMatcher(entities)
+    engine = ConversionEngine(target_script="zh_tw")
+    assert engine.convert(TEXT, matcher) == engine.convert(TEXT, entities)
+    assert convert_many([TEXT, "头发"], target_script="zh_tw", ner_list=matcher) == [
+        convert_mandarin_script(text, target_script="zh_tw", ner_list=entities) for text in (TEXT, "头发")
+    ]
+    restored = pickle.loads(pickle.dumps(matcher))
+    assert restored.entities == matcher.entities
+    assert restored.find_spans(TEXT) == matcher.find_spans(TEXT)
+
+
+def test_masking_swaps_entities_for_unused_private_use_placeholders():
+    matcher = EntityMatcher(["中国", "头发"], masking=True)
+    text = "\ue000" + TEXT
+    masked, placeholders = matcher.mask(text)
+    assert "中国" not in masked
+    assert "头发" not in masked
+    assert masked.count("\ue000") == 1
+    assert masked.translate(placeholders) == text
+
+    converted = convert_mandarin_script(text, target_script="zh_tw", ner_list=matcher)
+    assert converted == "\ue000我們在中国的头发很乾淨，中国头发幹了。"
+    assert converted == convert_mandarin_script(text, target_script="zh_tw", ner_list=["中国", "头发"])
+    assert ConversionEngine(target_script="zh_tw").convert("没有实体", matcher) == "沒有實體"
@@ -0,0 +1,61 @@
+# tests/fake_backend_test.py
+import asyncio
+import pytest
+
+from mandarin_tamer import FakeBackend, convert_mandarin_script, convert_many_async
+from mandarin_tamer.helpers.disambiguation_backends import FakeRateLimitError, first_candidate_answer
+from mandarin_tamer.mandarin_tamer_2 import MandarinConverter
+
+
+TEXTS = ["我了解他的头发很干净，里面后台", "这只猫的头发干了以后又发了。"]
+
+
+def test_first_candidate_answers_both_prompt_shapes():
+    per_token = "sentence: 头发; token: 发; mapping_dictionary: {'了': ['了', '瞭'], '发': ['發', '髮']}"
+    assert first_candidate_answer(per_token) == ('{"best_replacement_token": "發"}', 1)
+    batched = '{"sentence": "头发", "ambiguous_tokens": [{"index": 1, "token": "发", "options": ["髮", "發"]}]}'
+    assert first_candidate_answer(batched) == ('{"replacements": [{"index": 1, "best_replacement_token": "髮"}]}', 1)
+
+
+@pytest.mark.parametrize("batch_one_to_many", [False, True])
+def test_fake_backend_stands_in_for_openai(batch_one_to_many):
+    backend = FakeBackend(latency=0.001, jitter=0.002)
+    results = [
+        convert_mandarin_script(
+            text,
+            target_script="zh_tw",
+            improved_one_to_many=True,
+            batch_one_to_many=batch_one_to_many,
+            openai_backend=backend,
+        )
+        for text in TEXTS
+    ]
+    # 干 -> 幹 is the first candidate, where OpenCC would have picked 乾
+    assert results[0] == "我瞭解他的頭髮很幹淨，裡面後臺"
+    assert backend.stats.calls > 0
+    assert backend.stats.errors == 0
+    assert 0.001 * backend.stats.calls <= backend.stats.seconds_waited <= 0.003 * backend.stats.calls
+
+
+def test_injected_errors_are_retried_on_the_async_path():
+    backend = FakeBackend(error_rate=1.0)
+    with pytest.raises(FakeRateLimitError):
+        convert_mandarin_script(TEXTS[0], target_script="zh_tw", improved_one_to_many=True, openai_backend=backend)
+
+    flaky = FakeBackend(error_rate=0.3, seed=1)
+    reliable = FakeBackend()
+    options = {"target_script": "zh_tw", "improved_one_to_many": True, "batch_one_to_many": True}
+    results = asyncio.run(convert_many_async(TEXTS, **options, openai_backend=flaky, retry_delay=0))
+    assert results == asyncio.run(convert_many_async(TEXTS, **options, openai_backend=reliable))
+    assert flaky.stats.errors > 0
+    assert flaky.stats.calls == reliable.stats.calls + flaky.stats.errors
+
+
+def test_mandarin_converter_accepts_a_backend():
+    backend = FakeBackend()
+    converter = MandarinConverter(openai_backend=backend)
+    expected = [converter.convert_script(text, "to_tw_trad") for text in TEXTS]
+    serial_calls = backend.stats.calls
+    assert serial_calls > 0
+    assert asyncio.run(converter.convert_many_async(TEXTS, "to_tw_trad")) == expected
+    assert backend.stats.calls == 2 * serial_calls
@@ -0,0 +1,15 @@
+# tests/file_conversion_test.py
+import types
+
+from mandarin_tamer.helpers.file_conversion import FileConversion
+
+
+def test_tsv_readers_stream_rows(tmp_path):
+    path = tmp_path / "one2many.tsv"
+    path.write_text("干\t幹 乾 干\n后\t後 后\nno tab\n", encoding="utf-8")
+    rows = FileConversion.iter_tsv(path, str.split)
+    assert isinstance(rows, types.GeneratorType)
+    assert next(rows) == ("干", ["幹", "乾", "干"])
+    assert list(rows) == [("后", ["後", "后"])]
+    assert FileConversion.tsv_1_to_first_many_to_dict(path) == {"干": "幹", "后": "後"}
+    assert dict(FileConversion.iter_tsv(path)) == FileConversion.tsv_1_to_1_to_dict(path)
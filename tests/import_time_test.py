@@ -0,0 +1,32 @@
+# tests/import_time_test.py
+import json
+import subprocess
+import sys
+
+
+HEAVY_MODULES = ("openai", "opencc", "concurrent.futures.process")
+
+
+def loaded_after(code: str) -> set[str]:
+    script = f"import json, sys\n{code}\nprint(json.dumps(sorted(sys.modules)))"
+    output = subprocess.run(  # noqa: S603 - runs this interpreter on a fixed import check
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    ).stdout
+    return set(json.loads(output))
+
+
+def test_package_import_skips_heavy_dependencies():
+    modules = loaded_after("import mandarin_tamer")
+    assert not modules & set(HEAVY_MODULES)
+
+
+def test_v2_dictionaries_load_on_first_access():
+    script = (
+        "import mandarin_tamer.mandarin_tamer_2 as v2\n"
+        "before = set(vars(v2))\n"
+        "v2.trad2simp\n"
+        "assert 'trad2simp' not in before and 'simp2trad' not in before\n"
+        "assert 'trad2simp' in vars(v2) and 'simp2trad' not in vars(v2)"
+    )
+    modules = loaded_after(script)
+    assert not modules & set(HEAVY_MODULES)
@@ -0,0 +1,56 @@
+# tests/instrumentation_test.py
+from mandarin_tamer import ConversionEngine, StepTimings, convert_mandarin_script
+from mandarin_tamer.helpers.conversion_config import CONVERSION_CONFIGS
+from mandarin_tamer.mandarin_tamer import ScriptConverter
+
+
+TEXT = "我们在中国的头发很干净，头发干了。"
+
+
+def test_script_converter_reports_loads_steps_and_stages():
+    events = []
+    converter = ScriptConverter(TEXT, "zh_tw", ner_list=["中国"], observer=events.append)
+    assert converter.convert() == ScriptConverter(TEXT, "zh_tw", ner_list=["中国"]).convert()
+
+    steps = [event.step for event in events if event.stage == "step"]
+    assert steps == [CONVERSION_CONFIGS[name].name for name in converter.conversion_sequence]
+    assert {event.step for event in events if event.stage == "load"} == set(steps)
+    s2t = {event.stage: event for event in events if event.step == "s2t"}
+    assert set(s2t) == {"load", "phrase", "one2many", "char", "step"}
+    assert s2t["phrase"].matches > 0
+    assert s2t["one2many"].matches >= 2  # 发 and 干 are ambiguous
+    assert s2t["char"].input_length == s2t["char"].output_length
+    # The step covers its sub-stages, from the step's input to the char stage's output
+    assert s2t["step"].seconds >= s2t["phrase"].seconds + s2t["one2many"].seconds + s2t["char"].seconds
+    assert s2t["step"].input_length == s2t["phrase"].input_length
+    assert all(event.protected_spans >= 1 for event in events if event.stage in ("phrase", "char", "step"))
+
+
+def test_engine_events_match_the_script_converter():
+    engine_events, converter_events = [], []
+    engine = ConversionEngine(target_script="zh_cn")
+    assert engine.convert(TEXT, observer=engine_events.append) == engine.convert(TEXT)
+    ScriptConverter(TEXT, "zh_cn", observer=converter_events.append).convert()
+
+    def summary(events):
+        return [(e.stage, e.step, e.input_length, e.output_length, e.matches, e.protected_spans) for e in events]
+
+    assert summary(engine_events) == summary(event for event in converter_events if event.stage != "load")
+
+
+def test_step_timings_adds_up_many_calls():
+    single = StepTimings()
+    convert_mandarin_script(TEXT, target_script="zh_tw", observer=single)
+    timings = StepTimings()
+    for _ in range(3):
+        convert_mandarin_script(TEXT, target_script="zh_tw", observer=timings)
+    s2t = timings.totals["s2t", "step"]
+    assert s2t.calls == 3
+    assert s2t.input_chars == 3 * len(TEXT)
+    assert timings.totals["s2t", "phrase"].matches == 3 * single.totals["s2t", "phrase"].matches > 0
+    stages = timings.by_stage()
+    assert stages["step"].calls == 3 * len(ConversionEngine(target_script="zh_tw").steps)
+    assert stages["step"].seconds >= stages["char"].seconds
+    assert "s2t" in timings.report()
+    timings.reset()
+    assert not timings.totals
@@ -0,0 +1,54 @@
+# tests/opencc_utils_test.py
+import asyncio
+
+from mandarin_tamer.helpers.conversion_operations import ConversionOperation
+from mandarin_tamer.helpers.opencc_utils import convert_positions, find_ambiguous_positions, get_opencc
+
+
+def test_get_opencc_is_cached_per_config():
+    assert get_opencc("s2twp") is get_opencc("s2twp")
+    assert get_opencc("s2twp") is not get_opencc("tw2sp")
+
+
+def test_convert_positions_matches_whole_sentence_conversion():
+    sentence = "我们去后面的公园发现了一只猫，头发很干净。" * 3
+    mapping_dict = {"后": ["後", "后"], "发": ["發", "髮"], "干": ["乾", "幹"], "只": ["隻", "只"]}
+    positions = find_ambiguous_positions(sentence, mapping_dict)
+    assert [sentence[position] for position in positions[:4]] == ["后", "发", "只", "发"]
+
+    expected = get_opencc("s2twp").convert(sentence)
+    converted = convert_positions(sentence, positions, "s2twp", context=4)
+    assert converted == {position: expected[position] for position in positions}
+
+
+def test_convert_positions_handles_length_changing_phrases():
+    # tw2sp turns 尼日利亞 into 尼日尔利亚, so characters after it no longer line up with the window's output
+    sentence = "尼日利亞曾經是英國的殖民地。"
+    assert len(get_opencc("tw2sp").convert(sentence)) != len(sentence)
+    positions = [sentence.index("經"), sentence.index("國")]
+    assert convert_positions(sentence, positions, "tw2sp") == {positions[0]: "经", positions[1]: "国"}
+
+
+def test_per_token_prompts_follow_the_mapping_order():
+    prompts = []
+
+    def per_token_func(sentence, char, mapping_dict, _client):
+        prompts.append((sentence, char))
+        return mapping_dict[char][-1]
+
+    async def per_token_func_async(sentence, char, mapping_dict, client):
+        return per_token_func(sentence, char, mapping_dict, client)
+
+    mapping_dict = {"发": ["發", "髮"], "干": ["乾", "幹"], "后": ["後", "后"]}
+    sentence = "后来头发很干"
+    expected_prompts = [("后来头发很干", "发"), ("后来头髮很干", "干"), ("后来头髮很幹", "后")]
+    result = ConversionOperation(sentence).apply_one_to_many_conversion(mapping_dict, True, per_token_func, "s2twp")
+    assert result == "后来头髮很幹"
+    # Each prompt sees the replacements made before it
+    assert prompts == expected_prompts
+
+    prompts.clear()
+    operation = ConversionOperation(sentence)
+    converted = asyncio.run(operation.apply_one_to_many_conversion_async(mapping_dict, per_token_func_async, "s2twp"))
+    assert converted == result
+    assert prompts == expected_prompts
@@ -0,0 +1,50 @@
+# tests/protected_spans_test.py
+import random
+
+from mandarin_tamer import convert_mandarin_script
+from mandarin_tamer.helpers.protected_spans import ProtectedSpans
+
+
+def overlaps(spans: list[tuple[int, int]], start: int, end: int) -> bool:
+    """The phrase stage's check before `ProtectedSpans`."""
+    return any(p_start <= start < p_end or p_start < end <= p_end for p_start, p_end in spans)
+
+
+def revert(sentence: str, new_sentence: str, spans: list[tuple[int, int]]) -> str:
+    """`revert_protected_indexes` before `ProtectedSpans`."""
+    for start, end in spans:
+        new_sentence = new_sentence[:start] + sentence[start:end] + new_sentence[end:]
+    return new_sentence
+
+
+def random_spans(rng: random.Random, length: int) -> list[tuple[int, int]]:
+    starts = [rng.randrange(length) for _ in range(rng.randint(0, 8))]
+    return [(start, min(length, start + rng.randint(0, 4))) for start in starts]
+
+
+def test_spans_are_sorted_and_merged():
+    spans = ProtectedSpans([(5, 7), (0, 2), (1, 3), (3, 4), (9, 9)])
+    assert list(spans) == [(0, 4), (5, 7)]
+    assert spans.union([(7, 8), (12, 14)]) == ProtectedSpans([(0, 4), (5, 8), (12, 14)])
+    assert spans.union([]) is spans
+    assert ProtectedSpans.of(spans) is spans
+
+
+def test_matches_the_list_of_tuples_it_replaced():
+    rng = random.Random(3)
+    for _ in range(500):
+        sentence = "".join(rng.choices("天气很好", k=12))
+        new_sentence = "".join(rng.choices("天氣很好", k=12))
+        first, second = random_spans(rng, 12), random_spans(rng, 12)
+        spans = ProtectedSpans(first)
+        assert spans.union(second) == ProtectedSpans(first + second)
+        assert spans.restore(sentence, new_sentence) == revert(sentence, new_sentence, first)
+        for start in range(12):
+            for end in range(start + 1, 13):
+                assert (spans.contains(start) or spans.contains(end - 1)) == overlaps(first, start, end)
+
+
+def test_named_entities_survive_every_step():
+    text = "我们在中国的头发" * 50
+    result = convert_mandarin_script(text, target_script="zh_tw", ner_list=["中国", "头发"])
+    assert result == "我們在中国的头发" * 50
@@ -0,0 +1,59 @@
+# tests/result_cache_test.py
+from mandarin_tamer import EntityMatcher, ResultCache, convert_mandarin_script
+
+
+LABELS = ["简体字", "后面的头发", "设置", "简体字", "设置", "后面的头发", "简体字"]
+
+
+def test_cached_results_match_and_repeats_hit():
+    cache = ResultCache()
+    results = [convert_mandarin_script(label, target_script="zh_tw", result_cache=cache) for label in LABELS]
+    assert results == [convert_mandarin_script(label, target_script="zh_tw") for label in LABELS]
+    stats = cache.stats
+    assert (stats.hits, stats.misses, stats.entries) == (4, 3, 3)
+    assert stats.hit_rate == 4 / 7
+    assert stats.characters == sum(
+        len(label) + len(convert_mandarin_script(label, target_script="zh_tw")) for label in LABELS[:3]
+    )
+
+
+def test_options_are_part_of_the_key():
+    cache = ResultCache()
+    text = "简体字"
+    convert_mandarin_script(text, target_script="zh_tw", result_cache=cache)
+    assert convert_mandarin_script(text, result_cache=cache) == convert_mandarin_script(text)
+    assert convert_mandarin_script(text, target_script="zh_tw", taiwanize=False, result_cache=cache) == (
+        convert_mandarin_script(text, target_script="zh_tw", taiwanize=False)
+    )
+    protected = convert_mandarin_script(text, target_script="zh_tw", ner_list=["简体"], result_cache=cache)
+    assert protected == convert_mandarin_script(text, target_script="zh_tw", ner_list=["简体"])
+    assert cache.stats.misses == 4
+
+    # Equal lists, matchers and custom dictionaries share entries
+    convert_mandarin_script(text, target_script="zh_tw", ner_list=EntityMatcher(["简体"]), result_cache=cache)
+    include = {"s2t": {"简体": "简體"}}
+    convert_mandarin_script(text, target_script="zh_tw", include_dicts=include, result_cache=cache)
+    convert_mandarin_script(text, target_script="zh_tw", include_dicts={"s2t": {"简体": "简體"}}, result_cache=cache)
+    assert (cache.stats.hits, cache.stats.misses) == (2, 5)
+
+
+def test_least_recently_used_entries_are_evicted_by_characters():
+    cache = ResultCache(max_characters=12, max_text_length=4)
+    calls = []
+
+    def convert(text: str) -> str:
+        calls.append(text)
+        return text.upper()
+
+    for text in ["aa", "bb", "cc", "aa", "dd", "bb"]:
+        assert cache.get_or_convert(text, "key", convert) == text.upper()
+    # Three entries of 2 + 2 characters fit; "dd" pushed out "bb", the least recently used
+    assert calls == ["aa", "bb", "cc", "dd", "bb"]
+    assert cache.stats.evictions == 2
+    assert cache.stats.characters <= 12
+
+    assert cache.get_or_convert("long text", "key", convert) == "LONG TEXT"
+    assert cache.stats.skipped == 1
+    assert len(cache) == 3
+    cache.clear()
+    assert (len(cache), cache.stats.characters) == (0, 0)
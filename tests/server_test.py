@@ -0,0 +1,77 @@
+# tests/server_test.py
+import asyncio
+import json
+
+from mandarin_tamer import convert_mandarin_script
+from mandarin_tamer.server import ConversionServer, MicroBatcher
+
+
+TEXTS = ["也许我会马上放弃然后去打盹。", "简体字", "今天是６月１８号，也是Muiriel的生日！", "后面的头发"]
+
+
+async def request(port: int, method: str, path: str, payload: dict | bytes | None = None) -> tuple[int, dict]:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = payload if isinstance(payload, bytes) else json.dumps(payload or {}, ensure_ascii=False).encode()
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: test\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode()
+        + body
+    )
+    status = int((await reader.readline()).split()[1])
+    response = await reader.read()
+    writer.close()
+    return status, json.loads(response.split(b"\r\n\r\n", 1)[1])
+
+
+def test_micro_batcher_coalesces_concurrent_requests():
+    batches = []
+
+    async def run_batch(texts: list[str]) -> list[str]:
+        batches.append(texts)
+        return [text.upper() for text in texts]
+
+    async def main() -> list[list[str]]:
+        batcher = MicroBatcher(run_batch, max_batch_size=4, max_batch_delay=0.05)
+        return await asyncio.gather(
+            batcher.submit(["a"]), batcher.submit(["b", "c"]), batcher.submit(["d", "e"]), batcher.submit(["f"])
+        )
+
+    assert asyncio.run(main()) == [["A"], ["B", "C"], ["D", "E"], ["F"]]
+    # The third request filled the first batch; the fourth waited for the delay
+    assert batches == [["a", "b", "c", "d", "e"], ["f"]]
+
+
+def test_server_converts_batches_and_reports_stats():
+    async def main() -> None:
+        server = ConversionServer(max_batch_delay=0.02)
+        port = await server.start(port=0)
+        try:
+            responses = await asyncio.gather(
+                *(request(port, "POST", "/convert", {"text": text, "target_script": "zh_tw"}) for text in TEXTS * 5),
+                request(port, "POST", "/convert", {"texts": TEXTS, "ner_list": ["简体"]}),
+            )
+            assert [body for _, body in responses[:-1]] == [
+                {"text": convert_mandarin_script(text, target_script="zh_tw")} for text in TEXTS * 5
+            ]
+            assert responses[-1] == (200, {"texts": [convert_mandarin_script(t, ner_list=["简体"]) for t in TEXTS]})
+
+            status, body = await request(port, "POST", "/convert", b"{not json")
+            assert status == 400
+            assert body["error"].startswith("Invalid JSON")
+            assert (await request(port, "POST", "/convert", {"texts": [1]}))[0] == 400
+            status, body = await request(port, "POST", "/convert", {"text": "简体字", "taiwanize": "false"})
+            assert (status, body) == (400, {"error": "taiwanize must be true or false"})
+            assert (await request(port, "GET", "/convert"))[0] == 405
+            assert (await request(port, "GET", "/missing"))[0] == 404
+            assert await request(port, "GET", "/health") == (200, {"status": "ok"})
+
+            status, stats = await request(port, "GET", "/stats")
+            assert status == 200
+            assert (stats["requests"], stats["texts"], stats["errors"]) == (21, 24, 3)
+            # Twenty concurrent single-text requests with the same options don't need twenty batches
+            assert stats["batches"] < 10
+            assert stats["latency_ms"]["p50"] > 0
+            assert stats["chars_per_second"] > 0
+        finally:
+            await server.close()
+
+    asyncio.run(main())
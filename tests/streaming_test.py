@@ -0,0 +1,79 @@
+# tests/streaming_test.py
+import io
+import pytest
+
+from mandarin_tamer import EntityMatcher, get_engine
+from mandarin_tamer.helpers.streaming import context_radius, convert_file, convert_stream
+
+
+TEXT = "今天是６月１８号，也是Muiriel的生日！\r\n也许我会马上放弃然后去打盹。\n剛才我的麥克風沒起作用。" * 12
+
+
+def test_stream_matches_full_conversion_across_chunk_boundaries():
+    engine = get_engine(target_script="zh_tw")
+    expected = engine.convert(TEXT)
+    for chunk_size in (5, 23, 64):
+        pieces = (TEXT[i : i + 7] for i in range(0, len(TEXT), 7))
+        assert "".join(convert_stream(pieces, engine=engine, chunk_size=chunk_size)) == expected
+
+
+def test_stream_accepts_binary_streams_and_protects_ner_list():
+    engine = get_engine(target_script="zh_tw")
+    assert context_radius(engine, ["Muiriel的生日"]) == context_radius(engine) + len("Muiriel的生日")
+    source = io.BytesIO(TEXT.encode("utf-8"))
+    converted = "".join(convert_stream(source, target_script="zh_tw", ner_list=["马上"], chunk_size=50))
+    assert converted == engine.convert(TEXT, ner_list=["马上"])
+
+
+def test_chained_char_replacements_resolve_within_their_window():
+    # 寧 -> 宁 -> 㝉 only takes its second step when 宁 is in the same window
+    filler = "今天天氣很好，我們去公園散步。" * 16
+    engine = get_engine(target_script="zh_cn")
+    near = "寧宁" + filler
+    far = "寧" + filler + "宁"
+    assert engine.convert(far)[0] == "㝉"
+    for chunk_size in (16, 32):
+        assert "".join(convert_stream(iter([near]), engine=engine, chunk_size=chunk_size)) == engine.convert(near)
+        streamed = "".join(convert_stream(iter([far]), engine=engine, chunk_size=chunk_size))
+        assert streamed == "宁" + engine.convert(far)[1:]
+    masking = EntityMatcher(["公園散步"], masking=True)
+    converted = "".join(convert_stream(iter([near]), engine=engine, ner_list=masking, chunk_size=16))
+    assert converted == engine.convert(near, ner_list=masking)
+
+
+def test_output_starts_before_the_input_ends():
+    chunks = ["寧願" + "今天天氣很好，我們去公園散步。" * 20] + ["我們去公園散步。" * 30] * 10
+    read = 0
+
+    def source():
+        nonlocal read
+        for chunk in chunks:
+            read += 1
+            yield chunk
+
+    first = next(convert_stream(source(), target_script="zh_cn", chunk_size=64))
+    assert first.startswith("宁愿")
+    assert read < len(chunks)
+
+
+def test_convert_file_writes_incrementally(tmp_path):
+    input_path = tmp_path / "input.txt"
+    output_path = tmp_path / "output.txt"
+    input_path.write_bytes(TEXT.encode("utf-8"))
+    written = convert_file(input_path, output_path, target_script="zh_tw", chunk_size=40)
+    assert written == len(TEXT)
+    assert output_path.read_bytes().decode("utf-8") == get_engine(target_script="zh_tw").convert(TEXT)
+
+
+def test_length_changing_dictionaries_fail_before_anything_is_written(tmp_path):
+    input_path = tmp_path / "input.txt"
+    output_path = tmp_path / "output.txt"
+    input_path.write_text(TEXT, encoding="utf-8")
+    output_path.write_text("previous", encoding="utf-8")
+    include = {"traditionalize": {"头发": "頭髮XX"}}
+    with pytest.raises(ValueError, match="头发"):
+        convert_stream(io.StringIO(TEXT), target_script="zh_tw", include_dicts=include)
+    with pytest.raises(ValueError, match="头发"):
+        convert_file(input_path, output_path, target_script="zh_tw", include_dicts=include)
+    assert output_path.read_text(encoding="utf-8") == "previous"
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["input.txt", "output.txt"]
@@ -0,0 +1,99 @@
+# tests/thread_safety_test.py
+import csv
+import dataclasses
+import random
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import pytest
+
+from mandarin_tamer import ConversionEngine, EntityMatcher, convert_many, convert_many_threaded
+from mandarin_tamer.helpers.conversion_config import CONVERSION_CONFIGS
+from mandarin_tamer.helpers.conversion_operations import DictionaryLoader
+from mandarin_tamer.helpers.shared_dictionaries import shared_dictionary_root
+
+
+SENTENCE_CSV = Path(__file__).parent / "sentence_csvs" / "simp_tatoeba_sentences.csv"
+THREADS = 8
+
+
+def load_sentences(count: int) -> list[str]:
+    with SENTENCE_CSV.open(encoding="utf-8") as file:
+        return [row[0] for row in list(csv.reader(file))[1 : count + 1]]
+
+
+def hammer(convert, sentences: list[str], expected: list[str], rounds: int) -> list[str]:
+    """Call `convert` on every sentence from `THREADS` threads at once, returning the sentences that came out wrong."""
+    barrier = threading.Barrier(THREADS)
+
+    def worker(seed: int) -> list[str]:
+        order = list(range(len(sentences)))
+        random.Random(seed).shuffle(order)
+        barrier.wait()
+        return [
+            sentences[index] for _ in range(rounds) for index in order if convert(sentences[index]) != expected[index]
+        ]
+
+    # Switch threads as often as possible so GIL builds interleave conversions mid-step too
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        with ThreadPoolExecutor(THREADS) as pool:
+            # Exceptions raised in a thread are re-raised here
+            return [failure for failures in pool.map(worker, range(THREADS)) for failure in failures]
+    finally:
+        sys.setswitchinterval(interval)
+
+
+def sequential_results(options: dict, sentences: list[str]) -> list[str]:
+    engine = ConversionEngine(**options)
+    return [engine.convert(sentence) for sentence in sentences]
+
+
+def test_engine_is_immutable():
+    engine = ConversionEngine(target_script="zh_tw")
+    assert isinstance(engine.steps, tuple)
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        engine.steps[0].phrase_trie = None
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"target_script": "zh_tw"},
+        {"target_script": "zh_cn", "trie_backend": "compact"},
+        {"target_script": "zh_tw", "include_dicts": {"s2t": {"打盹": "打瞌睡"}}, "exclude_lists": {"s2t": ["马上"]}},
+        {"target_script": "zh_tw", "loader": "shared"},
+    ],
+    ids=["aho_corasick", "compact", "overlay", "mapped"],
+)
+def test_one_engine_converts_correctly_from_many_threads(options):
+    if options.get("loader") == "shared":
+        options = {**options, "loader": DictionaryLoader(shared_dictionary_root(CONVERSION_CONFIGS))}
+    sentences = load_sentences(300)
+    expected = sequential_results(options, sentences)
+    # The first engine is gone, so lazily decoded artifact values are first touched by the threads
+    engine = ConversionEngine(**options)
+    assert hammer(engine.convert, sentences, expected, rounds=2) == []
+
+
+@pytest.mark.parametrize("masking", [False, True])
+def test_named_entities_are_protected_from_many_threads(masking):
+    sentences = load_sentences(200)
+    glossary = EntityMatcher(["我们", "今天", "一个"], masking=masking)
+    engine = ConversionEngine(target_script="zh_tw")
+    expected = [engine.convert(sentence, glossary) for sentence in sentences]
+    assert hammer(lambda sentence: engine.convert(sentence, glossary), sentences, expected, rounds=2) == []
+
+
+def test_convert_many_threaded_matches_convert_many():
+    sentences = load_sentences(200)
+    texts = sentences + sentences[:50]
+    expected = convert_many(texts, target_script="zh_tw", ner_list=["我们"])
+    results, stats = convert_many_threaded(
+        texts, target_script="zh_tw", ner_list=["我们"], threads=4, chunksize=7, return_stats=True
+    )
+    assert results == expected
+    assert (stats.texts, stats.unique_texts, stats.workers, stats.chunksize) == (250, 200, 4, 7)
+    assert convert_many_threaded([], threads=4) == []
@@ -0,0 +1,57 @@
+# tests/trie_test.py
+import random
+
+from mandarin_tamer.helpers.replacement_by_dictionary import ReplacementUtils
+from mandarin_tamer.helpers.trie import AhoCorasick, CompactTrie, Trie
+
+
+def build(trie_class, dictionary):
+    trie = trie_class()
+    for key, value in dictionary.items():
+        trie.insert(key, value)
+    return trie
+
+
+def leftmost_longest_reference(matches, length):
+    result = []
+    position = 0
+    while position < length:
+        starting_here = [match for match in matches if match[0] == position]
+        if starting_here:
+            result.append(max(starting_here, key=lambda match: match[1]))
+            position = result[-1][1]
+        else:
+            position += 1
+    return result
+
+
+def test_aho_corasick_matches_naive_trie():
+    rng = random.Random(7)
+    for _ in range(500):
+        dictionary = {
+            "".join(rng.choice("abcd") for _ in range(rng.randint(1, 4))): str(i) for i in range(rng.randint(0, 8))
+        }
+        text = "".join(rng.choice("abcdx") for _ in range(rng.randint(0, 40)))
+        naive = build(Trie, dictionary).find_all_matches(text)
+        for trie_class in (AhoCorasick, CompactTrie):
+            automaton = build(trie_class, dictionary)
+            assert automaton.find_all_matches(text) == naive
+            assert list(automaton.iter_leftmost_longest(text)) == leftmost_longest_reference(naive, len(text))
+
+
+def test_compact_trie_round_trips_and_uses_less_memory():
+    dictionary = {f"{chr(0x4E00 + i)}{chr(0x4E00 + i * 7 % 97)}": "同" if i % 2 else "異" for i in range(2000)}
+    compact = build(CompactTrie, dictionary)
+    assert dict(compact.items()) == dictionary
+    assert len(compact.values) == 2  # Equal values are interned
+    assert compact.memory_usage() < build(Trie, dictionary).memory_usage() / 2
+
+    compact.insert("一一", "新")
+    assert compact.find_all_matches("一一") == [(0, 2, "新")]
+
+
+def test_replacement_utils_leftmost_longest():
+    dictionary = {"AB": "ab", "ABC": "xyz", "CD": "cd"}
+    assert ReplacementUtils.word_replace_over_string("ABCD", dictionary) == "abzd"
+    assert ReplacementUtils.word_replace_over_string("ABCD", dictionary, leftmost_longest=True) == "xyzD"
+    assert sorted(ReplacementUtils.get_phrases_to_skip("ABCD", dictionary, leftmost_longest=True)) == ["xyz"]